@@ -32,11 +32,18 @@
 # setup app
 # run app
 
-import src.universal  # noqa: F401 (importing universal runs setup code)
-from src.app import main
-from src.misc.compiled import __compiled__
-
-if __compiled__:
-    main.main()
-else:
-    main.debug()
+import multiprocessing
+
+# Process pool workers are spawned and re-import this file, they must not start
+# the app
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+
+    import src.universal  # noqa: F401 (importing universal runs setup code)
+    from src.app import main
+    from src.misc.compiled import __compiled__
+
+    if __compiled__:
+        main.main()
+    else:
+        main.debug()
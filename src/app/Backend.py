@@ -22,7 +22,9 @@ import src.app.materialInterface as materialInterface
 import src.network as networking
 import src.paths as paths
 import src.misc.settings as settings
+import src.misc.requestTimings as requestTimings
 import src.misc.logHistoryManager as logHistoryManager
+import src.workers as workers
 
 
 QML_IMPORT_NAME = "Backend"
@@ -45,6 +47,7 @@ class Backend(QObject):
     onlineChanged = QSignal(name="onlineChanged")
 
     qmlReload = QSignal(name="qmlReload")
+    workerMetricsChanged = QSignal(name="workerMetricsChanged")
     _instance: "Backend"
 
     def __new__(cls) -> "Backend":
@@ -74,9 +77,12 @@ class Backend(QObject):
         def updateMaterialColors_task():
             songobj = universal.queueInstance.currentSongObject
             thumb = songobj.smallestThumbnailUrl  # type: ignore[attr-defined]
-            res = networking.networkManager.get(thumb)
+            with requestTimings.label("thumbnail"):
+                res = networking.networkManager.get(thumb, cache=True)
             if res is None:
                 return
+            # Skipped to another song while the thumbnail downloaded
+            universal.TaskGroup.checkCancelled()
             with open(os.path.join(paths.Paths.DATAPATH, "currentthumb"), "wb") as f:
                 f.write(res.content)
 
@@ -87,7 +93,8 @@ class Backend(QObject):
                 if obj is not None:
                     materialInterface.Theme.getInstance().update_dynamicColors(obj)
 
-        universal.bgworker.addJob(updateMaterialColors_task)
+        with universal.TaskGroup.supersede("materialColors", timeout=30):
+            universal.bgworker.addJob(updateMaterialColors_task)
 
     @Property(str, notify=urlChanged)
     def url(self):
@@ -216,11 +223,74 @@ class Backend(QObject):
     def ping(self) -> str:
         return "pong"
 
+    @Property(dict, notify=workerMetricsChanged)
+    def workerMetrics(self) -> dict:
+        """Worker metrics flattened for the debug page (clarity:///page/workers):
+        "gauges" is a list of lines, "jobs" one row per worker and job name"""
+        return workerMetricsForQml(workers.getMetrics())
+
+    @Slot()
+    def refreshWorkerMetrics(self) -> None:
+        self.workerMetricsChanged.emit()
+
     # @Slot()
     # def oauth(self) -> None:
     #     ytmusicapi.setup_oauth()
 
 
+def workerMetricsForQml(metrics: dict) -> dict:
+    def ms(snapshot: dict, key: str) -> str:
+        value = snapshot.get(key)
+        return "-" if value is None else f"{value:.1f}"
+
+    bg, async_, pool = (
+        metrics["bgworker"],
+        metrics["asyncBgworker"],
+        metrics["processPool"],
+    )
+    gauges = [
+        f"bgworker: {bg['queued']} queued, {bg['pending']} pending, "
+        f"{bg['running']} running, {bg['serialWaiting']} behind locked functions, "
+        f"{bg['poolThreads']['active']}/{bg['poolThreads']['max']} pool threads",
+        f"asyncBgworker: {async_['pending']} pending, {async_['running']} running, "
+        f"{async_['tasks']} tasks",
+    ]
+    gauges += [
+        f"    {name}: {c['running']}/{c['limit']} running, {c['pending']} pending"
+        for name, c in async_["categories"].items()
+    ]
+    gauges.append(
+        f"processPool: {pool['workers']} workers, {pool['submitted']} submitted, "
+        f"{pool['failed']} failed, {pool['restarts']} restarts"
+    )
+
+    rows = []
+    for worker in ("bgworker", "asyncBgworker"):
+        live = metrics[worker]["live"]
+        jobs = metrics[worker]["jobs"]
+        for name in sorted(set(live) | set(jobs)):
+            job = jobs.get(name, {})
+            wait, run = job.get("wait", {}), job.get("run", {})
+            rows.append(
+                {
+                    "worker": worker,
+                    "name": name,
+                    "pending": live.get(name, {}).get("pending", 0),
+                    "running": live.get(name, {}).get("running", 0),
+                    "completed": job.get("completed", 0),
+                    "failed": job.get("failed", 0) + job.get("timedOut", 0),
+                    "cancelled": job.get("cancelled", 0),
+                    "waitP50": ms(wait, "p50"),
+                    "waitP99": ms(wait, "p99"),
+                    "runP50": ms(run, "p50"),
+                    "runP99": ms(run, "p99"),
+                }
+            )
+    # Busiest first, that's what the page is for
+    rows.sort(key=lambda r: (-(r["pending"] + r["running"]), r["worker"], r["name"]))
+    return {"gauges": gauges, "jobs": rows}
+
+
 def castUb(input: typing.Any) -> typing.Union[bytes, bytearray]:
     return typing.cast(typing.Union[bytes, bytearray], input)
 
@@ -153,7 +153,9 @@ class Interactions(QObject):
     @Slot(str)
     def downloadSong(self, id: str):
         song = universal.song_module.Song(id)
-        universal.asyncBgworker.addJob(song.download)
+        universal.asyncBgworker.addJob(
+            song.download, category=universal.JobCategory.DOWNLOAD
+        )
 
     @Slot(str, result=QObject)
     def getSong(self, id: str):
@@ -163,14 +165,19 @@ class Interactions(QObject):
     @Slot(str, result=bool)
     def search(self, query: str) -> bool:
         universal.asyncBgworker.addJob(
-            universal.asyncargfuncFactory(universal.search_shorthand, query=query)
+            universal.asyncargfuncFactory(universal.search_shorthand, query=query),
+            priority=universal.ExecutionPriority.HIGH_PRIORITY,
+            category=universal.JobCategory.METADATA,
         )
         return True
 
     @Slot(str)
     def songPress(self, id: str):
         q = universal.queueInstance
-        q.gotoOrAdd(id)
+        # Everything the press queues (info, playback, theming) is cancelled
+        # as a unit if another song is picked before it's done
+        with q.songAction():
+            q.gotoOrAdd(id)
 
     @Slot(str, result=QObject)
     def getAlbumFromSongID(self, id: str):
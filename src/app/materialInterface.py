@@ -4,14 +4,20 @@ from materialyoucolor.utils import color_utils
 from materialyoucolor.hct import Hct
 from materialyoucolor.scheme.scheme_tonal_spot import SchemeTonalSpot
 from materialyoucolor.scheme.dynamic_scheme import DynamicScheme
-from materialyoucolor.score.score import Score
-import materialyoucolor.quantize as materialQuantize
 from PySide6.QtCore import QObject, Qt, Slot, Property, Signal
 
+from src.workers import processPool
+from src.misc import processTasks
+
+import concurrent.futures
 import json
+import logging
 import typing
 import dataclasses
 
+# Scoring a thumbnail takes a few seconds at most, even with a worker to spawn first
+SCORE_TIMEOUT = 20
+
 rgba_to_hex = lambda rgba: "#{:02X}{:02X}{:02X}{:02X}".format(*map(round, rgba))[:-2]
 
 
@@ -194,10 +200,25 @@ class Theme(QObject):
         return scheme
 
     def get_dynamicColorsFromImage(self, path: str):
-        colors: dict = materialQuantize.ImageQuantizeCelebi(
-            path, 1, 128
-        )  # Get colors from image, quality=1 (only use every pixel), max_colors=128
-        selected = Score.score(colors)
+        # Quantizing every pixel is pure Python and takes long enough to stall
+        # the UI if it holds the GIL, so it runs in the process pool. Blocks
+        # the calling thread, call this from a background job.
+        # quality=1 (only use every pixel), max_colors=128
+        future = None
+        try:
+            future = processPool.submit(processTasks.scoreImage, path, 1, 128)
+            selected = future.result(timeout=SCORE_TIMEOUT)
+        except (
+            concurrent.futures.TimeoutError,
+            concurrent.futures.process.BrokenProcessPool,
+        ):
+            # A hung or dead worker shouldn't leave the theme waiting forever
+            if future is not None:
+                future.cancel()
+            logging.getLogger("Theme").warning(
+                "Process pool didn't score %s, scoring it here", path
+            )
+            selected = processTasks.scoreImage(path, 1, 128)
         return self.get_dynamicColorObject(selected[0], True, 0)
 
     def update_dynamicColors(self, colors: DynamicScheme):
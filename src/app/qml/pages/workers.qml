@@ -0,0 +1,93 @@
+import QtQuick
+import QtQuick.Controls
+import QtQuick.Layouts
+
+import "../components/text" as TextVariant
+
+// Not linked from anywhere, open clarity:///page/workers
+Item {
+    id: root
+    anchors.fill: parent
+
+    property var metrics: Backend.workerMetrics
+    readonly property var columns: [
+        ["worker", "Worker", 110],
+        ["name", "Job", 220],
+        ["pending", "Pending", 60],
+        ["running", "Running", 60],
+        ["completed", "Done", 60],
+        ["failed", "Failed", 60],
+        ["cancelled", "Cancelled", 70],
+        ["waitP50", "Wait p50 ms", 85],
+        ["waitP99", "Wait p99 ms", 85],
+        ["runP50", "Run p50 ms", 85],
+        ["runP99", "Run p99 ms", 85]
+    ]
+
+    Timer {
+        interval: 1000
+        running: root.visible
+        repeat: true
+        triggeredOnStart: true
+        onTriggered: Backend.refreshWorkerMetrics()
+    }
+
+    ColumnLayout {
+        anchors.fill: parent
+        anchors.margins: 20
+        spacing: 4
+
+        TextVariant.Header {
+            text: "Workers"
+        }
+
+        Repeater {
+            model: root.metrics.gauges
+
+            TextVariant.Small {
+                required property string modelData
+                text: modelData
+            }
+        }
+
+        Row {
+            Layout.topMargin: 12
+            spacing: 0
+
+            Repeater {
+                model: root.columns
+
+                TextVariant.Small {
+                    required property var modelData
+                    width: modelData[2]
+                    text: modelData[1]
+                    font.bold: true
+                }
+            }
+        }
+
+        ListView {
+            Layout.fillWidth: true
+            Layout.fillHeight: true
+            clip: true
+            model: root.metrics.jobs
+            ScrollBar.vertical: ScrollBar {}
+
+            delegate: Row {
+                id: jobRow
+                required property var modelData
+                spacing: 0
+
+                Repeater {
+                    model: root.columns
+
+                    TextVariant.Small {
+                        required property var modelData
+                        width: modelData[2]
+                        text: jobRow.modelData[modelData[0]]
+                    }
+                }
+            }
+        }
+    }
+}
@@ -5,7 +5,7 @@ Both async and sync cache functions are available.
 import asyncio
 import time
 from json import JSONDecodeError
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 import os
 import json
 import collections
@@ -14,7 +14,7 @@ from src.misc.enumerations.Cache import EvictionMethod, ErrorLevel
 from hashlib import md5
 import logging
 from dataclasses import dataclass, asdict
-from threading import Lock
+from threading import RLock
 
 
 def ghash(thing):
@@ -97,7 +97,7 @@ class CacheManager:
         else:
             self.directory = os.path.abspath(directory)
 
-        self._lock = Lock()
+        self._lock = RLock()  # get() deletes expired and orphaned entries
         self._metadata_dirty = False
         self.plevel = ErrorLevel.WARNING
 
@@ -197,6 +197,7 @@ class CacheManager:
         byte: bool,
         filext: Optional[str] = None,
         expiration: Optional[int] = None,
+        overwrite: bool = False,
     ) -> str:
         """Put a value into the cache
 
@@ -209,6 +210,7 @@ class CacheManager:
             expiration (int): The point in time at which the file is no longer needed. It probably will remain on disc longer than then, but when
             trying to access it the next time, it will be deleted and return a cache miss, and will be deleted upon running the cleanup function if the time has expired.
             Note that not setting this value does not save your data from being deleted in a eviction pass.
+            overwrite (bool): Whether replacing an existing item is expected, which skips the warning.
 
         Returns:
             str: The key used to refer to the item.
@@ -245,7 +247,8 @@ class CacheManager:
             absfilepath = self.__get_abspath(filename)
 
             if os.path.exists(absfilepath):
-                print("Warning: overwriting cache item at " + absfilepath)
+                if not overwrite:
+                    print("Warning: overwriting cache item at " + absfilepath)
                 os.remove(absfilepath)
 
             with open(absfilepath, "wb" if byte else "w") as file:
@@ -271,40 +274,68 @@ class CacheManager:
             Any: The value stored. When passing in an item of type 'bytes', it will be written to disk using wb
         """
         with self._lock:
-            if key not in self.__cache_path_map:
-                self.log.debug("cache miss: " + key)
-                self.statistics.misses += 1
-                return False
-            elif not os.path.exists(self.__get_abspath(self.__cache_path_map[key])):
-                self.delete(key)
-                self.log.warning(
-                    f"key {key} was orphaned (data was on disk but reference missing)"
-                )
-                self.log.debug("cache miss: " + key)
-                self.statistics.misses += 1
-                return False
+            entry = self.__lookup(key)
+        if entry is None:
+            return False
+        return self.__read(*entry)
 
-            b = self.metadata[key].get("bytes", False)
-            dictmode = self.metadata[key].get("dict", False)
+    def getMany(self, keys: Iterable[str]) -> dict[str, Any]:
+        """Get many values from the cache, taking the lock once for all of them
 
-            if self.metadata[key].get("expiration", None):
-                if time.time() > self.metadata[key]["expiration"]:
-                    self.log.debug("cache miss: " + key + " expired")
-                    self.delete(key)
-                    return False
+        Args:
+            keys (Iterable[str]): The keys used to refer to the items.
 
-            try:
-                self.last_used.move_to_end(key)
-            except KeyError:
-                self.last_used[key] = time.time()
+        Returns:
+            dict[str, Any]: The values found, by key. Misses are left out.
+        """
+        with self._lock:
+            entries = {
+                key: entry for key in keys if (entry := self.__lookup(key)) is not None
+            }
+        return {key: self.__read(*entry) for key, entry in entries.items()}
 
-            filepath = self.__get_abspath(self.__cache_path_map[key])
-            self.statistics.hits += 1
-            self.metadata[key]["accessCount"] += 1
+    def __lookup(self, key: str) -> Optional[tuple[str, bool, bool]]:
+        """Internal function, the bookkeeping for a get. Call with the lock held.
+
+        Returns:
+            The file path and whether it's bytes and dict mode, None on a miss
+        """
+        if key not in self.__cache_path_map:
+            self.log.debug("cache miss: " + key)
+            self.statistics.misses += 1
+            return None
+        elif not os.path.exists(self.__get_abspath(self.__cache_path_map[key])):
+            self.delete(key)
+            self.log.warning(
+                f"key {key} was orphaned (data was on disk but reference missing)"
+            )
+            self.log.debug("cache miss: " + key)
+            self.statistics.misses += 1
+            return None
+
+        b = self.metadata[key].get("bytes", False)
+        dictmode = self.metadata[key].get("dict", False)
+
+        if self.metadata[key].get("expiration", None):
+            if time.time() > self.metadata[key]["expiration"]:
+                self.log.debug("cache miss: " + key + " expired")
+                self.delete(key)
+                return None
 
+        try:
+            self.last_used.move_to_end(key)
+        except KeyError:
             self.last_used[key] = time.time()
-            self._metadata_dirty = True
 
+        filepath = self.__get_abspath(self.__cache_path_map[key])
+        self.statistics.hits += 1
+        self.metadata[key]["accessCount"] += 1
+
+        self.last_used[key] = time.time()
+        self._metadata_dirty = True
+        return filepath, b, dictmode
+
+    def __read(self, filepath: str, b: bool, dictmode: bool) -> Any:
         with open(filepath, "r" if not b else "rb") as file:
             value = file.read()
 
@@ -3,7 +3,7 @@ Quite similar to the cacheManager module, but this one is more persistent and is
 """
 
 import time
-from typing import Any, Optional, Union, cast as typing_cast, Literal
+from typing import Any, Iterable, Optional, Union, cast as typing_cast, Literal
 import os
 import json
 import collections
@@ -501,6 +501,34 @@ class DataStore:
             return False
         return os.path.exists(p)
 
+    def checkFilesExist(self, keys: Iterable[str]) -> set[str]:
+        """Check which of many items are in the dataStore, with one directory
+        listing instead of a stat per item.
+
+        Args:
+            keys (Iterable[str]): The keys used to refer to the items.
+
+        Returns:
+            set[str]: The keys that are in the dataStore
+        """
+        try:
+            onDisk = set(os.listdir(self.absdir))
+        except FileNotFoundError:
+            return set()
+
+        found = set()
+        for key in keys:
+            p = self.__dataStore_path_map.get(key)
+            if not p:
+                continue
+            directory, name = os.path.split(p)
+            if directory == self.absdir:
+                if name in onDisk:
+                    found.add(key)
+            elif os.path.exists(p):
+                found.add(key)
+        return found
+
     def getAll(self) -> dict:
         """Get all items in the dataStore
 
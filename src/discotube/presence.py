@@ -45,7 +45,11 @@ class PresenceManagerThread(QThread):
         self.currentDetails: dict[str, typing.Any] | None = None
 
         self.reconnectTrySettings = workers.TimedJobSettings(
-            dynamic=True, base_interval=30, max_interval=300, growth_factor=1.5
+            dynamic=True,
+            base_interval=30,
+            max_interval=300,
+            growth_factor=1.5,
+            jitter=0.1,
         )
 
     def clientIdChanged(self):
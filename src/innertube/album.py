@@ -1,5 +1,4 @@
 import json
-import asyncio
 import os
 import logging
 from typing import Union, Literal
@@ -28,40 +27,30 @@ from src.innertube import song
 from src.misc.enumerations.Album import DownloadStatus
 from src.misc.enumerations.Song import DownloadState as SongDownloadState
 from src.misc.enumerations import DataStatus
+from src.misc import requestTimings
+from src.workers import run_sync
+from src.misc.instanceRegistry import InstanceRegistry, InstanceLogger
 
 from src.innertube.song import SongListModel, SongProxyListModel
 from src.innertube.globalModels import NamespacedTypedIdentifier, SimpleIdentifier
 
 
-def run_sync(func, *args, **kwargs):
-    coro = func(*args, **kwargs)
-    if asyncio.iscoroutine(coro):
-        future = asyncio.run_coroutine_threadsafe(
-            coro, universal.asyncBgworker.event_loop
-        )
-        future.result()  # wait for the result
-    else:
-        return coro
-
-
 class Album(QObject):
-    _instances: dict[str, "Album"] = {}
+    # Albums nothing uses anymore are dropped, see InstanceRegistry
+    _registry: InstanceRegistry[str, "Album"] = InstanceRegistry("Album", keep=64)
 
     downloadStatusChanged = Signal(int)
     dataStatusChanged = Signal(int)
 
     def __new__(cls, id: str = "", givenInfo: dict = {"None": None}) -> "Album":
-        if id in cls._instances:
-            return cls._instances[id]
-        instance = super(Album, cls).__new__(cls, id, givenInfo)  # type: ignore[call-arg]
-        cls._instances[id] = instance
-        return instance
+        return cls._registry.getOrCreate(
+            id,
+            lambda: super(Album, cls).__new__(cls, id, givenInfo),  # type: ignore[call-arg]
+        )
 
+    @_registry.initOnce
     def __init__(self, id: str = "", givenInfo: dict = {"None": None}) -> None:
-        if hasattr(self, "_initialized") and self._initialized:
-            return
         super().__init__()
-        self._initialized: bool = True
 
         self.id = id
         self.rawAlbumDetails = givenInfo if givenInfo != {"None": None} else {}
@@ -70,7 +59,7 @@ class Album(QObject):
         self._downloadStatus = DownloadStatus.NONE_DOWNLOADED
         self._dataStatus = DataStatus.NOTLOADED
 
-        self.logger = logging.getLogger(f"Album-{self.id}")
+        self.logger = InstanceLogger(logging.getLogger("Album"), self.id)
         self.cacheManager = cacheManager.getCache("albums_cache")
 
     def _set_info(self, rawAlbumDetails: dict) -> None:
@@ -129,7 +118,9 @@ class Album(QObject):
         ] = self.thumbnails[0]
         self.smallestThumbnailUrl: str = self.smallestThumbnail["url"]
 
-        self.logger = logging.getLogger(f"Album-{self.id}-{self.title}")
+        self.logger = InstanceLogger(
+            logging.getLogger("Album"), f"{self.id}-{self.title}"
+        )
         self.logger.debug(f"Album info set for {self.id} - {self.title}")
 
     @QProperty(int, notify=dataStatusChanged)
@@ -174,7 +165,12 @@ class Album(QObject):
         ]
         for track in tracklist:
             if not track.dataStatus == DataStatus.LOADED:
-                universal.asyncBgworker.addJob(track.get_info)
+                universal.asyncBgworker.addJob(
+                    track.get_info,
+                    key=("get_info", track.id),
+                    priority=universal.ExecutionPriority.LOW_PRIORITY,
+                    category=universal.JobCategory.METADATA,
+                )
             track.downloadStateChanged.connect(self.songDownloadStatusChanged)
         self.songs = tracklist
         return self.songs
@@ -221,8 +217,9 @@ class Album(QObject):
             if cache_only:
                 return
 
-            self.rawData = await api.get_album(self.id)
-            rawCleanSongList = await api.get_album_songs_clean(self.id)
+            with requestTimings.label("info"):
+                self.rawData = await api.get_album(self.id)
+                rawCleanSongList = await api.get_album_songs_clean(self.id)
 
             self.rawData["cleanTracks"] = rawCleanSongList
             self.cacheManager.put(identifier, json.dumps(self.rawData), byte=False)
@@ -266,39 +263,56 @@ class Album(QObject):
             return
 
         for track in self.songs:
-            universal.asyncBgworker.addJob(track.download)
+            universal.asyncBgworker.addJob(
+                track.download,
+                priority=universal.ExecutionPriority.LOW_PRIORITY,
+                category=universal.JobCategory.DOWNLOAD,
+            )
         self.logger.info("Added all song downloads to queue")
 
 
+ALBUM_LOOKUP_TIMEOUT = 30
+
+
 async def _afs(songID: str) -> Union[str, None]:
     api = universal.asyncBgworker.API
-    albumID = await api.get_song_album_id(songID)
+    with requestTimings.label("info"):
+        albumID = await api.get_song_album_id(songID)
     return albumID
 
 
 def albumFromSong(song: song.Song) -> Union[Album, None]:
-    afsCoro = _afs(song.id)
-    albumInfo = asyncio.run_coroutine_threadsafe(
-        afsCoro, universal.asyncBgworker.event_loop
-    ).result()
-    if albumInfo is None:
-        return None
-    albumInstance = Album(albumInfo)
-    if albumInstance.dataStatus is not DataStatus.LOADED:
-        universal.asyncBgworker.addJob(
-            albumInstance.get_info, universal.asyncBgworker.API
-        )
-    return albumInstance
+    return albumFromSongID(str(song.sid))
 
 
 def albumFromSongID(songID: str) -> Union[Album, None]:
-    albumID = asyncio.run_coroutine_threadsafe(
-        _afs(songID), universal.asyncBgworker.event_loop
-    ).result()
-    albumInstance = Album(albumID) if albumID is not None else None
-    if albumInstance is not None and albumInstance.dataStatus is not DataStatus.LOADED:
+    """Look up the album a song belongs to, blocking until the lookup finishes.
+
+    Its info is fetched in the background if it isn't cached. Don't call this
+    from the async worker's loop, it would wait on itself.
+    """
+    lookup = universal.asyncBgworker.submit(
+        _afs(songID),
+        priority=universal.ExecutionPriority.HIGH_PRIORITY,
+        category=universal.JobCategory.METADATA,
+        key=("album_id", songID),
+    )
+    try:
+        albumID = lookup.result(timeout=ALBUM_LOOKUP_TIMEOUT)
+    except Exception as e:
+        lookup.cancel()
+        logging.getLogger("Album").error(
+            f"Failed to look up album for song {songID}: {e!r}"
+        )
+        return None
+    if albumID is None:
+        return None
+    albumInstance = Album(albumID)
+    if albumInstance.dataStatus is not DataStatus.LOADED:
         universal.asyncBgworker.addJob(
-            albumInstance.get_info, universal.asyncBgworker.API
+            albumInstance.ensure_info,
+            key=("get_info", albumInstance.id),
+            category=universal.JobCategory.METADATA,
         )
     return albumInstance
 
@@ -525,7 +539,8 @@ class AlbumImageProvider(QQuickImageProvider):
                 data = f.read()
             img.loadFromData(data)
         else:
-            r = universal.networkManager.get(thumbUrl)
+            with requestTimings.label("thumbnail"):
+                r = universal.networkManager.get(thumbUrl, cache=True)
             if not r or r.status_code != 200:
                 placeholder = os.path.join(
                     universal.Paths.ASSETSPATH, "placeholders", "generic.png"
@@ -4,6 +4,8 @@ Search.
 
 import ytmusicapi
 from src.misc.enumerations.Search import SearchFilters
+from src.misc import requestTimings
+from src.workers import JobHandle
 import json
 from typing import Union
 import asyncio
@@ -308,9 +310,14 @@ async def search_suggestions(query: str, detailed=True) -> list | dict:
         detailed: A dictionary of suggestions, with more details.
     """
 
-    return await universal.asyncBgworker.API.get_search_suggestions(
-        query, detailed_runs=detailed
-    )
+    with requestTimings.label("search"):
+        return await universal.asyncBgworker.API.get_search_suggestions(
+            query, detailed_runs=detailed
+        )
+
+
+# Info fetches queued for the results of the last search
+_pendingInfoJobs: list[JobHandle] = []
 
 
 async def search(
@@ -354,7 +361,13 @@ async def search(
             duration = item.get("duration_seconds", 0)
             # explicit = item.get("isExplicit", False)
             song = universal.createSongMainThread(id)
-            universal.asyncBgworker.addJob(song.get_info)
+            _pendingInfoJobs.append(
+                universal.asyncBgworker.addJob(
+                    song.get_info,
+                    key=("get_info", song.id),
+                    category=universal.JobCategory.METADATA,
+                )
+            )
         except KeyError:
             logging.getLogger("SearchLogger").error(f"Failed parsing song item: {item}")
             return None
@@ -395,11 +408,18 @@ async def search(
     if model.rowCount(QModelIndex()) > 0:
         model.resetModel()
 
+    # Info for the previous results isn't needed anymore, don't let it hold up
+    # the fetches for this search
+    for job in _pendingInfoJobs:
+        job.cancel()
+    _pendingInfoJobs.clear()
+
     # print(json.dumps(s))
     try:
-        search_ = await API.search(
-            query, filter=filter, limit=limit, ignore_spelling=ignore_spelling
-        )
+        with requestTimings.label("search"):
+            search_ = await API.search(
+                query, filter=filter, limit=limit, ignore_spelling=ignore_spelling
+            )
         if search_ == []:
             logging.getLogger("SearchLogger").info(
                 f"No results found for {query}", {"notifying": True}
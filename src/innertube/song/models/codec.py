@@ -0,0 +1,243 @@
+"""
+Binary cache format for SongData and PlaybackData.
+
+An entry is MAGIC, the codec and marshal versions, then the marshalled class
+tag, schema fingerprint and field values in declaration order. Field coders are
+built once per class from its type hints, so there's no per call reflection
+like dataclasses.asdict and dacite do.
+
+Entries cached as JSON before this existed are still read, through the class's
+from_dict. An entry from another codec or Python version, or written before
+the class's fields changed, reads as None, the same as a cache miss.
+"""
+
+import dataclasses
+import json
+import logging
+import marshal
+import operator
+import types
+import typing
+import zlib
+from typing import Any, Callable, Optional, TypeVar, Union
+
+import dacite
+
+from src.innertube.globalModels import SimpleIdentifier
+from src.innertube.song.models.songData import LazySection
+
+MAGIC = b"CLRC"
+VERSION = 1
+HEADER = MAGIC + bytes((VERSION, marshal.version))
+
+T = TypeVar("T")
+Coder = Optional[Callable[[Any], Any]]  # None means the value is stored as is
+
+logger = logging.getLogger("Codec")
+
+# What a truncated, foreign or outdated entry can raise while it's read. Any of
+# them makes the entry a cache miss, so the data is fetched again
+_UNREADABLE = (
+    ValueError,
+    EOFError,
+    TypeError,
+    KeyError,
+    AttributeError,
+    dacite.DaciteError,
+)
+
+
+class ClassCodec:
+    """Encodes instances of one dataclass to a tuple of their field values."""
+
+    def __init__(self, cls: type) -> None:
+        self.cls = cls
+        self.tag = cls.__qualname__
+        self.getters: list[Callable[[Any], Any]] = []
+        self.encoders: list[Coder] = []
+        self.decoders: list[Coder] = []
+        self.names = [f.name for f in dataclasses.fields(cls)]
+        schema = [self.tag]
+
+        hints = typing.get_type_hints(cls)
+        for f in dataclasses.fields(cls):
+            section = cls.__dict__.get(f.name)
+            if isinstance(section, LazySection):
+                # Kept as the JSON text it'll be decoded from on first access
+                self.getters.append(section.slot.__get__)
+                self.encoders.append(_encodeSection)
+                self.decoders.append(None)
+                schema.append(f"{f.name}:lazy")
+                continue
+            encode, decode, fieldSchema = _coders(hints[f.name])
+            self.getters.append(operator.attrgetter(f.name))
+            self.encoders.append(encode)
+            self.decoders.append(decode)
+            schema.append(f"{f.name}:{fieldSchema}")
+
+        self.schema = zlib.crc32(",".join(schema).encode())
+        self.fields = list(zip(self.getters, self.encoders))
+        # Every field is stored, so (frozen) __init__ can be skipped where the
+        # instance has a __dict__ to fill in
+        self.direct = not hasattr(cls, "__slots__") and not hasattr(
+            cls, "__post_init__"
+        )
+
+    def encode(self, obj: Any) -> tuple:
+        return tuple(
+            get(obj) if encode is None else encode(get(obj))
+            for get, encode in self.fields
+        )
+
+    def decode(self, values: tuple) -> Any:
+        if len(values) != len(self.names):
+            raise ValueError(f"{self.tag} has {len(self.names)} fields")
+        decoded = [
+            value if decode is None or value is None else decode(value)
+            for value, decode in zip(values, self.decoders)
+        ]
+        if not self.direct:
+            return self.cls(*decoded)
+        obj = self.cls.__new__(self.cls)
+        obj.__dict__.update(zip(self.names, decoded))
+        return obj
+
+
+_codecs: dict[type, ClassCodec] = {}
+_byTag: dict[str, ClassCodec] = {}
+
+
+def codecFor(cls: type) -> list[ClassCodec]:
+    """Codecs for cls and its subclasses, which can turn up wherever cls is
+    expected (a YoutubeFormatData in a list of FormatData)"""
+    found = []
+    for klass in (cls, *_subclasses(cls)):
+        if klass not in _codecs:
+            codec = ClassCodec(klass)
+            _codecs[klass] = codec
+            _byTag[codec.tag] = codec
+        found.append(_codecs[klass])
+    return found
+
+
+def _subclasses(cls: type) -> list[type]:
+    found = []
+    for sub in cls.__subclasses__():
+        if dataclasses.is_dataclass(sub):
+            found.append(sub)
+        found.extend(_subclasses(sub))
+    return found
+
+
+def _encodeSection(value: Any) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(dataclasses.asdict(value), separators=(",", ":"))
+
+
+def _coders(tp: Any) -> tuple[Coder, Coder, str]:
+    """Encoder, decoder and a schema string for a field's type hint"""
+    origin = typing.get_origin(tp)
+
+    if origin in (Union, types.UnionType):
+        args = [arg for arg in typing.get_args(tp) if arg is not type(None)]
+        if len(args) == 1:
+            # Optional[X]: None is stored as is, decode() doesn't pass it on
+            encode, decode, schema = _coders(args[0])
+            if encode is None:
+                return None, decode, schema
+            return (
+                lambda value: None if value is None else encode(value),
+                decode,
+                schema,
+            )
+        if all(dataclasses.is_dataclass(arg) for arg in args):
+            return _dataclassCoders(*args)
+        if not any(_coders(arg)[0] for arg in args):
+            return None, None, repr(tp)
+        raise TypeError(f"Can't encode {tp}")
+
+    if origin is list:
+        (item,) = typing.get_args(tp) or (Any,)
+        encode, decode, schema = _coders(item)
+        if encode is None:
+            return None, None, f"list[{schema}]"
+        return (
+            lambda value: [encode(v) for v in value],
+            lambda value: [decode(v) for v in value],
+            f"list[{schema}]",
+        )
+
+    if tp is SimpleIdentifier:
+        return str, SimpleIdentifier, "SimpleIdentifier"
+
+    if dataclasses.is_dataclass(tp):
+        return _dataclassCoders(tp)
+
+    # str, int, float, bool, dicts and lists of those, and Any
+    return None, None, getattr(tp, "__name__", repr(tp))
+
+
+def _dataclassCoders(*classes: type) -> tuple[Coder, Coder, str]:
+    """Nested dataclasses are stored with their tag, so subclasses survive"""
+    codecs = [codec for cls in classes for codec in codecFor(cls)]
+
+    def encode(value: Any) -> tuple:
+        codec = _codecs.get(type(value)) or codecFor(type(value))[0]
+        return (codec.tag, codec.encode(value))
+
+    def decode(value: tuple) -> Any:
+        tag, values = value
+        return _byTag[tag].decode(values)
+
+    return encode, decode, "|".join(str(codec.schema) for codec in codecs)
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode a SongData or PlaybackData for the cache
+
+    Args:
+        obj: The instance
+
+    Returns:
+        bytes: The entry, in JSON if something in it can't be marshalled
+    """
+    codec = _codecs.get(type(obj)) or codecFor(type(obj))[0]
+    try:
+        return HEADER + marshal.dumps((codec.tag, codec.schema, codec.encode(obj)))
+    except ValueError:
+        logger.debug(f"Can't marshal {codec.tag}, caching it as JSON")
+        return json.dumps(obj.as_dict()).encode()
+
+
+def loads(data: Union[str, bytes], cls: type[T]) -> Optional[T]:
+    """Decode a cache entry written by dumps, or an old JSON one
+
+    Args:
+        data: The entry
+        cls: The class expected, a subclass of it is returned as is
+
+    Returns:
+        Optional[T]: The instance, None if the entry can't be read
+    """
+    if isinstance(data, bytes) and data.startswith(MAGIC):
+        if not data.startswith(HEADER):
+            return None
+        codecFor(cls)
+        try:
+            tag, schema, values = marshal.loads(data[len(HEADER) :])
+            codec = _byTag.get(tag)
+            if codec is None or codec.schema != schema:
+                return None
+            if not issubclass(codec.cls, cls):
+                return None
+            return codec.decode(values)
+        except _UNREADABLE:
+            logger.warning(f"Unreadable {cls.__qualname__} cache entry")
+            return None
+
+    try:
+        return cls.from_dict(json.loads(data))  # type: ignore[attr-defined]
+    except _UNREADABLE:
+        logger.warning(f"Unreadable {cls.__qualname__} JSON cache entry")
+        return None
@@ -1,5 +1,6 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Generic, TypeVar
 import dataclasses
+import json
 
 import dacite
 
@@ -32,26 +33,26 @@ class rawSongDataDict(dict):
     pass
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class ThumbnailEntry:
     url: str
     width: Optional[int] = None
     height: Optional[int] = None
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class ThumbnailSet:
     thumbnails: List[ThumbnailEntry] = dataclasses.field(default_factory=list)
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class PageOwnerDetails:
     name: Optional[str] = None
     externalChannelId: Optional[str] = None
     youtubeProfileUrl: Optional[str] = None
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class VideoDetails:
     videoId: Optional[str] = None
     title: Optional[str] = None
@@ -69,19 +70,19 @@ class VideoDetails:
     extra: Dict[str, Any] = dataclasses.field(default_factory=dict)
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class PlaybackUrlHeader:
     headerType: Optional[str] = None
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class PlaybackUrl:
     baseUrl: Optional[str] = None
     headers: List[PlaybackUrlHeader] = dataclasses.field(default_factory=list)
     elapsedMediaTimeSeconds: Optional[int] = None
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class PlaybackTracking:
     videostatsPlaybackUrl: Optional[PlaybackUrl] = None
     videostatsDelayplayUrl: Optional[PlaybackUrl] = None
@@ -97,7 +98,7 @@ class PlaybackTracking:
     extra: Dict[str, Any] = dataclasses.field(default_factory=dict)
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class MicroformatDataRenderer:
     urlCanonical: Optional[str] = None
     title: Optional[str] = None
@@ -118,7 +119,39 @@ class MicroformatDataRenderer:
     extra: Dict[str, Any] = dataclasses.field(default_factory=dict)
 
 
-@dataclasses.dataclass
+T = TypeVar("T")
+
+# Same casts the cached data has always been loaded with
+_daciteConfig = dacite.Config(cast=[str, SimpleIdentifier])
+
+
+class LazySection(Generic[T]):
+    """
+    Wraps one of SongData's slots so the nested section in it can be kept as
+    compact JSON text, and is only turned into its dataclass the first time
+    something reads it.
+    """
+
+    def __init__(self, slot, dataClass: type[T]) -> None:
+        self.slot = slot  # the slot's member descriptor
+        self.dataClass = dataClass
+
+    def __get__(self, instance, owner=None) -> Optional[T]:
+        if instance is None:
+            return self  # type: ignore[return-value]
+        value = self.slot.__get__(instance, owner)
+        if isinstance(value, str):
+            value = dacite.from_dict(
+                self.dataClass, json.loads(value), config=_daciteConfig
+            )
+            self.slot.__set__(instance, value)
+        return value
+
+    def __set__(self, instance, value: "Optional[T] | str") -> None:
+        self.slot.__set__(instance, value)
+
+
+@dataclasses.dataclass(slots=True)
 class SongData:
     id: SimpleIdentifier
 
@@ -194,19 +227,42 @@ class SongData:
         Instead, use the provider's parsing methods to first sanitize/convert the raw data into a SongData instance.
 
         The main use for this is loading from cached data that was stored as a dictionary.
+
+        The flat fields go through dacite as before. The nested sections (see
+        _lazySections) are kept as JSON text and only decoded when they're read,
+        which takes far less time and memory than decoding them all up front.
         """
-        return dacite.from_dict(
+        songData = dacite.from_dict(
             data_class=SongData,
-            data=data,
-            config=dacite.Config(
-                cast=[str, SimpleIdentifier]
-            ),  # pretty self explanatory, but this ensures that str IDs are converted to SimpleIdentifier instances
+            data={k: v for k, v in data.items() if k not in _lazySections},
+            config=_daciteConfig,
         )
+        for name in _lazySections:
+            section = data.get(name)
+            if section is None:
+                continue
+            if not isinstance(section, dict):
+                raise dacite.WrongTypeError(
+                    field_type=_lazySections[name], value=section, field_path=name
+                )
+            setattr(songData, name, json.dumps(section, separators=(",", ":")))
+        return songData
 
     def as_dict(self) -> Dict[str, Any]:
         """
         Convert the SongData instance to a dictionary.
         """
         data = dataclasses.asdict(self)
-        data["id"] = str(data["id"])  # ensure SimpleIdentifier is converted to string
+        data["id"] = str(self.id)  # ensure SimpleIdentifier is converted to string
         return data
+
+
+# List views only need the flat fields, so these are decoded on first access
+_lazySections = {
+    "pageOwnerDetails": PageOwnerDetails,
+    "playbackTracking": PlaybackTracking,
+    "videoDetails": VideoDetails,
+    "microformat": MicroformatDataRenderer,
+}
+for _name, _dataClass in _lazySections.items():
+    setattr(SongData, _name, LazySection(getattr(SongData, _name), _dataClass))
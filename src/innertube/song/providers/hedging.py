@@ -0,0 +1,177 @@
+"""
+Request hedging for provider calls.
+
+If a call hasn't finished by the time most calls of its kind have, a duplicate
+is started and whichever finishes first wins. Only use it for idempotent reads
+(metadata, lyrics), never for anything with side effects.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import typing
+from dataclasses import dataclass, asdict
+
+from src.misc.metrics import Histogram, exponential_buckets
+
+T = typing.TypeVar("T")
+
+# 10 ms to ~80 s
+LATENCY_BUCKETS = exponential_buckets(0.01, 2, 14)
+
+
+@dataclass
+class HedgeStatistics:
+    requests: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    primary_wins: int = 0
+    budget_denied: int = 0
+
+
+class Hedger:
+    """Issues a backup request once the first one is slower than `percentile` of
+    recent calls with the same name.
+
+    A global budget caps hedges at roughly `budget_ratio` of all requests so a
+    slow backend doesn't get twice the load exactly when it's struggling.
+
+    Attributes:
+        percentile: Latency percentile after which to hedge
+        min_samples: Calls needed before the percentile is trusted; until then
+            `default_delay` is used
+        min_delay: Never hedge sooner than this many seconds
+        max_delay: Always hedge after this many seconds
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95,
+        min_samples: int = 20,
+        default_delay: float = 1.5,
+        min_delay: float = 0.25,
+        max_delay: float = 5.0,
+        budget_ratio: float = 0.1,
+        max_budget: float = 5,
+    ):
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger("Hedger")
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.budget_ratio = budget_ratio
+        self.max_budget = max_budget
+        self._budget = max_budget
+        self.latencies: dict[str, Histogram] = {}
+        self.statistics: dict[str, HedgeStatistics] = {}
+
+    def delay(self, name: str) -> float:
+        """How long to wait on a call named `name` before hedging it"""
+        histogram = self.latencies.get(name)
+        if histogram is None or histogram.count < self.min_samples:
+            return self.default_delay
+        estimate = histogram.percentile(self.percentile) or self.default_delay
+        return min(self.max_delay, max(self.min_delay, estimate))
+
+    def _begin(self, name: str) -> HedgeStatistics:
+        with self._lock:
+            self._budget = min(self.max_budget, self._budget + self.budget_ratio)
+            if name not in self.statistics:
+                self.statistics[name] = HedgeStatistics()
+                self.latencies[name] = Histogram(LATENCY_BUCKETS)
+            stats = self.statistics[name]
+            stats.requests += 1
+            return stats
+
+    def _spend(self, stats: HedgeStatistics) -> bool:
+        with self._lock:
+            if self._budget < 1:
+                stats.budget_denied += 1
+                return False
+            self._budget -= 1
+            stats.hedged += 1
+            return True
+
+    async def run(
+        self,
+        name: str,
+        factory: typing.Callable[[], typing.Awaitable[T]],
+        enabled: bool = True,
+    ) -> T:
+        """Run `factory()`, hedging it with a second `factory()` call if it's slow
+
+        Args:
+            name: Groups calls for latency tracking, e.g. "get_song"
+            factory: Creates a fresh awaitable for each attempt
+            enabled: If False, just await a single attempt (latency is still tracked)
+
+        Returns:
+            The result of whichever attempt finished first. If that attempt
+            raised, the other one's result is used instead, if it succeeds.
+        """
+        stats = self._begin(name)
+        histogram = self.latencies[name]
+        started = time.monotonic()
+        primary = asyncio.ensure_future(factory())
+
+        if not enabled:
+            result = await primary
+            histogram.observe(time.monotonic() - started)
+            return result
+
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.delay(name))
+        except asyncio.CancelledError:
+            primary.cancel()
+            raise
+        if done or not self._spend(stats):
+            result = await primary
+            histogram.observe(time.monotonic() - started)
+            return result
+
+        self.logger.debug(
+            f"{name} slower than {self.delay(name):.2f}s, sending a hedged request"
+        )
+        hedge_started = time.monotonic()
+        hedge = asyncio.ensure_future(factory())
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                # Successful attempts first, in case both finished together
+                for attempt in sorted(done, key=lambda a: a.exception() is not None):
+                    if attempt.exception() is not None:
+                        if pending:
+                            continue  # let the other attempt have its chance
+                        return attempt.result()  # both failed, raise this one
+                    if attempt is hedge:
+                        stats.hedge_wins += 1
+                        histogram.observe(time.monotonic() - hedge_started)
+                    else:
+                        stats.primary_wins += 1
+                        histogram.observe(time.monotonic() - started)
+                    return attempt.result()
+            raise RuntimeError("unreachable")  # pragma: no cover
+        finally:
+            for attempt in pending:
+                attempt.cancel()
+
+    def getStatistics(self) -> dict:
+        """Get hedging counters and the current hedge delay for every call name
+
+        Returns:
+            dict: {name: {requests, hedged, hedge_wins, primary_wins, budget_denied, delay}}
+        """
+        with self._lock:
+            return {
+                name: {**asdict(stats), "delay": self.delay(name)}
+                for name, stats in self.statistics.items()
+            }
+
+
+hedger = Hedger()
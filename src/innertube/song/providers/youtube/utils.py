@@ -1,4 +1,3 @@
-import asyncio
 import time
 from datetime import datetime, timedelta
 from typing import Optional
@@ -48,17 +47,6 @@ def convert_to_timestamp(date_str: str) -> float:
     return timestamp
 
 
-def run_sync(func, *args, **kwargs):
-    coro = func(*args, **kwargs)
-    if asyncio.iscoroutine(coro):
-        future = asyncio.run_coroutine_threadsafe(
-            coro, universal.asyncBgworker.event_loop
-        )
-        future.result()  # wait for the result
-    else:
-        return coro
-
-
 def playback_from_raw(raw: dict) -> Optional[YoutubePlaybackData]:
     """
     Convert raw playback info (yt-dlp style) into a PlaybackData-like object.
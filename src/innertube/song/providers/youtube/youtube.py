@@ -1,9 +1,9 @@
+import concurrent.futures
 import json
 import os
 from typing import Optional, Any, Union, Dict
 
 import ytmusicapi as ytm
-import yt_dlp as yt_dlp_module  # type: ignore[import-untyped]
 
 from src import universal as universal
 from src import cacheManager
@@ -13,6 +13,9 @@ from src.innertube.song.providers.youtube.utils import (
     songdata_from_raw,
 )
 from src.misc.enumerations.Song import DownloadState
+from src.misc import requestTimings
+from src.misc import processTasks
+from src.innertube.song.providers.hedging import hedger
 
 from src.innertube.song.models import (
     SongData,
@@ -30,11 +33,12 @@ from src.innertube.globalModels.identifier import (
 
 from src.innertube.song.providers.providerInterface import ProviderInterface
 
-ytdl: yt_dlp_module.YoutubeDL
-ytdl = yt_dlp_module.YoutubeDL(ydlOpts)
-
 logger = universal.logger.getChild("YoutubeProvider")
 
+# yt-dlp's own socket timeouts end a stuck extraction well before this, it's
+# here for a worker process that hangs
+EXTRACT_TIMEOUT = 120
+
 SimpleIdentifier_or_Str = Union[SimpleIdentifier, str]
 
 
@@ -80,7 +84,12 @@ class YoutubeProvider(ProviderInterface):
         if isinstance(provider_id, SimpleIdentifier):
             provider_id = provider_id.id
 
-        rawData = await api.get_song(provider_id)
+        with requestTimings.label("info"):
+            rawData = await hedger.run(
+                "get_song",
+                lambda: api.get_song(provider_id),
+                enabled=universal.settings.get("hedgeMetadataRequests", True),
+            )
         if rawData.get("playabilityStatus", {}).get("status") == "ERROR":
             logger.warning(
                 f"Song cannot be retrieved due to playability issues. id: {provider_id} "
@@ -104,7 +113,17 @@ class YoutubeProvider(ProviderInterface):
         if isinstance(provider_id, SimpleIdentifier):
             provider_id = provider_id.id
 
-        playbackinfo = ytdl.extract_info(provider_id, download=False)
+        # extract_info spends most of its time parsing in Python, in a worker
+        # process it doesn't compete with the UI thread for the GIL
+        future = universal.processPool.submit(
+            processTasks.extractInfo, provider_id, ydlOpts
+        )
+        try:
+            playbackinfo = future.result(timeout=EXTRACT_TIMEOUT)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            logger.error(f"Extracting playback info for {provider_id} timed out")
+            return None
 
         if playbackinfo is None:
             logger.error(
@@ -124,7 +143,12 @@ class YoutubeProvider(ProviderInterface):
         if isinstance(provider_id, SimpleIdentifier):
             provider_id = provider_id.id
 
-        return await universal.asyncBgworker.API.get_lyrics(provider_id)
+        with requestTimings.label("lyrics"):
+            return await hedger.run(
+                "get_lyrics",
+                lambda: universal.asyncBgworker.API.get_lyrics(provider_id),
+                enabled=universal.settings.get("hedgeMetadataRequests", True),
+            )
 
     @staticmethod
     def from_search_result(search_result: Dict[str, Any]) -> Dict[str, Any]:
@@ -1,11 +1,12 @@
 import dataclasses
+import hashlib
 import time
 from datetime import datetime, timedelta
 import json
-import asyncio
 import io
 import os
 import logging
+import operator
 from typing import Union
 import pathlib
 
@@ -32,6 +33,9 @@ from src import universal as universal
 from src import cacheManager
 from src.misc.enumerations import DataStatus
 from src.misc.enumerations.Song import PlayingStatus, DownloadState
+from src.misc import requestTimings
+from src.workers import run_sync, Batcher
+from src.misc.instanceRegistry import InstanceRegistry, InstanceLogger
 
 from src.innertube.song.models import (
     SongData,
@@ -41,6 +45,7 @@ from src.innertube.song.models import (
     rawSongDataDict,
     rawPlaybackDataDict,
 )
+from src.innertube.song.models import codec
 from src.innertube.song.providers import ProviderInterface, get_provider, list_providers
 from src.innertube.globalModels import (
     SimpleIdentifier,
@@ -49,17 +54,6 @@ from src.innertube.globalModels import (
 )
 
 
-def run_sync(func, *args, **kwargs):
-    coro = func(*args, **kwargs)
-    if asyncio.iscoroutine(coro):
-        future = asyncio.run_coroutine_threadsafe(
-            coro, universal.asyncBgworker.event_loop
-        )
-        future.result()  # wait for the result
-    else:
-        return coro
-
-
 """
 Some notes for the new Provder-based song
 
@@ -86,8 +80,11 @@ class Song(QObject):
 
     playingStatusChanged = Signal(int)
 
-    _instances: dict[NamespacedTypedIdentifier, "Song"] = {}
-    # Dict now uses NamespacedTypedIdentifier as key
+    # Keyed by NamespacedIdentifier. Songs nothing uses anymore are dropped,
+    # anything that needs one kept around has to hold on to it
+    _registry: InstanceRegistry[NamespacedIdentifier, "Song"] = InstanceRegistry(
+        "Song", keep=512
+    )
 
     def __new__(
         cls, ntid: Union[NamespacedIdentifier, NamespacedTypedIdentifier, str]
@@ -113,12 +110,11 @@ class Song(QObject):
         if nsid is None:
             raise ValueError(f"Cannot create Song with invalid identifier: {ntid}")
 
-        if nsid in cls._instances:
-            return cls._instances[nsid]
-        instance = super(Song, cls).__new__(cls, ntid)
-        cls._instances[nsid] = instance
-        return instance
+        return cls._registry.getOrCreate(
+            nsid, lambda: super(Song, cls).__new__(cls, ntid)
+        )
 
+    @_registry.initOnce
     def __init__(
         self, ntid: Union[NamespacedIdentifier, NamespacedTypedIdentifier, str]
     ):
@@ -135,10 +131,6 @@ class Song(QObject):
         get_info_full: Gets the full info of the song.
         get_lyrics: Gets the lyrics of the song.
         """
-        if hasattr(self, "_initialized"):
-            return
-        self._initialized: bool = True
-
         if isinstance(ntid, str):
             self.ntid = NamespacedTypedIdentifier.from_string(ntid)
         elif isinstance(ntid, NamespacedIdentifier):
@@ -166,7 +158,7 @@ class Song(QObject):
         self.songInfoIdentifier = str(self.sid) + "_info"
         self.downloadIdentifier = str(self.sid)
 
-        self.logger = logging.getLogger(f"Song.{self.nsid}")
+        self.logger = InstanceLogger(logging.getLogger("Song"), str(self.nsid))
 
         super().__init__()
 
@@ -175,26 +167,15 @@ class Song(QObject):
 
         self._downloadProgress = 0
         self._downloadState = DownloadState.NOT_DOWNLOADED
-        self.downloadStateChanged.connect(lambda: self.checkPlaybackReady())
+        # Bound methods, not lambdas: a lambda holding self, connected to
+        # self's own signal, keeps the song alive forever
+        self.downloadStateChanged.connect(self._onDownloadStateChanged)
 
         self.playbackInfo: PlaybackData | None = None
         self.gettingPlaybackReady = False
-        self.playbackReadyChanged.connect(
-            lambda: self.logger.debug(
-                f"Playback ready changed for song {self.nsid} ({self.title}): {self.playbackReady}"
-            )
-        )
+        self.playbackReadyChanged.connect(self._logPlaybackReady)
         self._prev_playbackreadyresult: bool | None = None
 
-        # Schedule cache check and file existence check on background thread
-        # This avoids blocking UI during Song creation
-        def _lazy_init():
-            if self.downloadsDatastore.checkFileExists(self.downloadIdentifier):
-                self.downloadState = DownloadState.DOWNLOADED._value_
-            self.get_info_cache_only()
-
-        universal.bgworker.addJob(_lazy_init)
-
         self.data = SongData(
             source="placeholder",
             id=self.sid,
@@ -205,6 +186,11 @@ class Song(QObject):
         # 99% of the time, the UI tries to fetch these immediately
         # So we set them to some default values to avoid attribute errors
 
+        # Cache check and file existence check happen on the background thread,
+        # so Song creation doesn't block the UI. Songs mostly get created in
+        # bulk (queue restore, album tracks), so they're checked in batches
+        _lazyInitBatcher.add(self)
+
     @QProperty(str, constant=True)
     def id(self) -> str:
         return str(self.nsid)
@@ -243,6 +229,14 @@ class Song(QObject):
             self.playbackInfo is not None
         )
 
+    def _onDownloadStateChanged(self, state: int) -> None:
+        self.checkPlaybackReady()
+
+    def _logPlaybackReady(self, ready: bool) -> None:
+        self.logger.debug(
+            f"Playback ready changed for song {self.nsid} ({self.title}): {ready}"
+        )
+
     def checkPlaybackReady(self, noEmit: bool = False) -> bool:
         """Checks if the song is ready for playback."""
         new_playbackReady = self._downloadState == DownloadState.DOWNLOADED or (
@@ -289,21 +283,47 @@ class Song(QObject):
 
     def get_info_cache_only(self) -> None:
         self.dataStatus = DataStatus.LOADING
-        identifier = self.songInfoIdentifier
-        cachedData: str
 
-        if cachedData := self.songsCache.get(identifier):  # type: ignore[assignment]
-            rawData = songDataDict(json.loads(cachedData))
-            if rawData.get("playabilityStatus", {}).get("status") == "ERROR":
-                raise Exception(
-                    f"Song cannot be retrieved due to playability issues. id: {self.id} "
-                    + rawData.get("playabilityStatus", {}).get("reason")
-                )
-        else:
+        if cachedData := self.songsCache.get(self.songInfoIdentifier):
+            self._set_cached_info(cachedData)
+
+    def _set_cached_info(self, cachedData: Union[str, bytes]) -> None:
+        rawData = codec.loads(cachedData, SongData)
+        if rawData is None:
             return
+        playability = rawData.playabilityStatus or {}
+        if playability.get("status") == "ERROR":
+            raise Exception(
+                f"Song cannot be retrieved due to playability issues. id: {self.id} "
+                + playability.get("reason")
+            )
 
         self._set_info(rawData)
 
+    @staticmethod
+    def _lazy_init(songs: list["Song"]) -> None:
+        """Download and cache checks for newly created songs, one datastore
+        listing and one cache read for each provider's songs."""
+        byProvider: dict[ProviderInterface, list[Song]] = {}
+        for song in songs:
+            byProvider.setdefault(song.provider, []).append(song)
+
+        for provider, group in byProvider.items():
+            downloaded = provider.DATASTORE.checkFilesExist(
+                song.downloadIdentifier for song in group
+            )
+            cached = provider.CACHE.getMany(song.songInfoIdentifier for song in group)
+
+            for song in group:
+                if song.downloadIdentifier in downloaded:
+                    song.downloadState = DownloadState.DOWNLOADED._value_
+                song.dataStatus = DataStatus.LOADING
+                if cachedData := cached.get(song.songInfoIdentifier):
+                    try:
+                        song._set_cached_info(cachedData)
+                    except Exception as e:
+                        song.logger.warning(f"Cached info not loaded: {e}")
+
     async def get_info(
         self, api: ytm.YTMusic | None = None, cache_only: bool = False
     ) -> None:
@@ -311,9 +331,12 @@ class Song(QObject):
         Gets the info of the song.
         """
         self.dataStatus = DataStatus.LOADING
-        cachedData: str
+        rawData: SongData | None = None
+
+        if cachedData := self.songsCache.get(self.songInfoIdentifier):
+            rawData = codec.loads(cachedData, SongData)
 
-        if not (cachedData := self.songsCache.get(self.songInfoIdentifier)):  # type: ignore[assignment]
+        if rawData is None:
             if cache_only:
                 return
 
@@ -322,22 +345,22 @@ class Song(QObject):
                 self.dataStatus = DataStatus.NOTLOADED
                 return
             self.songsCache.put(
-                self.songInfoIdentifier, json.dumps(rawData.as_dict()), byte=False
+                self.songInfoIdentifier, codec.dumps(rawData), byte=True
             )
         else:
-            rawData = songDataDict(json.loads(cachedData))
+            playability = rawData.playabilityStatus or {}
 
-            if rawData.get("playabilityStatus", {}).get("status") == "ERROR":
+            if playability.get("status") == "ERROR":
                 self.logger.warning(
                     f"Song cannot be retrieved due to playability issues. id: {self.id} "
-                    + rawData.get("playabilityStatus", {}).get("reason")
+                    + playability.get("reason")
                 )
                 self.dataStatus = DataStatus.NOTLOADED
                 return
-            if rawData.get("playabilityStatus", {}).get("status") == "LOGIN_REQUIRED":
+            if playability.get("status") == "LOGIN_REQUIRED":
                 self.logger.warning(
                     f"Song cannot be retrieved due to login requirements. id: {self.id} "
-                    + rawData.get("playabilityStatus", {}).get("reason")
+                    + playability.get("reason")
                 )
                 self.dataStatus = DataStatus.NOTLOADED
                 return
@@ -352,7 +375,12 @@ class Song(QObject):
             self.playbackInfo = None
             return
 
-        if not (cachedData := self.songsCache.get(self.playbackIdentifier)):  # type: ignore[assignment]
+        if cachedData := self.songsCache.get(self.playbackIdentifier):
+            self.playbackInfo = codec.loads(cachedData, PlaybackData)
+        else:
+            self.playbackInfo = None
+
+        if self.playbackInfo is None:
             self.playbackInfo = self.provider.get_playback(self.sid, skip_download=True)
             if self.playbackInfo is None:
                 self.playbackInfo = None
@@ -360,13 +388,10 @@ class Song(QObject):
 
             self.songsCache.put(
                 self.playbackIdentifier,
-                json.dumps(self.playbackInfo.as_dict()),
-                byte=False,
+                codec.dumps(self.playbackInfo),
+                byte=True,
                 expiration=int(time.time() + 3600),
             )  # 1 hour
-        else:
-            rawData = playbackDataDict(json.loads(cachedData))
-            self.playbackInfo = PlaybackData.from_dict(rawData)
 
         # open("playbackinfo.json", "w").write(json.dumps(self.rawPlaybackInfo))
 
@@ -402,8 +427,11 @@ class Song(QObject):
                 )
 
         if cachedPlaybackData := self.songsCache.get(self.playbackIdentifier):
-            self.playbackInfo = PlaybackData.from_dict(json.loads(cachedPlaybackData))
+            self.playbackInfo = codec.loads(cachedPlaybackData, PlaybackData)
         else:
+            self.playbackInfo = None
+
+        if self.playbackInfo is None:
             self.playbackInfo = self.provider.get_playback(
                 self.sid, skip_download=skip_download
             )
@@ -415,8 +443,8 @@ class Song(QObject):
                 return
             self.songsCache.put(
                 self.playbackIdentifier,
-                json.dumps(self.playbackInfo.as_dict()),
-                byte=False,
+                codec.dumps(self.playbackInfo),
+                byte=True,
                 expiration=int(time.time() + 3600),  # 1 hour
             )
 
@@ -450,7 +478,9 @@ class Song(QObject):
 
         # Define a progress callback
         def progress_callback(current, total):
-            self.downloadProgress = int((current / total) * 100) if total > 0 else 0
+            percent = int((current / total) * 100) if total > 0 else 0
+            if percent != self._downloadProgress:  # each set is a cross-thread signal
+                self.downloadProgress = percent
 
         self.logger.info(
             f"Downloading {self.data.title}",
@@ -459,25 +489,29 @@ class Song(QObject):
         try:
 
             # Use the NetworkManager's parallel download functionality
-            success = await universal.networkManager.download_file_parallel(
-                url=url,
-                file_obj=file,
-                chunk_size=10 * 1024 * 1024,  # 10 MB chunks
-                max_workers=4,
-                headers={"Range": f"bytes={downloaded}-"} if downloaded else None,
-                progress_callback=progress_callback,
-            )
+            with requestTimings.label("download"):
+                success = await universal.networkManager.download_file_parallel(
+                    url=url,
+                    file_obj=file,
+                    chunk_size=10 * 1024 * 1024,  # 10 MB chunks
+                    max_workers=4,
+                    headers={"Range": f"bytes={downloaded}-"} if downloaded else None,
+                    progress_callback=progress_callback,
+                    traffic_class=universal.TrafficClass.BACKGROUND,
+                )
 
             if not success:
                 self.logger.warning(
                     f"Download failed for {self.data.title}, retrying with single-threaded download."
                 )
-                success = universal.networkManager.download_file(
-                    url=url,
-                    file_obj=file,
-                    progress_callback=progress_callback,
-                    start=downloaded,
-                )
+                with requestTimings.label("download"):
+                    success = universal.networkManager.download_file(
+                        url=url,
+                        file_obj=file,
+                        progress_callback=progress_callback,
+                        start=downloaded,
+                        traffic_class=universal.TrafficClass.BACKGROUND,
+                    )
 
             if success:
                 self.logger.info(
@@ -602,26 +636,32 @@ class Song(QObject):
                     return self.playbackInfo.video_formats[0].url
             return self.playbackInfo.audio_formats[0].url
 
-    def __getattribute__(self, name):
-
-        if name in SongData(SimpleIdentifier("null")).as_dict().keys():
-            # logger = super().__getattribute__("logger")
-            # logger.warning(
-            #     f"Accessing Song.{name} directly is deprecated, use Song.data.{name} instead."
-            # )
-            return getattr(super().__getattribute__("data"), name)
-        else:
-            return super().__getattribute__(name)
-
     async def get_lyrics(self, api) -> dict:
         """
         Gets the lyrics of the song.
         """
         api: ytm.YTMusic = api
-        self.lyrics = await api.get_lyrics(self.id)
+        self.lyrics = await api.get_lyrics(str(self.sid))
         return self.lyrics
 
 
+def _forwardDataFields(cls: type) -> None:
+    """Make SongData's fields readable straight off the song (song.title is
+    song.data.title). The properties are generated once instead of checking
+    every attribute lookup on Song, which QML and the list models do a lot of.
+    Names the class defines itself (id) win."""
+    for field in dataclasses.fields(SongData):
+        if not hasattr(cls, field.name):
+            setattr(
+                cls, field.name, property(operator.attrgetter(f"data.{field.name}"))
+            )
+
+
+_forwardDataFields(Song)
+
+_lazyInitBatcher = Batcher(Song._lazy_init)
+
+
 class SongProxy(QObject):
     dataStatusChanged = Signal(int)
     downloadedChanged = Signal(bool)
@@ -641,10 +681,10 @@ class SongProxy(QObject):
         self.target.playingStatusChanged.connect(self.playingStatusChanged)
 
         self.target.songInfoFetched.connect(self.infoChanged)
-        self.target.downloadStateChanged.connect(lambda: self.update("downloadState"))
-        self.target.downloadProgressChanged.connect(
-            lambda: self.update("downloadProgress")
-        )
+        # Bound methods so the connections go away with the proxy, lambdas
+        # would keep it (and through it the song) alive
+        self.target.downloadStateChanged.connect(self._onDownloadStateChanged)
+        self.target.downloadProgressChanged.connect(self._onDownloadProgressChanged)
 
         self._id = self.target.nsid.__str__()
 
@@ -715,6 +755,12 @@ class SongProxy(QObject):
     def test(self):
         print("test")
 
+    def _onDownloadStateChanged(self, state: int) -> None:
+        self.update("downloadState")
+
+    def _onDownloadProgressChanged(self, progress: int) -> None:
+        self.update("downloadProgress")
+
     def update(self, name):
         setattr(self, "_" + name, getattr(self.target, "_" + name))
         exec(f"self.{name}Changed.emit(getattr(self, '_{name}'))")
@@ -790,13 +836,7 @@ class SongImageProvider(QQuickImageProvider):
         # ID will be in the format songID/radius
 
         skipCache = False
-        cacheIdentifier = universal.ghash(
-            f"songimage_{id}_{requestedSize.width()}x{requestedSize.height()}"
-        )
-        if cachedData := universal.imageCache.get(cacheIdentifier):
-            img = QImage()
-            img.loadFromData(cachedData)
-            return img
+        img = QImage()
 
         def usePlaceholder():
             placeholder = os.path.join(
@@ -815,38 +855,52 @@ class SongImageProvider(QQuickImageProvider):
         if song.dataStatus is DataStatus.LOADING:
             while song.dataStatus is DataStatus.LOADING:
                 time.sleep(0.1)  # wait a bit for the info to load
-        img = QImage()
 
-        if (
-            universal.networkManager.onlineStatus is not universal.OnlineStatus.ONLINE
-        ) or (song.dataStatus is not DataStatus.LOADED):
+        thumbUrl = None
+        if song.dataStatus is DataStatus.LOADED:
+            thumbUrl = getattr(song.data, "largestThumbnailUrl", None)
+
+        # Processed images are keyed by artwork URL and size, and remember which
+        # version of the artwork they were made from. They're used without any
+        # network traffic while that artwork is still fresh in the network
+        # manager's HTTP cache, or while offline
+        network = universal.networkManager
+        online = network.onlineStatus is universal.OnlineStatus.ONLINE
+        artwork = cachedData = None
+        if thumbUrl:
+            cacheIdentifier = universal.ghash(
+                f"songimage_{id}_{requestedSize.width()}x{requestedSize.height()}"
+                f"_{thumbUrl}"
+            )
+            artwork = network.http_cache.lookup(network.http_cache.key(thumbUrl))
+            cachedData = universal.imageCache.get(cacheIdentifier)
+            fresh = artwork is not None and network.http_cache.is_fresh(artwork)
+            if cachedData and (fresh or not online):
+                img.loadFromData(cachedData)
+                return img
+
+        # Otherwise the HTTP cache revalidates the artwork, or falls back to the
+        # stale copy when the host can't be reached. While offline, only artwork
+        # that's already cached is used
+        request = None
+        if thumbUrl and (online or artwork):
+            with requestTimings.label("thumbnail"):
+                request = network.get(thumbUrl, cache=True)
+
+        if not request:
             usePlaceholder()
             skipCache = True
+        elif request.status_code != 200:
+            return img
         else:
-            try:
-                thumbUrl = song.data.largestThumbnailUrl
-                if thumbUrl is None:
-                    raise TypeError
-            except (AttributeError, TypeError):
-                usePlaceholder()
-                skipCache = True
-            else:  # No exception
-                if cachedData := universal.imageCache.get(universal.ghash(thumbUrl)):
-                    img.loadFromData(cachedData)
-                else:
-                    request = universal.networkManager.get(thumbUrl)
-                    if not request:
-                        usePlaceholder()
-                        skipCache = True
-                    else:
-                        img = QImage()
-                        if request.status_code != 200:
-                            return img
-
-                        img.loadFromData(request.content)
-                        universal.imageCache.put(
-                            universal.ghash(thumbUrl), request.content, byte=True
-                        )
+            version = request.headers.get("ETag")
+            if not version:
+                version = hashlib.md5(request.content).hexdigest()
+            madeFrom = universal.imageCache.get(cacheIdentifier + "_version")
+            if cachedData and madeFrom == {"version": version}:
+                img.loadFromData(cachedData)  # revalidated, artwork unchanged
+                return img
+            img.loadFromData(request.content)
 
         if requestedSize.width() < 0 or requestedSize.height() < 0:
             requestedSize = QSize(544, 544)
@@ -869,7 +923,15 @@ class SongImageProvider(QQuickImageProvider):
                     f"Failed to cache image {id} with size {requestedSize.width()}x{requestedSize.height()}"
                 )
             else:
-                universal.imageCache.put(cacheIdentifier, buff.data(), byte=True)
+                universal.imageCache.put(
+                    cacheIdentifier, buff.data(), byte=True, overwrite=True
+                )
+                universal.imageCache.put(
+                    cacheIdentifier + "_version",
+                    {"version": version},
+                    byte=False,
+                    overwrite=True,
+                )
             buff.close()
 
         return img
@@ -13,3 +13,31 @@ class OnlineStatus(enum.IntEnum):
     OFFLINE = 0
     ONLINE = 1
     ONLINE_NO_YOUTUBE = 2
+
+
+class TrafficClass(enum.IntEnum):
+    """Traffic Class. Used to decide which bandwidth bucket a transfer draws from.
+
+    FOREGROUND: Transfers the user is waiting on right now (e.g. the playing stream) \n
+    PREFETCH: Speculative transfers for content that is likely to be needed soon \n
+    BACKGROUND: Downloads that can wait (e.g. album downloads) \n
+
+    """
+
+    FOREGROUND = 0
+    PREFETCH = 1
+    BACKGROUND = 2
+
+
+class CircuitState(enum.IntEnum):
+    """Circuit State. Used to indicate whether requests to a host are allowed through.
+
+    CLOSED: The host is healthy, requests go through \n
+    OPEN: The host is failing, requests fail fast without touching the network \n
+    HALF_OPEN: The cool-down has passed, a single probe request is allowed through \n
+
+    """
+
+    CLOSED = 0
+    OPEN = 1
+    HALF_OPEN = 2
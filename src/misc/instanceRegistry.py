@@ -0,0 +1,140 @@
+"""
+One-instance-per-id registries for Song and Album.
+
+Those objects get created wherever an id turns up (search results, album
+tracks, queue restore), so keeping every one of them forever means memory only
+ever grows. Here they're held weakly and go away once nothing (the queue, a
+model, QML) uses them, with a small strong LRU on top so an id that comes up
+again soon (a refined search, a reopened album) gets its old object back.
+"""
+
+import collections
+import functools
+import logging
+import threading
+import typing
+import weakref
+from dataclasses import dataclass, asdict
+
+K = typing.TypeVar("K", bound=typing.Hashable)
+V = typing.TypeVar("V")
+
+
+@dataclass
+class RegistryStatistics:
+    hits: int = 0
+    misses: int = 0
+
+
+class InstanceRegistry(typing.Generic[K, V]):
+    """Weak key -> instance map with a strong LRU of the most recently used.
+
+    Everything is thread-safe. `lock` is reentrant and is held across an
+    instance's creation (getOrCreate) and initialization (initOnce), so two
+    threads asking for the same id get the same, fully initialized object.
+
+    Attributes:
+        name: For logging
+        keep: How many recently used instances are held strongly
+    """
+
+    def __init__(self, name: str, keep: int = 256):
+        self.name = name
+        self.keep = keep
+        self.lock = threading.RLock()
+        self.statistics = RegistryStatistics()
+        self._instances: "weakref.WeakValueDictionary[K, V]" = (
+            weakref.WeakValueDictionary()
+        )
+        self._recent: collections.OrderedDict[K, V] = collections.OrderedDict()
+
+    def get(self, key: K) -> typing.Optional[V]:
+        """The live instance for key, if there is one"""
+        with self.lock:
+            instance = self._instances.get(key)
+            if instance is not None:
+                self._touch(key, instance)
+            return instance
+
+    def getOrCreate(self, key: K, create: typing.Callable[[], V]) -> V:
+        """The live instance for key, or a new one from create()
+
+        Args:
+            key: The id
+            create: Makes the instance, called with the lock held
+
+        Returns:
+            V: The instance
+        """
+        with self.lock:
+            instance = self._instances.get(key)
+            if instance is None:
+                self.statistics.misses += 1
+                instance = create()
+                self._instances[key] = instance
+            else:
+                self.statistics.hits += 1
+            self._touch(key, instance)
+            return instance
+
+    def initOnce(self, init: typing.Callable) -> typing.Callable:
+        """Decorator for the registered class's __init__, which Python calls
+        again every time the constructor returns an existing instance. Runs
+        it only the first time, with the lock held, so nobody gets the
+        instance back half-initialized."""
+
+        @functools.wraps(init)
+        def wrapper(instance, *args, **kwargs):
+            with self.lock:
+                if getattr(instance, "_initialized", False):
+                    return
+                init(instance, *args, **kwargs)
+                instance._initialized = True
+
+        return wrapper
+
+    def _touch(self, key: K, instance: V) -> None:
+        self._recent[key] = instance
+        self._recent.move_to_end(key)
+        while len(self._recent) > self.keep:
+            self._recent.popitem(last=False)
+
+    def values(self) -> list[V]:
+        with self.lock:
+            return list(self._instances.values())
+
+    def __contains__(self, key: K) -> bool:
+        with self.lock:
+            return key in self._instances
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self._instances)
+
+    def getStatistics(self) -> dict:
+        """Get registry counters
+
+        Returns:
+            dict: hits, misses, live (instances still alive) and pinned
+            (held by the LRU)
+        """
+        with self.lock:
+            return {
+                **asdict(self.statistics),
+                "live": len(self._instances),
+                "pinned": len(self._recent),
+            }
+
+
+class InstanceLogger(logging.LoggerAdapter):
+    """Prefixes messages with an instance's id.
+
+    For per-instance logging without a logging.getLogger(f"Song.{id}") per
+    instance, which the logging module keeps forever.
+    """
+
+    def __init__(self, logger: logging.Logger, instance: str):
+        super().__init__(logger, {"instance": instance})
+
+    def process(self, msg, kwargs):
+        return f"[{self.extra['instance']}] {msg}", kwargs  # type: ignore[index]
@@ -0,0 +1,118 @@
+import bisect
+import math
+import threading
+import typing
+
+
+def exponential_buckets(start: float, factor: float, count: int) -> list[float]:
+    """Bucket upper bounds growing geometrically, e.g. 1, 2, 4, 8...
+
+    Args:
+        start: Upper bound of the first bucket
+        factor: Ratio between consecutive bounds
+        count: Number of bounds
+
+    Returns:
+        list[float]: The bounds, in increasing order
+    """
+    return [start * factor**i for i in range(count)]
+
+
+# 0.5 ms to ~65 s, good enough for anything from a DNS cache hit to a slow download
+DEFAULT_MS_BUCKETS = exponential_buckets(0.5, 2, 18)
+
+
+class Histogram:
+    """Thread-safe fixed-bucket histogram.
+
+    Values above the last bound land in an overflow bucket. Percentiles are
+    estimated by interpolating inside the bucket they fall in, so they are only
+    as precise as the bucket layout.
+    """
+
+    def __init__(self, bounds: typing.Sequence[float] = DEFAULT_MS_BUCKETS):
+        self._lock = threading.Lock()
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+            if value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+
+    def percentile(self, p: float) -> typing.Optional[float]:
+        """Estimate the value below which `p` percent of observations fall
+
+        Args:
+            p: Percentile, 0-100
+
+        Returns:
+            Optional[float]: The estimate, or None if nothing has been observed
+        """
+        with self._lock:
+            if self.count == 0:
+                return None
+            rank = p / 100 * self.count
+            seen = 0
+            for index, bucket_count in enumerate(self.counts):
+                if bucket_count and seen + bucket_count >= rank:
+                    lower = self.bounds[index - 1] if index > 0 else 0.0
+                    upper = (
+                        self.bounds[index] if index < len(self.bounds) else self.max
+                    )
+                    lower = max(lower, self.min)
+                    upper = min(upper, self.max)
+                    fraction = (rank - seen) / bucket_count
+                    return lower + (upper - lower) * fraction
+                seen += bucket_count
+            return self.max
+
+    @property
+    def mean(self) -> typing.Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counts = [0] * (len(self.bounds) + 1)
+            self.count = 0
+            self.sum = 0.0
+            self.min = math.inf
+            self.max = -math.inf
+
+    def snapshot(self) -> dict:
+        """Summary of the histogram as plain JSON-serialisable values
+
+        Returns:
+            dict: count, sum, min, max, mean, p50, p90, p99 and the raw buckets
+        """
+        if self.count == 0:
+            return {"count": 0}
+        p50, p90, p99 = (self.percentile(p) for p in (50, 90, 99))
+        with self._lock:
+            return {
+                "count": self.count,
+                "sum": self.sum,
+                "min": self.min,
+                "max": self.max,
+                "mean": self.sum / self.count,
+                "p50": p50,
+                "p90": p90,
+                "p99": p99,
+                "buckets": {
+                    (str(bound) if i < len(self.bounds) else "inf"): c
+                    for i, (bound, c) in enumerate(
+                        zip(self.bounds + [math.inf], self.counts)
+                    )
+                    if c
+                },
+            }
@@ -0,0 +1,104 @@
+"""
+Tasks for ProcessPool (src/workers.py).
+
+Everything here runs in a spawned worker process, so it has to stay importable
+without the rest of the app: no Qt, no src.universal, and heavy libraries are
+only imported inside the functions that use them. Arguments and results cross
+the process boundary by pickling, keep them to plain data.
+"""
+
+import os
+import typing
+
+# One YoutubeDL per options set, per worker process. Building one isn't free and
+# they're reused across songs in the main process too.
+_youtubeDLs: dict[str, typing.Any] = {}
+
+
+def initWorker() -> None:
+    """Runs once in each worker process when it starts"""
+    if hasattr(os, "nice"):
+        # The UI process should win any fight over a busy core
+        try:
+            os.nice(5)
+        except OSError:
+            pass
+
+
+def warmup() -> int:
+    """Import the heavy modules the tasks need so the first real task doesn't pay
+    for it. Missing optional modules are fine, the task that needs one fails
+    on its own when it's used.
+
+    Returns:
+        int: The worker's pid, so callers can tell the workers apart
+    """
+    for module in (
+        "materialyoucolor.quantize",
+        "materialyoucolor.score.score",
+        "yt_dlp",
+    ):
+        try:
+            __import__(module)
+        except ImportError:
+            pass
+    return os.getpid()
+
+
+def quantizeImage(path: str, quality: int, maxColors: int) -> dict[int, int]:
+    """Quantize an image's colours with materialyoucolor's Celebi quantizer.
+
+    Args:
+        path: Path to the image
+        quality: Only every `quality`th pixel is sampled, 1 for all of them
+        maxColors: Maximum number of colours to return
+
+    Returns:
+        dict[int, int]: ARGB colour to pixel count
+    """
+    import materialyoucolor.quantize as materialQuantize
+
+    return materialQuantize.ImageQuantizeCelebi(path, quality, maxColors)
+
+
+def scoreImage(path: str, quality: int, maxColors: int) -> list[int]:
+    """Quantize an image and rank the colours by how suitable they are as a
+    theme source colour.
+
+    Args:
+        path: Path to the image
+        quality: Only every `quality`th pixel is sampled, 1 for all of them
+        maxColors: Maximum number of colours to quantize to
+
+    Returns:
+        list[int]: ARGB colours, best first
+    """
+    from materialyoucolor.score.score import Score
+
+    return Score.score(quantizeImage(path, quality, maxColors))
+
+
+def extractInfo(url: str, options: dict) -> typing.Optional[dict]:
+    """Run yt-dlp's extract_info without downloading anything.
+
+    Args:
+        url: Video id or URL
+        options: YoutubeDL options, must be picklable
+
+    Returns:
+        Optional[dict]: The sanitized info dict, or None if yt-dlp returned nothing
+
+    Raises:
+        RuntimeError: If extraction failed. yt-dlp's own errors carry
+            tracebacks and don't survive pickling, so only the message is kept.
+    """
+    import yt_dlp  # type: ignore[import-untyped]
+
+    key = repr(sorted(options.items()))
+    if (ytdl := _youtubeDLs.get(key)) is None:
+        ytdl = _youtubeDLs[key] = yt_dlp.YoutubeDL(options)
+    try:
+        info = ytdl.extract_info(url, download=False)
+    except Exception as e:
+        raise RuntimeError(f"{type(e).__name__}: {e}") from None
+    return ytdl.sanitize_info(info) if info is not None else None
@@ -0,0 +1,228 @@
+"""
+Per-request network timings.
+
+Every request made through NetworkManager or the async worker's aiohttp session
+is recorded here with its phase timings (DNS, connect, TLS, time to first byte,
+transfer), size and the label of whoever made it, so slow song starts can be
+broken down at runtime or dumped to a file and looked at later.
+"""
+
+import asyncio
+import collections
+import contextlib
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+import types
+import typing
+from dataclasses import dataclass, asdict, field
+
+import aiohttp
+
+from src.paths import Paths
+from src.misc.metrics import Histogram, exponential_buckets
+
+# What the current code is fetching, e.g. "search", "info", "lyrics", "playback",
+# "thumbnail", "download". Set it with `label()` around the call that makes the request.
+requestLabel: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "requestLabel", default="other"
+)
+
+# Called with (host, reachable) once an aiohttp request has an outcome: True for
+# any response, False when the host couldn't be reached. NetworkManager listens
+# so its online status sees the async session's traffic too
+outcome_listeners: list[typing.Callable[[str, bool], None]] = []
+
+PHASES = ("dns", "connect", "tls", "ttfb", "transfer", "total")
+BYTES_BUCKETS = exponential_buckets(256, 4, 12)  # 256 B to ~1 GB
+
+
+@contextlib.contextmanager
+def label(name: str):
+    """Tag every request made inside the block with `name`"""
+    token = requestLabel.set(name)
+    try:
+        yield
+    finally:
+        requestLabel.reset(token)
+
+
+@dataclass
+class RequestTiming:
+    """Timings of one request, in milliseconds. Connection phases are None when
+    the request reused a pooled connection (or the client can't tell them apart)."""
+
+    label: str
+    host: str
+    method: str
+    started: float = field(default_factory=time.time)
+    status: typing.Optional[int] = None
+    error: typing.Optional[str] = None
+    dns: typing.Optional[float] = None
+    connect: typing.Optional[float] = None
+    tls: typing.Optional[float] = None
+    ttfb: typing.Optional[float] = None
+    transfer: typing.Optional[float] = None
+    total: typing.Optional[float] = None
+    bytes: typing.Optional[int] = None
+
+
+class RequestTimingRecorder:
+    """Aggregates RequestTimings into per-label histograms and keeps the most
+    recent raw timings around for dumping."""
+
+    def __init__(self, keep: int = 2000):
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger("RequestTimings")
+        self.recent: collections.deque[RequestTiming] = collections.deque(maxlen=keep)
+        self.histograms: dict[tuple[str, str], Histogram] = {}
+        self.errors: collections.Counter[str] = collections.Counter()
+
+    def _histogram(self, label_: str, phase: str) -> Histogram:
+        key = (label_, phase)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = Histogram(BYTES_BUCKETS) if phase == "bytes" else Histogram()
+            self.histograms[key] = histogram
+        return histogram
+
+    def record(self, timing: RequestTiming) -> None:
+        with self._lock:
+            self.recent.append(timing)
+            if timing.error:
+                self.errors[timing.label] += 1
+            for phase in PHASES + ("bytes",):
+                value = getattr(timing, phase)
+                if value is not None:
+                    self._histogram(timing.label, phase).observe(value)
+        if self.logger.isEnabledFor(logging.DEBUG):  # recorded for every request
+            self.logger.debug(
+                "%s %s %s: %s",
+                timing.label,
+                timing.method,
+                timing.host,
+                ", ".join(
+                    f"{phase} {getattr(timing, phase):.1f}ms"
+                    for phase in PHASES
+                    if getattr(timing, phase) is not None
+                ),
+            )
+
+    def summary(self) -> dict:
+        """Histogram snapshots grouped by label, then by phase
+
+        Returns:
+            dict: {label: {phase: snapshot, ..., "errors": count}}
+        """
+        with self._lock:
+            items = list(self.histograms.items())
+            errors = dict(self.errors)
+        result: dict[str, dict] = {}
+        for (label_, phase), histogram in items:
+            result.setdefault(label_, {})[phase] = histogram.snapshot()
+        for label_, count in errors.items():
+            result.setdefault(label_, {})["errors"] = count
+        return result
+
+    def dump(self, path: typing.Optional[str] = None) -> str:
+        """Write the summary and the recent raw timings to a JSON file
+
+        Args:
+            path: Where to write, defaults to request_timings.json in the data directory
+
+        Returns:
+            str: The path written to
+        """
+        path = path or os.path.join(Paths.DATAPATH, "request_timings.json")
+        with self._lock:
+            recent = [asdict(t) for t in self.recent]
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"summary": self.summary(), "requests": recent}, f, indent=1)
+        self.logger.info(f"Request timings written to {path}")
+        return path
+
+    def reset(self) -> None:
+        with self._lock:
+            self.recent.clear()
+            self.histograms.clear()
+            self.errors.clear()
+
+
+recorder = RequestTimingRecorder()
+
+
+def _ms(start: float, end: typing.Optional[float] = None) -> float:
+    return ((end if end is not None else time.perf_counter()) - start) * 1000
+
+
+def _report_outcome(host: str, reachable: bool) -> None:
+    for listener in outcome_listeners:
+        try:
+            listener(host, reachable)
+        except Exception:
+            logging.getLogger("RequestTimings").exception("Outcome listener failed")
+
+
+def aiohttp_trace_config() -> aiohttp.TraceConfig:
+    """A TraceConfig that records every request of an aiohttp session and
+    reports its outcome to `outcome_listeners`.
+
+    aiohttp doesn't report the TLS handshake separately, so it is included in
+    `connect`. The body is read by the caller after the request "ends", so
+    `transfer` isn't known and `bytes` comes from Content-Length.
+    """
+
+    trace_config = aiohttp.TraceConfig()
+
+    async def on_request_start(session, ctx: types.SimpleNamespace, params):
+        ctx.start = time.perf_counter()
+        ctx.timing = RequestTiming(
+            label=requestLabel.get(),
+            host=params.url.host or "",
+            method=params.method,
+        )
+
+    async def on_dns_resolvehost_start(session, ctx, params):
+        ctx.dns_start = time.perf_counter()
+
+    async def on_dns_resolvehost_end(session, ctx, params):
+        ctx.timing.dns = _ms(ctx.dns_start)
+
+    async def on_connection_create_start(session, ctx, params):
+        ctx.connect_start = time.perf_counter()
+
+    async def on_connection_create_end(session, ctx, params):
+        connect = _ms(ctx.connect_start)
+        # The connector resolves the host inside connection creation
+        ctx.timing.connect = connect - (ctx.timing.dns or 0)
+
+    async def on_request_end(session, ctx, params):
+        timing: RequestTiming = ctx.timing
+        timing.ttfb = timing.total = _ms(ctx.start)
+        timing.status = params.response.status
+        timing.bytes = params.response.content_length
+        recorder.record(timing)
+        _report_outcome(timing.host, True)
+
+    async def on_request_exception(session, ctx, params):
+        timing: RequestTiming = ctx.timing
+        timing.total = _ms(ctx.start)
+        timing.error = type(params.exception).__name__
+        recorder.record(timing)
+        if isinstance(
+            params.exception, (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+        ):
+            _report_outcome(timing.host, False)
+
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_dns_resolvehost_start.append(on_dns_resolvehost_start)
+    trace_config.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+    trace_config.on_connection_create_start.append(on_connection_create_start)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    trace_config.on_request_end.append(on_request_end)
+    trace_config.on_request_exception.append(on_request_exception)
+    return trace_config
@@ -1,3 +1,4 @@
+import aiohttp
 import requests
 import logging
 from typing import Dict, Any, Optional, Union, Tuple
@@ -5,18 +6,756 @@ import time
 import urllib3
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+from urllib3.exceptions import MaxRetryError, ResponseError
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from requests.structures import CaseInsensitiveDict
 from concurrent.futures import ThreadPoolExecutor
 import enum
 import os
+import threading
+import email.utils
+import contextvars
+from dataclasses import dataclass, asdict
 
 from src import paths
 from src.misc import settings
-from src.misc.enumerations.Network import OnlineStatus
-from src.workers import bgworker, TimedJobSettings
+from src.misc.enumerations.Network import OnlineStatus, TrafficClass, CircuitState
+from src.cacheManager.cacheManager import CacheManager, ghash
+from src.misc import requestTimings
+from src.workers import (
+    bgworker,
+    asyncBgworker,
+    TimedJobSettings,
+    ExecutionPriority,
+    argfuncFactory,
+)
 
 from PySide6.QtCore import QObject, Signal, Slot, Property
 
 
+# Hosts whose failure means YouTube specifically is unreachable
+YOUTUBE_HOSTS = ("youtube.com", "googlevideo.com", "youtubei.googleapis.com")
+
+# API and thumbnail hosts whose connections are opened at startup and kept warm
+WARM_URLS = [
+    "https://music.youtube.com/",
+    "https://www.youtube.com/",
+    "https://i.ytimg.com/",
+    "https://lh3.googleusercontent.com/",
+]
+
+
+@dataclass
+class NetworkStatistics:
+    requests: int = 0
+    coalesced: int = 0
+    memo_hits: int = 0
+    cache_hits: int = 0
+    cache_revalidated: int = 0
+    cache_stored: int = 0
+    cache_stale_served: int = 0
+    circuit_rejected: int = 0
+
+
+class _InFlightRequest:
+    """A GET that is currently on the wire. Identical callers wait on it instead of
+    issuing their own request."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response: Union[requests.Response, None] = None
+
+
+class HttpCache:
+    """HTTP-semantics response cache.
+
+    Stores the body of cacheable GET responses along with their validators
+    (ETag / Last-Modified) and freshness lifetime (Cache-Control / Expires) in a
+    CacheManager, so entries survive restarts. Fresh entries are served without
+    touching the network, stale ones are revalidated with a conditional request.
+
+    Entries are keyed by URL alone, so responses that depend on anything else
+    (Vary, credentials) are never stored.
+    """
+
+    # Headers worth keeping with the body so a cached response looks like the original
+    KEPT_HEADERS = ("Content-Type", "Content-Length", "ETag", "Last-Modified")
+    MAX_HEURISTIC_LIFETIME = 24 * 60 * 60  # seconds
+    MAX_BODY_SIZE = 4 * 1024 * 1024  # bytes
+    CREDENTIAL_HEADERS = ("Authorization", "Cookie")
+
+    def __init__(self, cache: CacheManager):
+        self.cache = cache
+
+    @staticmethod
+    def key(url: str, params: Optional[Dict] = None) -> str:
+        return ghash(url + (repr(sorted(params.items())) if params else ""))
+
+    def lookup(self, key: str) -> Optional[dict]:
+        """Get the stored entry for a key, or None if there is none."""
+        entry = self.cache.get(key + "_meta")
+        if not entry or not self.cache.checkInCache(key):
+            return None
+        return entry
+
+    @staticmethod
+    def is_fresh(entry: dict) -> bool:
+        return not entry.get("no_cache") and time.time() < entry.get("expires", 0)
+
+    @staticmethod
+    def conditional_headers(entry: dict) -> Dict[str, str]:
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    @staticmethod
+    def _parse_cache_control(value: str) -> Dict[str, Optional[str]]:
+        directives: Dict[str, Optional[str]] = {}
+        for part in value.split(","):
+            name, _, arg = part.strip().partition("=")
+            if name:
+                directives[name.lower()] = arg.strip('"') if arg else None
+        return directives
+
+    def _freshness(self, response: requests.Response) -> Tuple[float, bool, bool]:
+        """Work out how long a response stays fresh.
+
+        Returns:
+            (expires timestamp, no_cache, storable)
+        """
+        now = time.time()
+        directives = self._parse_cache_control(
+            response.headers.get("Cache-Control", "")
+        )
+        if "no-store" in directives:
+            return 0, True, False
+
+        no_cache = "no-cache" in directives
+        if directives.get("max-age") is not None:
+            try:
+                return now + int(directives["max-age"] or 0), no_cache, True
+            except ValueError:
+                pass
+
+        if expires := response.headers.get("Expires"):
+            try:
+                return (
+                    email.utils.parsedate_to_datetime(expires).timestamp(),
+                    no_cache,
+                    True,
+                )
+            except (TypeError, ValueError):
+                return 0, no_cache, True  # invalid Expires means already expired
+
+        # Heuristic freshness (RFC 9111 4.2.2): 10% of the time since last modification
+        if last_modified := response.headers.get("Last-Modified"):
+            try:
+                age = now - email.utils.parsedate_to_datetime(last_modified).timestamp()
+                return (
+                    now + min(max(age, 0) / 10, self.MAX_HEURISTIC_LIFETIME),
+                    no_cache,
+                    True,
+                )
+            except (TypeError, ValueError):
+                pass
+        return 0, no_cache, True
+
+    def store(self, key: str, response: requests.Response) -> bool:
+        """Store a 200 response if it is cacheable and can be revalidated or is fresh.
+
+        Responses over MAX_BODY_SIZE, with a Vary header, or to a request that
+        carried credentials are not stored.
+
+        Returns:
+            True if the response was stored
+        """
+        if response.status_code != 200 or "Vary" in response.headers:
+            return False
+        if len(response.content) > self.MAX_BODY_SIZE:
+            return False
+        if response.request is not None and any(
+            h in response.request.headers for h in self.CREDENTIAL_HEADERS
+        ):
+            return False
+        expires, no_cache, storable = self._freshness(response)
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not storable or not (etag or last_modified or expires > time.time()):
+            return False
+
+        self.cache.put(key, response.content, byte=True, overwrite=True)
+        self.cache.put(
+            key + "_meta",
+            {
+                "url": response.url,
+                "etag": etag,
+                "last_modified": last_modified,
+                "expires": expires,
+                "no_cache": no_cache,
+                "headers": {
+                    h: response.headers[h]
+                    for h in self.KEPT_HEADERS
+                    if h in response.headers
+                },
+            },
+            byte=False,
+            overwrite=True,
+        )
+        return True
+
+    def refresh(self, key: str, entry: dict, response: requests.Response) -> None:
+        """Update an entry's freshness and validators from a 304 response."""
+        expires, no_cache, storable = self._freshness(response)
+        if not storable:
+            self.cache.delete(key)
+            self.cache.delete(key + "_meta")
+            return
+        entry["expires"] = expires
+        entry["no_cache"] = no_cache
+        entry["etag"] = response.headers.get("ETag", entry.get("etag"))
+        entry["last_modified"] = response.headers.get(
+            "Last-Modified", entry.get("last_modified")
+        )
+        self.cache.put(key + "_meta", entry, byte=False, overwrite=True)
+
+    def build_response(self, key: str, entry: dict) -> Optional[requests.Response]:
+        """Build a response object from a stored entry."""
+        body = self.cache.get(key)
+        if body is False or body is None:
+            return None
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = entry.get("url", "")
+        response.headers = CaseInsensitiveDict(entry.get("headers", {}))
+        response._content = bytes(body)
+        return response
+
+
+class TokenBucket:
+    """Token-bucket rate limiter shared by every transfer in one traffic class.
+
+    Transfers take tokens (bytes) as they read. A transfer may borrow against
+    future tokens, in which case it sleeps until the debt is paid back, so
+    concurrent readers split the rate between them. A rate of 0 means unlimited.
+    """
+
+    def __init__(self, rate: float = 0, burst: Optional[float] = None):
+        self._lock = threading.Lock()
+        self.rate = rate
+        self.burst = burst if burst is not None else rate
+        self._tokens = self.burst
+        self._last = time.monotonic()
+
+    def set_rate(self, rate: float, burst: Optional[float] = None) -> None:
+        with self._lock:
+            self._refill()
+            self.rate = rate
+            self.burst = burst if burst is not None else rate
+            self._tokens = min(self._tokens, self.burst)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def consume(self, amount: int) -> None:
+        """Take `amount` tokens, sleeping if the bucket is in debt."""
+        with self._lock:
+            if self.rate <= 0:
+                return
+            self._refill()
+            self._tokens -= amount
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+
+class ProgressAggregator:
+    """Combines per-worker byte counts into a rate-limited progress callback.
+
+    Each worker owns one counter slot and is the only writer to it, so the hot
+    path takes no lock. The callback fires only when the whole-number percentage
+    changes, and at most once every `interval` seconds. `finish` always
+    publishes the final value.
+    """
+
+    def __init__(
+        self,
+        callback,
+        total: int,
+        workers: int = 1,
+        initial: int = 0,
+        interval: float = 0.1,
+    ):
+        self.callback = callback
+        self.total = total
+        self.initial = initial
+        self.interval = interval
+        self.counters = [0] * workers
+        self._publish_lock = threading.Lock()
+        self._last_publish = 0.0
+        self._last_percent = -1
+
+    def add(self, worker: int, amount: int) -> None:
+        self.counters[worker] += amount
+        if self.callback is None:
+            return
+        if time.monotonic() - self._last_publish < self.interval:
+            return
+        # Another worker is already publishing; its value is recent enough
+        if not self._publish_lock.acquire(blocking=False):
+            return
+        try:
+            self._publish(force=False)
+        finally:
+            self._publish_lock.release()
+
+    def current(self) -> int:
+        return self.initial + sum(self.counters)
+
+    def _publish(self, force: bool) -> None:
+        self._last_publish = time.monotonic()
+        current = self.current()
+        percent = int(current * 100 / self.total) if self.total > 0 else 0
+        if percent == self._last_percent and not force:
+            return
+        self._last_percent = percent
+        self.callback(current, self.total)
+
+    def finish(self) -> None:
+        if self.callback is None:
+            return
+        with self._publish_lock:
+            self._publish(force=True)
+
+
+class RetryBudget:
+    """A retry allowance shared by every request in the session.
+
+    Each request deposits `ratio` of a retry, and a small reserve trickles in
+    over time so that an idle app can still retry. When a host is failing,
+    retries are capped at roughly `ratio` of the traffic instead of multiplying
+    it by the retry count.
+    """
+
+    def __init__(
+        self, ratio: float = 0.2, reserve_per_second: float = 1, max_tokens: float = 10
+    ):
+        self._lock = threading.Lock()
+        self.ratio = ratio
+        self.reserve_per_second = reserve_per_second
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._last = time.monotonic()
+        self.denied = 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.max_tokens,
+            self._tokens + (now - self._last) * self.reserve_per_second,
+        )
+        self._last = now
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                self.denied += 1
+                return False
+            self._tokens -= 1
+            return True
+
+
+class BudgetedRetry(Retry):
+    """Retry strategy that stops retrying once the shared retry budget runs out"""
+
+    budget = RetryBudget()
+
+    def increment(
+        self,
+        method=None,
+        url=None,
+        response=None,
+        error=None,
+        _pool=None,
+        _stacktrace=None,
+    ):
+        new_retry = super().increment(
+            method, url, response, error, _pool, _stacktrace
+        )  # raises on its own once the per-request retries are used up
+        if not type(self).budget.try_spend():
+            raise MaxRetryError(
+                _pool, url, error or ResponseError("retry budget exhausted")  # type: ignore[arg-type]
+            )
+        return new_retry
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request to a host whose circuit is open"""
+
+
+class CircuitBreaker:
+    """Tracks the health of one host.
+
+    After `failure_threshold` consecutive failures the circuit opens and requests
+    fail fast. Once `reset_timeout` has passed, one probe request is let through
+    (half-open). If it succeeds the circuit closes; if it fails the circuit opens
+    again and the timeout doubles, up to `max_reset_timeout`.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        on_state_change=None,
+        failure_threshold: int = 5,
+        reset_timeout: float = 15,
+        max_reset_timeout: float = 240,
+    ):
+        self._lock = threading.Lock()
+        self.host = host
+        self.on_state_change = on_state_change
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now. Claims the probe slot when half-opening."""
+        with self._lock:
+            if self.state == CircuitState.CLOSED:
+                return True
+            if self.state == CircuitState.HALF_OPEN or self._probe_in_flight:
+                return False
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self.state = CircuitState.HALF_OPEN
+            self._probe_in_flight = True
+        self._notify()
+        return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._probe_in_flight = False
+            if self.state == CircuitState.CLOSED:
+                return
+            self.state = CircuitState.CLOSED
+            self.reset_timeout = self.base_reset_timeout
+        self._notify()
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == CircuitState.HALF_OPEN:
+                self.reset_timeout = min(self.reset_timeout * 2, self.max_reset_timeout)
+            elif self.state == CircuitState.OPEN or (
+                self.failures < self.failure_threshold
+            ):
+                return
+            self.state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+        self._notify()
+
+    def _notify(self) -> None:
+        if self.on_state_change:
+            self.on_state_change(self.host, self.state)
+
+
+class _TimedConnectionMixin:
+    """Records how long connecting (DNS and TCP, which urllib3 does in one call)
+    and the TLS handshake took when a new connection is opened. The adapter
+    collects them with `take_connect_timings`."""
+
+    _connect_timings: Optional[Dict[str, float]] = None
+
+    def _new_conn(self):
+        start = time.perf_counter()
+        sock = super()._new_conn()  # type: ignore[misc]
+        self._connect_timings = {"connect": (time.perf_counter() - start) * 1000}
+        return sock
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()  # type: ignore[misc]
+        if self._connect_timings is not None and "tls" not in self._connect_timings:
+            if isinstance(self, HTTPSConnection):
+                handshake = (time.perf_counter() - start) * 1000
+                self._connect_timings["tls"] = max(
+                    0.0, handshake - self._connect_timings["connect"]
+                )
+
+    def take_connect_timings(self) -> Optional[Dict[str, float]]:
+        """The timings of this connection's setup, once. None if it was reused."""
+        timings, self._connect_timings = self._connect_timings, None
+        return timings
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class CircuitBreakerAdapter(HTTPAdapter):
+    """HTTPAdapter that routes every request through its host's circuit breaker
+    and records its timing in requestTimings.
+
+    Connection warming requests (sent while `manager._warming.active` is set)
+    aren't retried, and their outcome isn't counted as traffic to the host.
+    Connectivity probes (`manager._probing.active`) aren't retried either, and
+    skip the breaker: they're how an open circuit learns its host is back.
+    """
+
+    def __init__(self, manager: "NetworkManager", *args, **kwargs):
+        self.manager = manager
+        super().__init__(*args, **kwargs)
+
+    @property  # type: ignore[override]
+    def max_retries(self) -> Retry:
+        if getattr(self.manager._warming, "active", False) or getattr(
+            self.manager._probing, "active", False
+        ):
+            return Retry(0, read=False)
+        return self._max_retries
+
+    @max_retries.setter
+    def max_retries(self, value: Retry) -> None:
+        self._max_retries = value
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+    def send(self, request, *args, **kwargs):
+        host = urllib3.util.parse_url(request.url).host or ""
+        warming = getattr(self.manager._warming, "active", False)
+        probing = getattr(self.manager._probing, "active", False)
+        breaker = self.manager.breaker_for(host)
+        if not probing and not breaker.allow():
+            with self.manager._inflight_lock:
+                self.manager.statistics.circuit_rejected += 1
+            raise CircuitOpenError(f"Circuit open for {host}", request=request)
+
+        BudgetedRetry.budget.deposit()
+        timing = requestTimings.RequestTiming(
+            label=requestTimings.requestLabel.get(),
+            host=host,
+            method=request.method or "",
+        )
+        if not warming:
+            self.manager.host_last_used[host] = time.monotonic()
+        started = time.perf_counter()
+        try:
+            # Returns once the headers are in; the body is read lazily
+            response = super().send(request, *args, **kwargs)
+        except Exception as e:
+            timing.total = (time.perf_counter() - started) * 1000
+            timing.error = type(e).__name__
+            requestTimings.recorder.record(timing)
+            if warming:
+                raise
+            breaker.record_failure()
+            if isinstance(
+                e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+            ):
+                self.manager.connectivity.record(host, False)
+            raise
+        headers_at = time.perf_counter()
+        self._track_timing(timing, response, started, headers_at)
+
+        if warming:
+            return response
+        self.manager.connectivity.record(host, True)
+        self.manager.record_first_request(host, headers_at - started)
+        if response.status_code >= 500 or response.status_code == 429:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    @staticmethod
+    def _track_timing(
+        timing: "requestTimings.RequestTiming",
+        response: requests.Response,
+        started: float,
+        headers_at: float,
+    ) -> None:
+        """Fill in the connection phases now and record the timing once the body
+        has been read, which is when urllib3 hands the connection back"""
+        raw = response.raw
+        timing.status = response.status_code
+        timing.ttfb = (headers_at - started) * 1000
+        connection = getattr(raw, "connection", None)
+        if connection is not None and hasattr(connection, "take_connect_timings"):
+            if phases := connection.take_connect_timings():
+                timing.connect = phases.get("connect")
+                timing.tls = phases.get("tls")
+
+        read, release_conn = raw.read, raw.release_conn
+        state = {"reading": False, "released": False, "recorded": False}
+
+        def finish():
+            if state["recorded"]:
+                return
+            state["recorded"] = True
+            finished = time.perf_counter()
+            timing.transfer = (finished - headers_at) * 1000
+            timing.total = (finished - started) * 1000
+            timing.bytes = raw.tell()
+            requestTimings.recorder.record(timing)
+
+        # urllib3 releases the connection from inside the read that hits the end
+        # of the body, before that read is counted, so finish after it returns
+        def read_and_record(*args, **kwargs):
+            state["reading"] = True
+            try:
+                return read(*args, **kwargs)
+            finally:
+                state["reading"] = False
+                if state["released"]:
+                    finish()
+
+        def release_and_record():
+            release_conn()
+            state["released"] = True
+            if not state["reading"]:
+                finish()
+
+        raw.read = read_and_record
+        raw.release_conn = release_and_record
+
+
+class ConnectivityMonitor:
+    """Works out the online status from the outcome of real traffic.
+
+    Every request NetworkManager or the async worker's aiohttp session sends is
+    reported here. A response of any kind proves the network is up. Several
+    consecutive connection failures mean we're offline, and the same number in
+    a row to one YouTube host means YouTube is unreachable until that host
+    answers again. Lightweight HEAD probes are only sent when no traffic has
+    been seen for `idle_after` seconds, or while offline, so no user-facing
+    request ever waits on a probe.
+    """
+
+    PROBE_URLS = {
+        "internet": "https://www.google.com/generate_204",
+        "youtube": "https://music.youtube.com/",
+    }
+
+    def __init__(
+        self,
+        manager: "NetworkManager",
+        idle_after: float = 30,
+        offline_after_failures: int = 3,
+    ):
+        self._lock = threading.Lock()
+        self.manager = manager
+        self.idle_after = idle_after
+        self.offline_after_failures = offline_after_failures
+        self.last_traffic = 0.0
+        self._consecutive_failures = 0
+        # YouTube host -> consecutive connection failures
+        self._youtube_failures: dict[str, int] = {}
+
+    def record(self, host: str, reachable: bool) -> None:
+        """Record the outcome of a request to `host`, then publish any status change"""
+        with self._lock:
+            self.last_traffic = time.monotonic()
+            if reachable:
+                self._consecutive_failures = 0
+            else:
+                self._consecutive_failures += 1
+            if NetworkManager._is_youtube_host(host):
+                if reachable:
+                    self._youtube_failures.pop(host, None)
+                else:
+                    self._youtube_failures[host] = (
+                        self._youtube_failures.get(host, 0) + 1
+                    )
+        self.update()
+
+    def status(self) -> OnlineStatus:
+        with self._lock:
+            if self._consecutive_failures >= self.offline_after_failures:
+                return OnlineStatus.OFFLINE
+            youtube_reachable = all(
+                failures < self.offline_after_failures
+                for failures in self._youtube_failures.values()
+            )
+        if not youtube_reachable or self.manager.youtube_circuit_open():
+            return OnlineStatus.ONLINE_NO_YOUTUBE
+        return OnlineStatus.ONLINE
+
+    def update(self) -> None:
+        status = self.status()
+        if status != self.manager.onlineStatus:
+            self.manager.logger.info(f"Online status changed to {status.name}")
+        self.manager.onlineStatus = status  # only emits on transitions
+
+    def probe(self) -> OnlineStatus:
+        """Send the HEAD probes now. Their outcome is recorded like any other request.
+
+        Probes are sent even to hosts whose circuit is open, and an answer closes
+        the circuit, so being offline long enough to trip the breakers doesn't
+        keep us offline once the network is back.
+
+        Probes aren't retried, a retry with backoff would only hold up the worker
+        running the probe for longer when the answer is "offline".
+        """
+        self.manager._probing.active = True
+        try:
+            for url in self.PROBE_URLS.values():
+                try:
+                    self.manager.session.head(url, timeout=2, allow_redirects=False)
+                except requests.exceptions.RequestException:
+                    pass  # the adapter has recorded the failure
+        finally:
+            self.manager._probing.active = False
+        self.update()
+        return self.manager.onlineStatus
+
+    def probe_if_idle(self) -> bool:
+        """Probe only if there's been no traffic lately (or we think we're offline)
+
+        Returns:
+            bool: Whether probes were sent
+        """
+        idle = time.monotonic() - self.last_traffic >= self.idle_after
+        if not idle and self.manager.onlineStatus != OnlineStatus.OFFLINE:
+            return False
+        self.probe()
+        return True
+
+
 class NetworkManager(QObject):
     """Centralized network request manager for Clarity"""
 
@@ -49,33 +788,239 @@ class NetworkManager(QObject):
             # "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8"
         }
 
+        # Per-host circuit breakers, keyed by hostname
+        self.breakers: dict[str, CircuitBreaker] = {}
+        self._breakers_lock = threading.Lock()
+
         # Configure session with retry logic
-        retry_strategy = Retry(
+        retry_strategy = BudgetedRetry(
             total=3,
             backoff_factor=0.5,
             status_forcelist=[429, 500, 502, 503, 504],
             allowed_methods=["GET", "POST", "PUT", "DELETE", "HEAD", "OPTIONS"],
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        adapter = CircuitBreakerAdapter(self, max_retries=retry_strategy)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
         self.session.headers.update(self.default_headers)
 
+        # Request coalescing (singleflight) for identical GETs
+        self.memo_ttl: float = 2.0  # seconds a finished response is shared for
+        self._inflight: dict[tuple, _InFlightRequest] = {}
+        self._response_memo: dict[tuple, Tuple[float, requests.Response]] = {}
+        self._inflight_lock = threading.Lock()
+        self.statistics: NetworkStatistics = NetworkStatistics()
+
+        # Conditional-request cache, persisted across launches
+        self.http_cache = HttpCache(
+            CacheManager(
+                name="http_cache",
+                directory=os.path.join(paths.Paths.DATAPATH, "http_cache"),
+            )
+        )
+
+        # Bandwidth shaping, in bytes per second (0 = unlimited)
+        self.bandwidth_limits: dict[TrafficClass, float] = {
+            TrafficClass.FOREGROUND: 0,
+            TrafficClass.PREFETCH: 0,
+            TrafficClass.BACKGROUND: 0,
+        }
+        # Limits applied while the media player is stalled waiting on the network
+        self.buffering_limits: dict[TrafficClass, float] = {
+            TrafficClass.PREFETCH: 512 * 1024,
+            TrafficClass.BACKGROUND: 128 * 1024,
+        }
+        self.buckets: dict[TrafficClass, TokenBucket] = {
+            tc: TokenBucket(rate) for tc, rate in self.bandwidth_limits.items()
+        }
+        self.playbackBuffering = False
+
+        # Connection pre-warming
+        self.keepalive_interval: float = 30  # seconds before an idle warm host is re-warmed
+        self.warm_for: float = 300  # seconds a host stays warm after real use
+        self.warm_timeout: float = 1
+        self.warm_hosts: dict[str, str] = {}  # host -> URL used to warm it
+        self.preconnected_hosts: set[str] = set()
+        self.host_last_used: dict[str, float] = {}  # real traffic only
+        self.host_last_warmed: dict[str, float] = {}
+        # host -> (was warmed, TTFB in seconds) of the first real request
+        self.first_request_ttfb: dict[str, Tuple[bool, float]] = {}
+        self._warming = threading.local()
+        self._probing = threading.local()
+
         NetworkManager._instance = self
-        self.onlineStatus: OnlineStatus = OnlineStatus.ONLINE
+        self._onlineStatus: OnlineStatus = OnlineStatus.ONLINE
+        self.connectivity = ConnectivityMonitor(self)
+        # ytmusicapi's traffic goes through the async worker's aiohttp session
+        requestTimings.outcome_listeners.append(self.connectivity.record)
 
         bgworker.timed_job_manager.addTimedJob(
             self.occasionally_test_onlinemode,
             TimedJobSettings(
-                dynamic=True, base_interval=10, max_interval=60, growth_factor=1.5
+                dynamic=True,
+                base_interval=10,
+                max_interval=60,
+                growth_factor=1.5,
+                jitter=0.1,
             ),
         )  # Max interval of 1 minute, run every 10 seconds to start
+        bgworker.timed_job_manager.addTimedJob(
+            self.keep_connections_warm,
+            TimedJobSettings(
+                dynamic=False,
+                base_interval=10,
+                max_interval=10,
+                growth_factor=1,
+                interval=10,
+                jitter=0.1,
+            ),
+        )
 
     def occasionally_test_onlinemode(self) -> bool:
-        self.test_onlinemode()
+        self.connectivity.probe_if_idle()
         return True  # We always want to increase the timer, so treat every run as a success
         # to not reset the dynamic interval timer to 0
 
+    def breaker_for(self, host: str) -> CircuitBreaker:
+        """Get or create the circuit breaker for a host"""
+        with self._breakers_lock:
+            breaker = self.breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(host, self._on_circuit_state_changed)
+                self.breakers[host] = breaker
+            return breaker
+
+    @staticmethod
+    def _is_youtube_host(host: str) -> bool:
+        return host.endswith(YOUTUBE_HOSTS)
+
+    def _on_circuit_state_changed(self, host: str, state: CircuitState) -> None:
+        if state == CircuitState.OPEN:
+            self.logger.warning(f"Circuit opened for {host}, failing fast")
+        elif state == CircuitState.CLOSED:
+            self.logger.info(f"Circuit closed for {host}")
+
+        if self._is_youtube_host(host):
+            self.connectivity.update()
+
+    def youtube_circuit_open(self) -> bool:
+        """Whether any YouTube host's circuit is open or half-open"""
+        with self._breakers_lock:
+            return any(
+                b.state != CircuitState.CLOSED
+                for h, b in self.breakers.items()
+                if self._is_youtube_host(h)
+            )
+
+    def preconnect(self, url: str, keep_warm: bool = False) -> bool:
+        """Open a pooled connection to the host of `url` so the next real request
+        skips DNS, TCP and TLS setup. Blocking; run it on a worker.
+
+        The HEAD isn't retried and gives up after `warm_timeout`. Nothing is sent
+        while offline or while the host's circuit isn't closed.
+
+        Args:
+            url: Any URL on the host to warm up
+            keep_warm: Whether to keep re-warming the host while it's in use
+
+        Returns:
+            bool: Whether the host answered
+        """
+        parsed = urllib3.util.parse_url(url)
+        if parsed.host is None:
+            return False
+        origin = f"{parsed.scheme or 'https'}://{parsed.netloc}/"
+        if keep_warm:
+            self.warm_hosts[parsed.host] = origin
+        self.host_last_warmed[parsed.host] = time.monotonic()
+        if (
+            self.onlineStatus == OnlineStatus.OFFLINE
+            or self.breaker_for(parsed.host).state != CircuitState.CLOSED
+        ):
+            return False
+
+        self._warming.active = True
+        try:
+            with requestTimings.label("prewarm"):
+                self.session.head(
+                    origin, timeout=self.warm_timeout, allow_redirects=False
+                )
+            self.preconnected_hosts.add(parsed.host)
+            self.logger.debug(f"Pre-connected to {parsed.host}")
+            return True
+        except requests.exceptions.RequestException as e:
+            self.logger.debug(f"Pre-connect to {parsed.host} failed - {str(e)}")
+            return False
+        finally:
+            self._warming.active = False
+
+    def warm_connections(self, urls: Optional[list[str]] = None) -> None:
+        """Pre-connect to the API and thumbnail hosts on the background worker
+
+        Args:
+            urls: URLs whose hosts to warm, defaults to WARM_URLS
+        """
+        for url in urls or WARM_URLS:
+            bgworker.addJob(
+                argfuncFactory(self.preconnect, url, keep_warm=True),
+                ExecutionPriority.LOW_PRIORITY,
+                key=("preconnect", url),
+            )
+        # ytmusicapi talks to music.youtube.com through the async worker's session
+        asyncBgworker.addJob(
+            self._warm_async_session, priority=ExecutionPriority.LOW_PRIORITY
+        )
+
+    async def _warm_async_session(self) -> None:
+        if self.onlineStatus == OnlineStatus.OFFLINE:
+            return
+        try:
+            with requestTimings.label("prewarm"):
+                async with asyncBgworker.session.head(
+                    "https://music.youtube.com/",
+                    allow_redirects=False,
+                    timeout=aiohttp.ClientTimeout(total=self.warm_timeout),
+                ):
+                    pass
+        except Exception as e:
+            self.logger.debug(f"Pre-connect of async session failed - {str(e)}")
+
+    def keep_connections_warm(self) -> bool:
+        """Re-warm registered hosts that have been idle long enough for the
+        server to drop the pooled connection.
+
+        Only hosts that carried real traffic within `warm_for` are re-warmed.
+        Hosts that haven't are dropped, they're warmed again if registered again.
+        """
+        if self.onlineStatus == OnlineStatus.OFFLINE:
+            return True
+        now = time.monotonic()
+        for host, origin in list(self.warm_hosts.items()):
+            last_used = self.host_last_used.get(host)
+            last_warmed = self.host_last_warmed.get(host, 0)
+            if now - (last_used or last_warmed) >= self.warm_for:
+                del self.warm_hosts[host]
+                continue
+            if last_used is None:
+                continue  # warmed, but not used yet
+            if now - max(last_used, last_warmed) >= self.keepalive_interval:
+                self.preconnect(origin)
+        return True
+
+    def record_first_request(self, host: str, ttfb: float) -> None:
+        """Remember the TTFB of the first real request to a host, and whether the
+        host had been warmed up beforehand"""
+        if host in self.first_request_ttfb:
+            return
+        warmed = host in self.preconnected_hosts
+        self.first_request_ttfb[host] = (warmed, ttfb)
+        self.logger.debug(
+            "First request to %s (%s): TTFB %.0f ms",
+            host,
+            "warm" if warmed else "cold",
+            ttfb * 1000,
+        )
+
     def set_proxy(self, proxy_url: Optional[str] = None):
         """
         Set proxy for all requests
@@ -95,6 +1040,30 @@ class NetworkManager(QObject):
         """Set default timeout for requests in seconds"""
         self.timeout = timeout
 
+    def set_bandwidth_limit(self, traffic_class: TrafficClass, rate: float) -> None:
+        """Set the bandwidth limit for a traffic class in bytes per second (0 = unlimited)"""
+        self.bandwidth_limits[traffic_class] = rate
+        self._apply_bandwidth_limits()
+
+    def setPlaybackBuffering(self, buffering: bool) -> None:
+        """Throttle prefetch and background transfers while playback is stalled on the network"""
+        if buffering == self.playbackBuffering:
+            return
+        self.playbackBuffering = buffering
+        self.logger.debug(
+            f"Playback {'buffering, throttling' if buffering else 'recovered, unthrottling'} background transfers"
+        )
+        self._apply_bandwidth_limits()
+
+    def _apply_bandwidth_limits(self) -> None:
+        for tc, bucket in self.buckets.items():
+            rate = self.bandwidth_limits.get(tc, 0)
+            if self.playbackBuffering and tc in self.buffering_limits:
+                limit = self.buffering_limits[tc]
+                rate = min(rate, limit) if rate > 0 else limit
+            # Allow a quarter second of burst so small reads aren't penalised
+            bucket.set_rate(rate, burst=rate / 4 if rate > 0 else 0)
+
     def set_headers(self, headers: Dict[str, str]):
         """Set default headers for all requests"""
         self.default_headers.update(headers)
@@ -108,10 +1077,16 @@ class NetworkManager(QObject):
         timeout: Optional[int] = None,
         stream: bool = False,
         allow_redirects: bool = True,
+        coalesce: bool = True,
+        cache: bool = False,
     ) -> Union[requests.Response, None]:
         """
         Perform a GET request
 
+        Identical non-streaming GETs that are issued while one is already in flight
+        share its response instead of hitting the network again, and a finished
+        response is reused for `memo_ttl` seconds.
+
         Args:
             url: URL to request
             params: URL parameters
@@ -119,13 +1094,108 @@ class NetworkManager(QObject):
             timeout: Request timeout (overrides default)
             stream: Whether to stream the response
             allow_redirects: Whether to follow redirects
+            coalesce: Whether to share the response with identical concurrent requests
+            cache: Whether to go through the persistent HTTP cache. Meant for
+                public static content such as artwork, not API calls
 
         Returns:
             Response object
         """
         request_timeout = timeout if timeout is not None else self.timeout
+
+        if stream or not coalesce:
+            return self._get(
+                url, params, headers, request_timeout, stream, allow_redirects, cache
+            )
+
+        key = self._request_key(url, params, headers, allow_redirects)
+        with self._inflight_lock:
+            self.statistics.requests += 1
+            memo = self._response_memo.get(key)
+            if memo is not None and time.monotonic() - memo[0] < self.memo_ttl:
+                self.statistics.memo_hits += 1
+                return memo[1]
+
+            inflight = self._inflight.get(key)
+            leader = inflight is None
+            if leader:
+                inflight = _InFlightRequest()
+                self._inflight[key] = inflight
+            else:
+                self.statistics.coalesced += 1
+
+        if not leader:
+            self.logger.debug(f"GET {url} coalesced with in-flight request")
+            # The leader is bounded by its own timeout (and retries); if it somehow
+            # hangs past that, stop waiting and make our own request.
+            if inflight.done.wait(request_timeout * 4):
+                return inflight.response
+            return self._get(
+                url, params, headers, request_timeout, stream, allow_redirects, cache
+            )
+
+        response = None
+        try:
+            response = self._get(
+                url, params, headers, request_timeout, stream, allow_redirects, cache
+            )
+        finally:
+            with self._inflight_lock:
+                inflight.response = response
+                self._inflight.pop(key, None)
+                now = time.monotonic()
+                self._response_memo = {
+                    k: v
+                    for k, v in self._response_memo.items()
+                    if now - v[0] < self.memo_ttl
+                }
+                if response is not None:
+                    self._response_memo[key] = (now, response)
+            inflight.done.set()
+        return response
+
+    @staticmethod
+    def _request_key(
+        url: str,
+        params: Optional[Dict],
+        headers: Optional[Dict],
+        allow_redirects: bool,
+    ) -> tuple:
+        return (
+            url,
+            repr(sorted(params.items())) if params else "",
+            repr(sorted(headers.items())) if headers else "",
+            allow_redirects,
+        )
+
+    def _get(
+        self,
+        url: str,
+        params: Optional[Dict],
+        headers: Optional[Dict],
+        request_timeout: float,
+        stream: bool,
+        allow_redirects: bool,
+        cache: bool = False,
+    ) -> Union[requests.Response, None]:
         request_headers = {**self.default_headers, **(headers or {})}
 
+        # Only opted-in calls use the HTTP cache, and never for streams or
+        # caller-managed conditional requests
+        use_cache = cache and not stream and not any(
+            h in request_headers for h in ("Range", "If-None-Match", "If-Modified-Since")
+        )
+        cache_key = HttpCache.key(url, params)
+        entry = self.http_cache.lookup(cache_key) if use_cache else None
+        if entry is not None:
+            if HttpCache.is_fresh(entry):
+                cached = self.http_cache.build_response(cache_key, entry)
+                if cached is not None:
+                    with self._inflight_lock:
+                        self.statistics.cache_hits += 1
+                    return cached
+            request_headers.update(HttpCache.conditional_headers(entry))
+
         try:
             self.logger.debug(f"GET {url}")
             response = self.session.get(
@@ -136,14 +1206,51 @@ class NetworkManager(QObject):
                 stream=stream,
                 allow_redirects=allow_redirects,
             )
+            if response.status_code == 304 and entry is not None:
+                self.http_cache.refresh(cache_key, entry, response)
+                cached = self.http_cache.build_response(cache_key, entry)
+                if cached is not None:
+                    with self._inflight_lock:
+                        self.statistics.cache_revalidated += 1
+                    return cached
             response.raise_for_status()
+            if use_cache and self.http_cache.store(cache_key, response):
+                with self._inflight_lock:
+                    self.statistics.cache_stored += 1
             return response
         except Exception as e:
+            if (
+                entry is not None
+                and self._can_serve_stale(e)
+                and (stale := self.http_cache.build_response(cache_key, entry))
+            ):
+                self.logger.warning(f"GET request failed: {url}, serving stale copy")
+                with self._inflight_lock:
+                    self.statistics.cache_stale_served += 1
+                return stale
+            if isinstance(e, CircuitOpenError):
+                self.logger.debug(f"GET request skipped: {url} - {str(e)}")
+                return None
             self.logger.error(
                 f"GET request failed: {url} - {str(e)}", {"notifying": False}
             )  # some requests may occasionally fail, no need to tell the user
             return None
 
+    @staticmethod
+    def _can_serve_stale(error: Exception) -> bool:
+        """Whether a failed GET may be answered with a stale cached copy: only when
+        the host couldn't be reached or had a server error, never for a 4xx"""
+        if isinstance(error, requests.exceptions.HTTPError):
+            return error.response is not None and error.response.status_code >= 500
+        return isinstance(
+            error,
+            (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+                requests.exceptions.RetryError,
+            ),
+        )
+
     def post(
         self,
         url: str,
@@ -180,6 +1287,9 @@ class NetworkManager(QObject):
             response.raise_for_status()
             return response
         except Exception as e:
+            if isinstance(e, CircuitOpenError):
+                self.logger.debug(f"POST request skipped: {url} - {str(e)}")
+                return None  # type: ignore[return-value]
             self.logger.error(
                 f"POST request failed: {url} - {str(e)}", {"notifying": False}
             )  # same reasoning as above
@@ -191,6 +1301,7 @@ class NetworkManager(QObject):
         headers: Optional[Dict] = None,
         progress_callback=None,
         start: int = -1,
+        traffic_class: TrafficClass = TrafficClass.BACKGROUND,
     ) -> bool:
         """
         Download a file with optional progress tracking
@@ -200,41 +1311,56 @@ class NetworkManager(QObject):
             destination_path: Where to save the file
             headers: Additional headers
             progress_callback: Function to call with (current_size, total_size)
+            start: Byte offset to resume from. If the server ignores the range,
+                the file is rewritten from the beginning
+            traffic_class: Which bandwidth bucket the transfer draws from
 
         Returns:
             True if successful, False if failed
         """
         request_headers = {**self.default_headers, **(headers or {})}
-        if start >= 0:
+        bucket = self.buckets[traffic_class]
+        if start > 0:
             request_headers["Range"] = f"bytes={start}-"
         try:
-            with self.session.get(
-                url, headers=request_headers, stream=True
-            ) as response:
+            response = self.session.get(url, headers=request_headers, stream=True)
+            if response.status_code == 416:  # Requested range not satisfiable
+                response.close()
+                self.logger.warning(
+                    f"Range not satisfiable for {url}, starting from beginning"
+                )
+                start = 0
+                request_headers.pop("Range", None)
+                response = self.session.get(
+                    url, headers=request_headers, stream=True
+                )
+            with response:
                 response.raise_for_status()
-                if response.status_code == 416:  # Requested range not satisfiable
+                if start > 0 and response.status_code != 206:
+                    # The server ignored the range and is sending the whole file
                     self.logger.warning(
-                        f"Range not satisfiable for {url}, starting from beginning"
+                        f"Server ignored range for {url}, starting from beginning"
                     )
                     start = 0
-                    request_headers["Range"] = "bytes=0-"
-                    response = self.session.get(
-                        url, headers=request_headers, stream=True
-                    )
-                if response.status_code == 200 and start >= 0:
-                    file_obj.seek(0)  # Ensure we start writing at the beginning
 
-                file_obj.seek(start)  # Ensure we start writing at the correct position
+                if start >= 0:
+                    file_obj.seek(start)  # Write at the resume position...
+                    file_obj.truncate()  # ...and drop anything stale after it
 
-                total_size = int(response.headers.get("content-length", 0))
+                offset = max(start, 0)
+                remaining = int(response.headers.get("content-length", 0))
+                total_size = offset + remaining if remaining else 0
+                progress = ProgressAggregator(
+                    progress_callback, total_size, initial=offset
+                )
 
-                downloaded = 0
                 for chunk in response.iter_content(chunk_size=8192):
                     if chunk:  # filter out keep-alive chunks
+                        bucket.consume(len(chunk))
                         file_obj.write(chunk)
-                        downloaded += len(chunk)
-                        if progress_callback:
-                            progress_callback(downloaded, total_size)
+                        progress.add(0, len(chunk))
+                progress.finish()
+                downloaded = progress.current()
 
                 self.logger.debug(
                     f"Downloaded {url} to {file_obj.name} ({downloaded}/{total_size} bytes)"
@@ -253,6 +1379,8 @@ class NetworkManager(QObject):
         end: int,
         headers: Optional[Dict] = None,
         progress_callback=None,
+        traffic_class: TrafficClass = TrafficClass.BACKGROUND,
+        write_lock: Optional[threading.Lock] = None,
     ) -> int:
         """
         Download a specific byte range from a URL to a file object
@@ -263,13 +1391,18 @@ class NetworkManager(QObject):
             start: Start byte
             end: End byte
             headers: Additional headers
-            progress_callback: Function to call with progress updates
+            progress_callback: Function to call with the number of bytes in each
+                chunk written
+            traffic_class: Which bandwidth bucket the transfer draws from
+            write_lock: Lock shared by every chunk writing to the same file object
 
         Returns:
             Number of bytes downloaded
         """
         request_headers = {**self.default_headers, **(headers or {})}
         request_headers["Range"] = f"bytes={start}-{end}"
+        bucket = self.buckets[traffic_class]
+        write_lock = write_lock or threading.Lock()
 
         bytes_downloaded = 0
 
@@ -278,14 +1411,21 @@ class NetworkManager(QObject):
                 url, headers=request_headers, stream=True
             ) as response:
                 response.raise_for_status()
+                if response.status_code != 206:
+                    # A 200 is the whole file, which would be written at `start`
+                    raise ValueError(
+                        f"Server ignored range request (status {response.status_code})"
+                    )
 
                 for chunk in response.iter_content(chunk_size=8192):
                     if chunk:  # filter out keep-alive chunks
-                        file_obj.seek(start + bytes_downloaded)
-                        file_obj.write(chunk)
+                        bucket.consume(len(chunk))
+                        with write_lock:  # seek + write must not interleave
+                            file_obj.seek(start + bytes_downloaded)
+                            file_obj.write(chunk)
                         bytes_downloaded += len(chunk)
                         if progress_callback:
-                            progress_callback(start + bytes_downloaded)
+                            progress_callback(len(chunk))
 
             self.logger.debug(f"Downloaded chunk {start}-{end} from {url}")
             return bytes_downloaded
@@ -304,6 +1444,7 @@ class NetworkManager(QObject):
         max_workers: int = 4,
         headers: Optional[Dict] = None,
         progress_callback=None,
+        traffic_class: TrafficClass = TrafficClass.BACKGROUND,
     ) -> bool:
         """
         Download a file in parallel chunks
@@ -315,6 +1456,7 @@ class NetworkManager(QObject):
             max_workers: Maximum number of parallel downloads
             headers: Additional headers
             progress_callback: Function to call with (current_bytes, total_bytes)
+            traffic_class: Which bandwidth bucket the chunks draw from
 
         Returns:
             True if successful
@@ -328,9 +1470,14 @@ class NetworkManager(QObject):
                 url, headers=request_headers, timeout=self.timeout
             )
             head_response.raise_for_status()
-            total_size = (
-                int(head_response.headers.get("Content-Length", 0)) + downloaded_size
-            )
+            content_length = int(head_response.headers.get("Content-Length", 0))
+            content_range = head_response.headers.get("Content-Range", "")
+            if content_range.rpartition("/")[2].isdigit():  # bytes a-b/total
+                total_size = int(content_range.rpartition("/")[2])
+            elif head_response.status_code == 206:
+                total_size = content_length + downloaded_size
+            else:  # the range was ignored, so this is the whole file
+                total_size = content_length
 
             if total_size == 0:
                 self.logger.warning(f"Could not determine file size for {url}")
@@ -342,35 +1489,40 @@ class NetworkManager(QObject):
                 for i in range(downloaded_size, total_size, chunk_size)
             ]
 
-            progress = {i: 0 for i in range(len(ranges))}
-            total_progress = downloaded_size
-
-            def update_progress(chunk_index, bytes_position):
-                nonlocal total_progress
-                progress[chunk_index] = bytes_position
-                current_total = sum(progress.values())
-                if progress_callback:
-                    progress_callback(current_total, total_size)
+            progress = ProgressAggregator(
+                progress_callback, total_size, len(ranges), downloaded_size
+            )
 
             # Download chunks in parallel
+            write_lock = threading.Lock()
             with ThreadPoolExecutor(max_workers=max_workers) as executor:
                 futures = []
                 for i, (start, end) in enumerate(ranges):
                     futures.append(
                         executor.submit(
+                            # carry the request label over to the pool thread
+                            contextvars.copy_context().run,
                             self.download_chunk,
                             url,
                             file_obj,
                             start,
                             end,
                             request_headers,
-                            lambda pos, idx=i: update_progress(idx, pos),
+                            lambda amount, idx=i: progress.add(idx, amount),
+                            traffic_class,
+                            write_lock,
                         )
                     )
 
                 # Wait for all futures to complete
-                for future in futures:
-                    future.result()  # Will raise exceptions if any occurred
+                try:
+                    for future in futures:
+                        future.result()  # Will raise exceptions if any occurred
+                except Exception:
+                    for future in futures:
+                        future.cancel()  # don't start chunks we'll throw away
+                    raise
+            progress.finish()
 
             self.logger.info(f"Parallel download complete for {url}")
             return True
@@ -379,6 +1531,45 @@ class NetworkManager(QObject):
             self.logger.error(f"Parallel download failed: {url} - {str(e)}")
             return False
 
+    def getStatistics(self) -> dict:
+        """Get request coalescing, HTTP cache, circuit breaker and pre-warming statistics
+
+        Returns:
+            dict: The request counters, the state of every known host's circuit, and
+                the mean TTFB of the first request to warmed and cold hosts
+        """
+        with self._inflight_lock:
+            stats = asdict(self.statistics)
+        stats["retry_budget_denied"] = BudgetedRetry.budget.denied
+        with self._breakers_lock:
+            stats["circuits"] = {h: b.state.name for h, b in self.breakers.items()}
+        for kind, warmed in (("warm", True), ("cold", False)):
+            ttfbs = [t for w, t in self.first_request_ttfb.values() if w == warmed]
+            stats[f"first_request_ttfb_{kind}_ms"] = (
+                sum(ttfbs) / len(ttfbs) * 1000 if ttfbs else None
+            )
+        return stats
+
+    def getRequestTimings(self) -> dict:
+        """Get per-label histograms of request phase timings, covering both this
+        session and the async worker's aiohttp session
+
+        Returns:
+            dict: {label: {phase: histogram snapshot}}
+        """
+        return requestTimings.recorder.summary()
+
+    def dumpRequestTimings(self, path: Optional[str] = None) -> str:
+        """Write the request timing histograms and recent raw timings to a JSON file
+
+        Args:
+            path: Where to write, defaults to the data directory
+
+        Returns:
+            str: The path written to
+        """
+        return requestTimings.recorder.dump(path)
+
     def clear_cookies(self):
         """Clear session cookies"""
         self.session.cookies.clear()
@@ -391,17 +1582,9 @@ class NetworkManager(QObject):
             self.logger.debug("Session closed")
 
     def test_onlinemode(self) -> OnlineStatus:
-        connected = True if self.get("https://www.google.com", timeout=1) else False
-        youtube = True if self.get("https://music.youtube.com", timeout=1) else False
-
-        if connected and youtube:
-            r = OnlineStatus.ONLINE
-        elif connected and not youtube:
-            r = OnlineStatus.ONLINE_NO_YOUTUBE
-        else:
-            r = OnlineStatus.OFFLINE
-
-        if not OnlineStatus.ONLINE:
+        """Probe connectivity right away instead of waiting for traffic or the timed job"""
+        r = self.connectivity.probe()
+        if r != OnlineStatus.ONLINE:
             self.logger.error(
                 f"Offlinemode check resulted in {r.name}",
                 {
@@ -409,15 +1592,16 @@ class NetworkManager(QObject):
                     "customMsg": f"You are offline (offlineMode {r.name})",
                 },
             )
-        self.onlineStatus = r
         return r
 
-    @Property(int)
+    @Property(int, notify=onlineStatusChanged)
     def onlineStatus(self) -> OnlineStatus:
         return self._onlineStatus
 
     @onlineStatus.setter
     def onlineStatus(self, value: OnlineStatus) -> None:
+        if value == self._onlineStatus:
+            return
         self._onlineStatus = value
         self.onlineStatusChanged.emit(self._onlineStatus)
 
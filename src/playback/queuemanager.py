@@ -22,6 +22,7 @@ from misc.enumerations import DataStatus
 from src import universal as universal
 from src.misc.enumerations.Queue import LoopType
 from src.misc.settings import getSetting
+from src.misc import requestTimings
 import src.discotube.presence as presence
 import src.wintube.winSMTC as winSMTC
 
@@ -197,6 +198,14 @@ class Queue(QObject):
             winSMTC.HandlerType.PREVIOUS, lambda x, y: self.prevSongSignal.emit()
         )
 
+        # Seconds before the end of a track to fetch the next one's playback info
+        # and pre-connect to its stream host
+        self.prepareNextAhead = 30
+        self._preparedNext: str | None = None
+        # Deadline for the jobs started by switching songs (info, playback
+        # extraction, theming), see songAction
+        self.songActionTimeout = 60
+
         # Presence and state
         self.purgetries = {}
         self.presence = presence.initialize_discord_presence(self)
@@ -345,9 +354,51 @@ class Queue(QObject):
         )
         self.timeChanged.emit(seconds)
 
+        remaining = self.currentSongDuration - seconds  # type: ignore[operator]
+        if 0 < remaining <= self.prepareNextAhead:
+            self.prepareNextSong()
+
+    def nextIndex(self) -> int | None:
+        """Index of the song that plays after the current one finishes, if any"""
+        if self.loop == LoopType.SINGLE:
+            return self.pointer
+        if self.pointer < len(self.queue) - 1:
+            return self.pointer + 1
+        if self.loop == LoopType.ALL and self.queue:
+            return 0
+        return None
+
+    def prepareNextSong(self):
+        """Fetch the next song's playback info and warm a connection to its stream
+        host, so the track change doesn't pay for either"""
+        index = self.nextIndex()
+        if index is None or index == self.pointer:
+            return
+        song = self.queue[index]
+        if self._preparedNext == song.id:
+            return
+        self._preparedNext = song.id
+
+        def _prepare():
+            if song.playbackInfo is None:
+                song.get_playback()
+            url = song.get_best_playback_mrl()
+            if url and url.startswith("http"):
+                # Its own low priority job, so a slow host doesn't hold this one up
+                universal.bgworker.addJob(
+                    lambda: universal.networkManager.preconnect(url),
+                    universal.ExecutionPriority.LOW_PRIORITY,
+                )
+
+        universal.bgworker.addJob(_prepare)
+
     def _on_playing_status_changed(self, status: int):
         # Re-emit for QML bindings
         self.playingStatusChanged.emit(status)
+        # Keep background downloads from starving the stream while it's stalled
+        universal.networkManager.setPlaybackBuffering(
+            status == PlayingStatus.BUFFERING_NETWORK
+        )
         # Sync SMTC basic state
         if status == PlayingStatus.PLAYING:
             winSMTC.playback_play()
@@ -484,7 +535,8 @@ class Queue(QObject):
         return time.time() + self.currentSongDuration - self.currentSongTime  # type: ignore[operator]
 
     def checkError(self, url: str):
-        r = universal.networkManager.get(url)
+        with requestTimings.label("playback"):
+            r = universal.networkManager.get(url)
         return r is None or getattr(r, "status_code", None) != 200
 
     @Slot(result=dict)
@@ -523,10 +575,16 @@ class Queue(QObject):
     def resume(self):
         self._player.resume()
 
+    def songAction(self) -> universal.TaskGroup:
+        """Task group for the jobs of switching to a song. Starting a new one
+        cancels whatever the previous switch still had queued or running."""
+        return universal.TaskGroup.supersede("song", timeout=self.songActionTimeout)
+
     @Slot()
     def play(self):
         if not len(self.queue) == 0:
-            self._player.play(self.queue[self.pointer])
+            with self.songAction():
+                self._player.play(self.queue[self.pointer])
         else:
             self.logger.warning("Play called with empty queue")
 
@@ -665,15 +723,16 @@ class Queue(QObject):
             s.songInfoFetched.connect(on_info_fetched)
 
             # Submit async task without blocking
-            coro = s.get_info()
-            if hasattr(universal.asyncBgworker, "run_coroutine_threadsafe"):
-                universal.asyncBgworker.run_coroutine_threadsafe(coro)
-            else:
-                import asyncio
-
-                asyncio.run_coroutine_threadsafe(
-                    coro, universal.asyncBgworker.event_loop
-                )
+            universal.asyncBgworker.submit(
+                s.get_info(),
+                priority=(
+                    universal.ExecutionPriority.HIGH_PRIORITY
+                    if goto
+                    else universal.ExecutionPriority.MEDIUM_PRIORITY
+                ),
+                category=universal.JobCategory.METADATA,
+                key=("get_info", s.id),
+            )
 
         if goto:
             self.pointer = insert_index
@@ -118,13 +118,19 @@ os.environ["PATH"] = (
 from .workers import (
     bgworker,
     asyncBgworker,
+    processPool,
+    TaskGroup,
     TimedJobSettings,
+    ExecutionPriority,
+    JobCategory,
     argfuncFactory,
     asyncargfuncFactory,
 )
 
 bgworker.start()
 asyncBgworker.start()
+# processPool starts with the first task submitted to it, spawning its workers
+# isn't worth paying for on every launch
 
 from .misc import settings as settings_module
 
@@ -145,7 +151,9 @@ from src.innertube import album as album_module
 from playback import queuemanager as queue_module
 
 
-from src.network import NetworkManager, networkManager, OnlineStatus
+from src.network import NetworkManager, networkManager, OnlineStatus, TrafficClass
+
+networkManager.warm_connections()
 
 from PySide6.QtCore import QThread, QMetaObject, Qt, Q_ARG, QResource
 
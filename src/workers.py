@@ -7,8 +7,18 @@ import enum
 import time
 import logging
 import queue
+import threading
+import collections
+import contextlib
+import contextvars
+import weakref
+import concurrent.futures
+import concurrent.futures.process
+import multiprocessing
+import heapq
+import random
 import aiohttp
-from dataclasses import dataclass
+from dataclasses import dataclass, field, asdict
 import os
 
 from PySide6.QtCore import (
@@ -23,6 +33,9 @@ import ytmusicapi
 
 from src.misc.compiled import __compiled__
 import src.misc.cleanup as cleanup
+from src.misc import requestTimings
+from src.misc import processTasks
+from src.misc.metrics import Histogram
 from src.paths import Paths
 
 
@@ -61,39 +74,495 @@ def asyncargfuncFactory(func: typing.Callable, *args, **kwargs) -> typing.Callab
     return wrapper
 
 
+def run_sync(func: typing.Callable, *args, **kwargs) -> typing.Any:
+    """Call func and return its result, for sync code that has to call
+    something that might be a coroutine function.
+
+    Coroutines run on the AsyncBackgroundWorker's loop (where the aiohttp
+    session and ytmusicapi live) and the calling thread waits for them. If
+    that loop isn't running (early startup, shutdown, tests), a throwaway
+    loop is used instead.
+
+    Args:
+        func: The callable, sync or async
+        *args: Positional arguments to pass to func
+        **kwargs: Keyword arguments to pass to func
+
+    Raises:
+        RuntimeError: If called from the loop's own thread, where waiting on
+            the loop would deadlock. Await the coroutine there instead.
+    """
+    result = func(*args, **kwargs)
+    if not asyncio.iscoroutine(result):
+        return result
+    if not asyncBgworker.isRunning():
+        return asyncio.run(result)
+    if asyncBgworker.event_loop is not None and asyncBgworker.isLoopThread():
+        result.close()
+        raise RuntimeError(
+            "run_sync can't wait on the AsyncBackgroundWorker loop from its own thread"
+        )
+    return asyncBgworker.run_coroutine_threadsafe(result).result()
+
+
 class ExecutionPriority(enum.IntEnum):
     LOW_PRIORITY = 0
     MEDIUM_PRIORITY = 1
     HIGH_PRIORITY = 2
 
 
+class JobCategory(enum.IntEnum):
+    """Job Category. Used to give each kind of async job its own concurrency limit.
+
+    GENERAL: Anything that doesn't fit the other categories \n
+    METADATA: Song, album and search info fetches \n
+    PLAYBACK: Stream URL extraction \n
+    LYRICS: Lyrics fetches \n
+    THUMBNAIL: Thumbnail and artwork fetches \n
+    DOWNLOAD: Song and album downloads \n
+
+    """
+
+    GENERAL = 0
+    METADATA = 1
+    PLAYBACK = 2
+    LYRICS = 3
+    THUMBNAIL = 4
+    DOWNLOAD = 5
+
+
+class JobHandle(concurrent.futures.Future):
+    """Future for a job queued on bgworker or asyncBgworker.
+
+    `result()`, `exception()`, `cancel()` and `add_done_callback()` work as on
+    any concurrent.futures.Future. `cancel()` only succeeds while the job
+    hasn't started. Done callbacks run on whichever thread finishes the job.
+
+    Attributes:
+        name: Name of the job's function, for logging
+        key: Dedup key the job was queued with, if any
+        enqueued: time.perf_counter() when the job was queued
+        started: time.perf_counter() when the job started, None until then
+    """
+
+    def __init__(self, name: str, key: typing.Optional[typing.Hashable] = None):
+        super().__init__()
+        self.name = name
+        self.key = key
+        self.enqueued = time.perf_counter()
+        self.started: typing.Optional[float] = None
+
+    def set_running_or_notify_cancel(self) -> bool:
+        running = super().set_running_or_notify_cancel()
+        if running:
+            self.started = time.perf_counter()
+        return running
+
+
+# The TaskGroup jobs queued from the current context join
+currentGroup: contextvars.ContextVar[typing.Optional["TaskGroup"]] = (
+    contextvars.ContextVar("currentGroup", default=None)
+)
+
+
+class TaskGroup:
+    """Cancellation scope and deadline shared by the jobs of one user action.
+
+    Jobs queued on bgworker or asyncBgworker while a group is current (inside
+    `with group:`, or inside a job that joined one) join it, and run with the
+    context they were queued from, so the jobs they queue join it too.
+    Cancelling a group cancels its pending jobs, its running coroutine jobs
+    and its child groups. Jobs on pool threads can't be interrupted once
+    they've started, long ones can call TaskGroup.checkCancelled() between
+    steps. Jobs that haven't started by the deadline are cancelled, coroutine
+    jobs are timed out at it.
+
+    Use `TaskGroup.supersede(name)` for actions where only the latest one
+    matters (playing a song, theming from its thumbnail).
+
+    Attributes:
+        name: For logging and superseding
+        parent: The group that was current when this one was created
+        deadline: time.monotonic() by which the group's jobs should be done, None
+            for no deadline of its own
+    """
+
+    _named: typing.Dict[str, "TaskGroup"] = {}
+    _namedLock = threading.Lock()
+
+    def __init__(
+        self,
+        name: str = "",
+        timeout: typing.Optional[float] = None,
+        parent: typing.Optional["TaskGroup"] = None,
+    ):
+        self.name = name
+        self.parent = parent if parent is not None else currentGroup.get()
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        self._cancelled = False
+        self._lock = threading.Lock()
+        self._handles: typing.Set[JobHandle] = set()
+        # Running jobs that can be interrupted, and how
+        self._interrupts: typing.Dict[JobHandle, typing.Callable[[], None]] = {}
+        self._children: "weakref.WeakSet[TaskGroup]" = weakref.WeakSet()
+        self._local = threading.local()  # `with` can be entered on several threads
+        if self.parent is not None:
+            self.parent._addChild(self)
+
+    @classmethod
+    def supersede(
+        cls, name: str, timeout: typing.Optional[float] = None
+    ) -> "TaskGroup":
+        """Cancel the last group created under `name` and start a new one.
+
+        Called again while that group is current (e.g. play() inside
+        songPress), the current group is returned rather than cancelled.
+
+        Args:
+            name: What the action is, e.g. "song"
+            timeout: Seconds from now until the new group's deadline
+
+        Returns:
+            TaskGroup: The group to run the action in, with `with`
+        """
+        group = currentGroup.get()
+        while group is not None:
+            if group.name == name and not group.cancelled:
+                return group
+            group = group.parent
+        new = cls(name, timeout)
+        with cls._namedLock:
+            old, cls._named[name] = cls._named.get(name), new
+        if old is not None:
+            old.cancel()
+        return new
+
+    @staticmethod
+    @contextlib.contextmanager
+    def shield():
+        """Jobs queued inside the block don't join the current group (shared
+        work like cache checks that other callers rely on)"""
+        token = currentGroup.set(None)
+        try:
+            yield
+        finally:
+            currentGroup.reset(token)
+
+    @staticmethod
+    def checkCancelled() -> None:
+        """Raise CancelledError if the current group was cancelled or is past
+        its deadline. For jobs on pool threads to call between steps."""
+        group = currentGroup.get()
+        if group is not None and (group.cancelled or group.expired):
+            raise concurrent.futures.CancelledError(f"Task group {group.name} ended")
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled or (self.parent is not None and self.parent.cancelled)
+
+    def remaining(self) -> typing.Optional[float]:
+        """Seconds until the nearest deadline of this group and its parents,
+        None if none of them have one"""
+        deadlines = []
+        group: typing.Optional[TaskGroup] = self
+        while group is not None:
+            if group.deadline is not None:
+                deadlines.append(group.deadline)
+            group = group.parent
+        return min(deadlines) - time.monotonic() if deadlines else None
+
+    @property
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def adopt(self, handle: JobHandle) -> None:
+        """Add a queued job. It's cancelled right away if the group already ended."""
+        with self._lock:
+            adopted = not self.cancelled
+            if adopted:
+                self._handles.add(handle)
+        if adopted:
+            handle.add_done_callback(self._discard)
+        else:
+            handle.cancel()
+
+    def interruptWith(self, handle: JobHandle, interrupt: typing.Callable) -> None:
+        """Register how to stop one of the group's jobs that's running"""
+        with self._lock:
+            if not self.cancelled:
+                if not handle.done():
+                    self._interrupts[handle] = interrupt
+                return
+        interrupt()
+
+    def cancel(self) -> None:
+        """Cancel the group's pending jobs, interrupt its running coroutine
+        jobs, and cancel its child groups. Jobs it queues later are cancelled
+        as they're queued."""
+        with self._lock:
+            if self._cancelled:
+                return
+            self._cancelled = True
+            handles, self._handles = self._handles, set()
+            interrupts, self._interrupts = self._interrupts, {}
+            children = list(self._children)
+        cancelled = sum(handle.cancel() for handle in handles)
+        for interrupt in interrupts.values():
+            interrupt()
+        for child in children:
+            child.cancel()
+        if cancelled or interrupts:
+            globalLogger.debug(
+                f"Task group {self.name} cancelled: {cancelled} pending, "
+                f"{len(interrupts)} running jobs stopped"
+            )
+
+    def _addChild(self, child: "TaskGroup") -> None:
+        with self._lock:
+            self._children.add(child)
+        if self.cancelled:
+            child.cancel()
+
+    def _discard(self, handle: concurrent.futures.Future) -> None:
+        with self._lock:
+            self._handles.discard(handle)  # type: ignore[arg-type]
+            self._interrupts.pop(handle, None)  # type: ignore[call-overload]
+
+    def __enter__(self) -> "TaskGroup":
+        tokens = self._local.__dict__.setdefault("tokens", [])
+        tokens.append(currentGroup.set(self))
+        return self
+
+    def __exit__(self, *exc) -> None:
+        currentGroup.reset(self._local.tokens.pop())
+
+    def __repr__(self) -> str:
+        return f"TaskGroup({self.name!r}, cancelled={self.cancelled})"
+
+
+@dataclass
+class JobStatistics:
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    cancelled: int = 0
+    coalesced: int = 0
+
+
+def wasCancelled(handle: concurrent.futures.Future) -> bool:
+    """Whether a job was cancelled before it started or interrupted while running"""
+    return handle.cancelled() or isinstance(
+        handle.exception(), concurrent.futures.CancelledError
+    )
+
+
+class JobMetrics:
+    """Wait and run time histograms, in milliseconds, and outcome counts for
+    the jobs of one name.
+
+    Wait is from being queued to starting, which includes time spent behind
+    higher priority jobs, category limits and locked function queues. Run is
+    from starting to finishing.
+    """
+
+    def __init__(self):
+        self.wait = Histogram()
+        self.run = Histogram()
+        self.outcomes: collections.Counter[str] = collections.Counter()
+
+    def record(self, handle: JobHandle, finished: float) -> None:
+        if wasCancelled(handle):
+            outcome = "cancelled"
+        elif isinstance(error := handle.exception(), asyncio.TimeoutError):
+            outcome = "timedOut"
+        else:
+            outcome = "completed" if error is None else "failed"
+        self.outcomes[outcome] += 1
+        if handle.started is not None:
+            self.wait.observe((handle.started - handle.enqueued) * 1000)
+            self.run.observe((finished - handle.started) * 1000)
+
+    def snapshot(self) -> dict:
+        return {
+            **self.outcomes,
+            "wait": self.wait.snapshot(),
+            "run": self.run.snapshot(),
+        }
+
+
+class JobTracker:
+    """Dedup keys, counters and per-name metrics for the jobs of one worker.
+
+    A job queued with a key while another job with the same key is pending or
+    running isn't queued again, the caller gets the existing handle instead.
+    """
+
+    def __init__(self):
+        self._mutex = QMutex()
+        self.keys: typing.Dict[typing.Hashable, JobHandle] = {}
+        self.live: typing.Set[JobHandle] = set()
+        self.jobs: typing.Dict[str, JobMetrics] = {}
+        self.statistics = JobStatistics()
+
+    def track(self, handle: JobHandle) -> JobHandle:
+        """Start tracking a new job's handle.
+
+        Returns:
+            JobHandle: `handle`, or the unfinished handle already queued with the
+            same key, in which case the new job shouldn't be queued
+        """
+        with QMutexLocker(self._mutex):
+            if handle.key is not None:
+                existing = self.keys.get(handle.key)
+                if existing is not None and not existing.done():
+                    self.statistics.coalesced += 1
+                    return existing
+                self.keys[handle.key] = handle
+            self.statistics.submitted += 1
+            handle.enqueued = time.perf_counter()
+            self.live.add(handle)
+        handle.add_done_callback(self._onDone)
+        return handle
+
+    def _onDone(self, handle: JobHandle) -> None:  # type: ignore[override]
+        finished = time.perf_counter()
+        with QMutexLocker(self._mutex):
+            self.live.discard(handle)
+            key = getattr(handle, "key", None)
+            if key is not None and self.keys.get(key) is handle:
+                del self.keys[key]
+            if wasCancelled(handle):
+                self.statistics.cancelled += 1
+            elif handle.exception() is not None:
+                self.statistics.failed += 1
+            else:
+                self.statistics.completed += 1
+            metrics = self.jobs.get(handle.name)
+            if metrics is None:
+                metrics = self.jobs[handle.name] = JobMetrics()
+            metrics.record(handle, finished)
+
+    def metrics(self) -> dict:
+        """Snapshot of the tracked jobs
+
+        Returns:
+            dict: "pending" and "running" gauges, in total and per job name,
+            and "jobs": {name: {outcome counts, "wait": snapshot, "run":
+            snapshot}} for the jobs that finished
+        """
+        with QMutexLocker(self._mutex):
+            live = [(h.name, h.started is not None) for h in self.live]
+            jobs = {name: metrics.snapshot() for name, metrics in self.jobs.items()}
+        gauges: typing.Dict[str, typing.Dict[str, int]] = {}
+        for name, started in live:
+            counts = gauges.setdefault(name, {"pending": 0, "running": 0})
+            counts["running" if started else "pending"] += 1
+        return {
+            "pending": sum(not started for _, started in live),
+            "running": sum(started for _, started in live),
+            "live": gauges,
+            "jobs": jobs,
+        }
+
+    def resetMetrics(self) -> None:
+        with QMutexLocker(self._mutex):
+            self.jobs.clear()
+
+
+async def runInContext(
+    context: typing.Optional[contextvars.Context], func: typing.Callable
+) -> typing.Any:
+    """Await func() with the context variables of `context`, which was copied
+    on another thread, set in the current task"""
+    if context is not None:
+        for var, value in context.items():
+            var.set(value)
+    return await func()
+
+
 class JobRunnable(QRunnable):
     """A QRunnable wrapper for executing functions in a thread pool.
 
     Supports both synchronous and asynchronous callables. Optionally tracks
-    a root function reference for lock management.
+    a root function reference for lock management. The outcome is reported
+    through `handle`.
     """
 
     def __init__(
         self,
         func: typing.Callable,
         rootfunc: typing.Union[typing.Callable, None] = None,
+        key: typing.Optional[typing.Hashable] = None,
     ):
         super().__init__()
         self.func = func
         self.rootfunc = rootfunc if rootfunc else func
+        self.handle = JobHandle(getattr(self.rootfunc, "__name__", repr(func)), key)
+        # Context the job was queued from, it runs in a copy of it
+        self.context: typing.Optional[contextvars.Context] = None
 
         self.completedCallback: typing.Union[typing.Callable, None] = None
 
+    @property
+    def isCoroutine(self) -> bool:
+        return inspect.iscoroutinefunction(self.func)
+
+    @property
+    def group(self) -> typing.Optional[TaskGroup]:
+        return self.context.get(currentGroup) if self.context is not None else None
+
+    def _cancelIfExpired(self) -> None:
+        group = self.group
+        if group is not None and group.expired:
+            self.handle.cancel()
+
     def run(self):
-        try:
-            if inspect.iscoroutinefunction(self.func):
-                asyncio.run(self.func())
+        self._cancelIfExpired()
+        if self.handle.set_running_or_notify_cancel():
+            try:
+                if self.context is not None:
+                    result = self.context.run(run_sync, self.func)
+                else:
+                    result = run_sync(self.func)
+            except concurrent.futures.CancelledError as e:
+                # TaskGroup.checkCancelled(), the job's group ended
+                globalLogger.debug(f"Job {self.handle.name} stopped early: {e}")
+                self.handle.set_exception(e)
+            except Exception as e:
+                globalLogger.error(f"Error occurred while executing job: {e}")
+                traceback.print_exc()
+                self.handle.set_exception(e)
             else:
-                self.func()
-        except Exception as e:
+                self.handle.set_result(result)
+        if self.completedCallback:
+            self.completedCallback()
+
+    def runOnLoop(self, worker: "AsyncBackgroundWorker") -> None:
+        """Run a coroutine job on `worker`'s event loop instead of a pool thread.
+
+        Returns right away, the handle and completedCallback are resolved from
+        the loop thread when the coroutine finishes.
+        """
+        self._cancelIfExpired()
+        if not self.handle.set_running_or_notify_cancel():
+            if self.completedCallback:
+                self.completedCallback()
+            return
+        future = worker.run_coroutine_threadsafe(runInContext(self.context, self.func))
+        if (group := self.group) is not None:
+            group.interruptWith(self.handle, future.cancel)
+        future.add_done_callback(self._loopJobDone)
+
+    def _loopJobDone(self, future: concurrent.futures.Future) -> None:
+        if future.cancelled():
+            self.handle.set_exception(concurrent.futures.CancelledError())
+        elif (e := future.exception()) is not None:
             globalLogger.error(f"Error occurred while executing job: {e}")
-            traceback.print_exc()
+            traceback.print_exception(e)
+            self.handle.set_exception(e)
+        else:
+            self.handle.set_result(future.result())
         if self.completedCallback:
             self.completedCallback()
 
@@ -108,6 +577,8 @@ class TimedJobSettings:
         max_interval: Maximum interval in seconds (for dynamic mode)
         growth_factor: Multiplier for interval growth on failure (dynamic mode)
         interval: Fixed interval in seconds (overrides dynamic if set)
+        jitter: Randomly stretch or shrink each interval by up to this fraction
+            (e.g. 0.1 for +-10%) so jobs registered together don't stay in lockstep
     """
 
     dynamic: bool
@@ -117,6 +588,61 @@ class TimedJobSettings:
     growth_factor: float
 
     interval: typing.Optional[int] = None
+    jitter: float = 0.0
+
+
+class TimedJob:
+    """Handle for a job registered with TimedJobManager.addTimedJob.
+
+    Attributes:
+        func: The registered callable
+        settings: Timing and behavior configuration
+        dynamicInterval: Current interval in dynamic mode
+        deadline: time.monotonic() at which the job is next due, None while
+            it's waiting to run or running
+        lastRan: time.monotonic() of the last start, None if it never ran
+        cancelled: True once the job has been removed
+    """
+
+    def __init__(
+        self,
+        manager: "TimedJobManager",
+        func: typing.Callable,
+        settings: TimedJobSettings,
+    ):
+        self.manager = manager
+        self.func = func
+        self.settings = settings
+        self.dynamicInterval: float = 0
+        self.deadline: typing.Optional[float] = None
+        self.lastRan: typing.Optional[float] = None
+        self.cancelled = False
+        # Bumped on every reschedule, heap entries with an older generation are stale
+        self.generation = 0
+
+    @property
+    def interval(self) -> float:
+        return (
+            self.settings.interval
+            or self.dynamicInterval
+            or self.settings.base_interval
+        )
+
+    def jittered(self, delay: float) -> float:
+        jitter = self.settings.jitter
+        return delay * (1 + random.uniform(-jitter, jitter)) if jitter else delay
+
+    def cancel(self) -> None:
+        """Unregister the job. A run already in progress isn't interrupted."""
+        self.manager.removeTimedJob(self)
+
+    def reschedule(self, delay: typing.Optional[float] = None) -> None:
+        """Move the next run to `delay` seconds from now.
+
+        Args:
+            delay: Seconds from now, defaults to the job's (jittered) interval
+        """
+        self.manager._schedule(self, delay)
 
 
 class TimedJobManager(QObject):
@@ -124,36 +650,100 @@ class TimedJobManager(QObject):
 
     Tracks jobs that should run at regular intervals. In dynamic mode,
     intervals adjust based on whether jobs return True (success) or False (failure).
+
+    Deadlines are kept in a min-heap, so finding due jobs and rescheduling
+    are O(log n) and nothing is scanned between deadlines. Cancelled or
+    rescheduled jobs leave stale heap entries behind that are skipped when
+    they reach the top.
     """
 
-    def __init__(self, parent=None):
+    def __init__(
+        self,
+        parent=None,
+        onScheduleChanged: typing.Optional[typing.Callable[[], None]] = None,
+    ):
         super().__init__(parent)
-        self.timed_jobs: typing.List[
-            typing.Tuple[typing.Callable, TimedJobSettings, int, int]
-        ] = []  # (func, settings, dynamicInterval, last_run_timestamp)
+        self.jobs: typing.Dict[typing.Callable, TimedJob] = {}
+        # (deadline, generation, sequence, job), sequence breaks ties
+        self._heap: typing.List[typing.Tuple[float, int, int, TimedJob]] = []
+        self._sequence = 0
+        self._mutex = QMutex()
+
+        # Called whenever the earliest deadline moves forward, so a dispatcher
+        # sleeping until the previous one can wake up and look again
+        self.onScheduleChanged = onScheduleChanged
 
         self.logger = logging.getLogger("TimedJobManager")
 
-    def addTimedJob(self, func: typing.Callable, settings: TimedJobSettings) -> None:
-        """Register a function to be executed periodically.
+    def _dropStale(self) -> None:
+        """Pop stale entries off the top of the heap. Call with the mutex held."""
+        while self._heap:
+            _, generation, _, job = self._heap[0]
+            if not job.cancelled and generation == job.generation:
+                return
+            heapq.heappop(self._heap)
+
+    def _schedule(self, job: TimedJob, delay: typing.Optional[float] = None) -> None:
+        if delay is None:
+            delay = job.jittered(job.interval)
+        with QMutexLocker(self._mutex):
+            if job.cancelled:
+                return
+            self._dropStale()
+            earliest = self._heap[0][0] if self._heap else None
+            job.generation += 1
+            job.deadline = time.monotonic() + max(0.0, delay)
+            self._sequence += 1
+            heapq.heappush(
+                self._heap, (job.deadline, job.generation, self._sequence, job)
+            )
+        if earliest is None or job.deadline < earliest:
+            if self.onScheduleChanged:
+                self.onScheduleChanged()
+
+    def _get(
+        self, func: typing.Union[typing.Callable, TimedJob]
+    ) -> typing.Optional[TimedJob]:
+        if isinstance(func, TimedJob):
+            return func
+        return self.jobs.get(func)
+
+    def addTimedJob(
+        self, func: typing.Callable, settings: TimedJobSettings
+    ) -> TimedJob:
+        """Register a function to be executed periodically. It first runs right away.
 
         Args:
             func: Callable to execute. If dynamic, should return bool indicating success
             settings: Timing and behavior configuration
-        """
-        self.timed_jobs.append(
-            (func, settings, 0, 0)
-        )  # 0 is the initial last run timestamp
 
-    def removeTimedJob(self, func: typing.Callable) -> None:
+        Returns:
+            TimedJob: Handle to cancel or reschedule the job. If func is already
+            registered, its existing handle is returned and settings are ignored.
+        """
+        with QMutexLocker(self._mutex):
+            existing = self.jobs.get(func)
+            if existing is not None:
+                return existing
+            job = TimedJob(self, func, settings)
+            self.jobs[func] = job
+        self._schedule(job, 0)
+        return job
+
+    def removeTimedJob(self, func: typing.Union[typing.Callable, TimedJob]) -> None:
         """Unregister a timed job.
 
         Args:
-            func: The callable previously registered with addTimedJob
+            func: The callable previously registered with addTimedJob, or its handle
         """
-        self.timed_jobs = [
-            (f, s, di, lr) for (f, s, di, lr) in self.timed_jobs if f != func
-        ]
+        with QMutexLocker(self._mutex):
+            job = self._get(func)
+            if job is None:
+                return
+            job.cancelled = True
+            job.deadline = None
+            if self.jobs.get(job.func) is job:
+                del self.jobs[job.func]
 
     def checkInTimedJobs(self, func: typing.Callable) -> bool:
         """Check if a callable is registered as a timed job.
@@ -164,112 +754,142 @@ class TimedJobManager(QObject):
         Returns:
             True if the callable is registered, False otherwise
         """
-        for f, s, di, lr in self.timed_jobs:
-            if f == func:
-                return True
-        return False
+        return func in self.jobs
 
-    def tick(self) -> typing.List[JobRunnable]:
-        """Check and prepare jobs that are due to run.
+    def secondsUntilNextDue(self) -> typing.Optional[float]:
+        """Time until the earliest timed job is due.
 
         Returns:
-            List of JobRunnables ready for execution
+            Seconds until the next job is due (0 if one is overdue), or None if
+            no job is scheduled
         """
-        current_time = int(time.time())
-        jobs_to_run: typing.List[JobRunnable] = []
-        for i, (func, settings, dynamicInterval, last_run) in enumerate(
-            self.timed_jobs
-        ):
-            if current_time - last_run >= (
-                settings.interval if settings.interval else dynamicInterval
-            ):
-                self.timed_jobs[i] = (
-                    func,
-                    settings,
-                    dynamicInterval,
-                    current_time + 3500000,
-                )  # temporarily block re-running by setting last_run far in future
-
-                if settings.dynamic:
-
-                    def wrapper(captured_func=func):
-                        success = False
-                        # We're also going to update the last run time here because this is when it's actually run
-                        self.updateLastRan(captured_func)
-                        try:
-                            if inspect.iscoroutinefunction(captured_func):
-                                success = asyncio.run(captured_func())
-                            else:
-                                success = captured_func()
-
-                            if not isinstance(success, bool):
-                                success = False  # Default to False if not boolean
-                        except Exception as e:
-                            globalLogger.error(f"Error in timed job: {e}")
-                            traceback.print_exc()
-                        self.dynamic_result(captured_func, success)
-
-                    runnable = JobRunnable(wrapper, rootfunc=func)
-                    jobs_to_run.append(runnable)
+        with QMutexLocker(self._mutex):
+            self._dropStale()
+            if not self._heap:
+                return None
+            return max(0.0, self._heap[0][0] - time.monotonic())
 
-                else:
+    def tick(self) -> typing.List[JobRunnable]:
+        """Take the jobs that are due to run.
 
-                    def default_wrapper(captured_func=func):
-                        # We're also going to update the last run time here because this is when it's actually run
-                        self.updateLastRan(captured_func)
-                        try:
-                            if inspect.iscoroutinefunction(captured_func):
-                                asyncio.run(captured_func())
-                            else:
-                                captured_func()
-                        except Exception as e:
-                            globalLogger.error(f"Error in timed job: {e}")
-                            traceback.print_exc()
-
-                    runnable = JobRunnable(func)
-                    jobs_to_run.append(runnable)
+        A taken job isn't scheduled again until it starts running, so it can't
+        be queued twice while it waits for a thread.
 
+        Returns:
+            List of JobRunnables ready for execution
+        """
+        now = time.monotonic()
+        due: typing.List[TimedJob] = []
+        with QMutexLocker(self._mutex):
+            self._dropStale()
+            while self._heap and self._heap[0][0] <= now:
+                _, _, _, job = heapq.heappop(self._heap)
+                job.deadline = None
+                due.append(job)
+                self._dropStale()
+
+        jobs_to_run = [
+            JobRunnable(lambda job=job: self._runTimedJob(job), rootfunc=job.func)
+            for job in due
+        ]
         self.logger.debug(
             f"Timed jobs to run: {[job.rootfunc.__name__ for job in jobs_to_run]}"
         )
         return jobs_to_run
 
-    def updateLastRan(self, func: typing.Callable) -> None:
-        """Update the last run timestamp for a timed job.
+    def _runTimedJob(self, job: TimedJob) -> None:
+        # The next run is scheduled from when this one actually starts
+        self.updateLastRan(job)
+        success = False
+        try:
+            success = run_sync(job.func)
+        except Exception as e:
+            globalLogger.error(f"Error in timed job: {e}")
+            traceback.print_exc()
+        if job.settings.dynamic:
+            # Default to False if not boolean
+            self.dynamic_result(job, success if isinstance(success, bool) else False)
+
+    def updateLastRan(self, func: typing.Union[typing.Callable, TimedJob]) -> None:
+        """Mark a timed job as started now and schedule its next run.
 
         Args:
-            func: The callable whose last run time to update
+            func: The callable whose last run time to update, or its handle
         """
-        current_time = int(time.time())
-        for i, (f, settings, dynamicInterval, last_run) in enumerate(self.timed_jobs):
-            if f == func:
-                self.timed_jobs[i] = (f, settings, dynamicInterval, current_time)
-                break
-
-    def dynamic_result(self, func: typing.Callable, success: bool) -> None:
+        job = self._get(func)
+        if job is None:
+            return
+        job.lastRan = time.monotonic()
+        self._schedule(job)
+
+    def dynamic_result(
+        self, func: typing.Union[typing.Callable, TimedJob], success: bool
+    ) -> None:
         """Update dynamic interval based on job result.
 
+        The pending run is moved to match the new interval, counted from when
+        the job last started.
+
         Args:
-            func: The callable that completed
+            func: The callable that completed, or its handle
             success: Whether the job succeeded
         """
-        for i, (f, settings, dynamicInterval, last_run) in enumerate(self.timed_jobs):
-            if f == func and settings.dynamic:
-                if success:
-                    try:
-                        dynamicInterval = max(
-                            settings.base_interval,
-                            int(dynamicInterval / settings.growth_factor),
-                        )
-                    except ZeroDivisionError:
-                        dynamicInterval = settings.base_interval
-                else:
-                    dynamicInterval = min(
-                        settings.max_interval,
-                        int(dynamicInterval * settings.growth_factor),
-                    )
-                self.timed_jobs[i] = (f, settings, dynamicInterval, last_run)
-                break
+        job = self._get(func)
+        if job is None or not job.settings.dynamic:
+            return
+        settings = job.settings
+        if success:
+            try:
+                job.dynamicInterval = max(
+                    settings.base_interval,
+                    int(job.dynamicInterval / settings.growth_factor),
+                )
+            except ZeroDivisionError:
+                job.dynamicInterval = settings.base_interval
+        else:
+            job.dynamicInterval = min(
+                settings.max_interval,
+                max(
+                    settings.base_interval,
+                    int(job.dynamicInterval * settings.growth_factor),
+                ),
+            )
+        if job.deadline is not None:
+            elapsed = time.monotonic() - (job.lastRan or time.monotonic())
+            self._schedule(job, job.jittered(job.interval) - elapsed)
+
+
+@dataclass
+class SerialQueue:
+    """Jobs of one locked function waiting for the running instance to complete.
+
+    Attributes:
+        coalesce: Keep only the most recent waiting job
+        running: Whether an instance of the function is running
+        pending: Heap of (-priority, counter, priority, job)
+        coalesced: Number of jobs dropped in favour of a newer one
+    """
+
+    coalesce: bool = False
+    running: bool = False
+    pending: typing.List[
+        typing.Tuple[int, int, ExecutionPriority, JobRunnable]
+    ] = field(default_factory=list)
+    coalesced: int = 0
+
+    def push(self, job: JobRunnable, priority: ExecutionPriority, counter: int) -> None:
+        if self.coalesce and self.pending:
+            priority = max(priority, self.pending[0][2])
+            self.coalesced += len(self.pending)
+            self.pending.clear()
+        heapq.heappush(self.pending, (-priority.value, counter, priority, job))
+
+    def pop(self) -> typing.Optional[typing.Tuple[JobRunnable, ExecutionPriority]]:
+        while self.pending:
+            _, _, priority, job = heapq.heappop(self.pending)
+            if not job.handle.cancelled():
+                return job, priority
+        return None
 
 
 class BackgroundWorker(QThread):
@@ -278,10 +898,17 @@ class BackgroundWorker(QThread):
     Executes jobs through a QThreadPool with priority levels. Supports
     function locking to prevent concurrent execution of the same function
     and timed jobs for periodic tasks.
+
+    The dispatcher blocks on the queue until a job arrives or the next timed
+    job is due, so it doesn't wake up at all while there's nothing to do.
     """
 
     _instance: typing.Union["BackgroundWorker", None] = None
 
+    # Queued to wake the dispatcher without running anything (shutdown, timed
+    # job schedule changes). Sorts ahead of every real job.
+    _WAKEUP_PRIORITY = float("-inf")
+
     def __new__(self) -> "BackgroundWorker":
         if (
             not hasattr(BackgroundWorker, "_instance")
@@ -296,10 +923,11 @@ class BackgroundWorker(QThread):
         super().__init__(parent)
         self.thread_pool = QThreadPool.globalInstance()
         self.priority_queue: queue.PriorityQueue = queue.PriorityQueue()
-        self.timed_job_manager = TimedJobManager()
+        self.timed_job_manager = TimedJobManager(onScheduleChanged=self.wakeup)
 
-        self.func_lock_set: typing.Set[typing.Callable] = set()
+        self.serial_queues: typing.Dict[typing.Callable, SerialQueue] = {}
         self.running_funcs: typing.List[typing.Callable] = []
+        self.tracker = JobTracker()
 
         self.logger = logging.getLogger("BackgroundWorker")
 
@@ -312,94 +940,322 @@ class BackgroundWorker(QThread):
 
         cleanup.addCleanup(self.shutdown)
 
+    def _nextCounter(self) -> int:
+        with QMutexLocker(self._counter_mutex):
+            counter = self._job_counter
+            self._job_counter += 1
+        return counter
+
     def addJob(
         self,
         func: typing.Union[typing.Callable, JobRunnable],
         priority: ExecutionPriority = ExecutionPriority.MEDIUM_PRIORITY,
-    ) -> None:
+        key: typing.Optional[typing.Hashable] = None,
+    ) -> JobHandle:
         """Queue a job for background execution.
 
         Args:
             func: Callable or JobRunnable to execute
             priority: Execution priority (LOW, MEDIUM, or HIGH)
+            key: Dedup key. If a job with the same key is already pending or
+                running, nothing is queued and its handle is returned instead
+
+        Returns:
+            JobHandle: Future for the job's result
         """
         if isinstance(func, JobRunnable):
             job = func
+            if key is not None:
+                job.handle.key = key
         else:
-            job = JobRunnable(func)
-
-        with QMutexLocker(self._counter_mutex):
-            counter = self._job_counter
-            self._job_counter += 1
-
-        # Counter ensures FIFO order within same priority
-        self.priority_queue.put((priority.value, counter, job))
-        if isinstance(func, JobRunnable):
-            self.logger.info(
-                f"Job {func.rootfunc.__name__} added with priority {priority.name}"
-            )
-        else:
-            self.logger.info(
-                f"Job {job.func.__name__} added with priority {priority.name}"
-            )
+            job = JobRunnable(func, key=key)
+        if (handle := self.tracker.track(job.handle)) is not job.handle:
+            self.logger.debug(f"Job {handle.name} already queued for {key!r}")
+            return handle
+        job.context = contextvars.copy_context()
+        if (group := job.group) is not None:
+            group.adopt(job.handle)
+
+        # PriorityQueue pops the smallest entry first, so negate the priority
+        # to run HIGH before LOW. Counter ensures FIFO order within same priority
+        self.priority_queue.put(
+            (-priority.value, self._nextCounter(), priority, job)
+        )
+        self.logger.info(f"Job {job.handle.name} added with priority {priority.name}")
+        return job.handle
 
-    def onJobStarted(self, job: JobRunnable) -> None:
-        with QMutexLocker(self.running_funcs_mutex):
-            self.running_funcs.append(job.rootfunc)
-            self.logger.info(f"Job {job.rootfunc.__name__} started")
+    def wakeup(self) -> None:
+        """Make the dispatcher re-check the timed jobs and the running flag."""
+        self.priority_queue.put(
+            (self._WAKEUP_PRIORITY, self._nextCounter(), None, None)
+        )
 
     def onJobCompleted(self, job: JobRunnable) -> None:
+        next_job = None
         with QMutexLocker(self.running_funcs_mutex):
             if job.rootfunc in self.running_funcs:
                 self.running_funcs.remove(job.rootfunc)
             self.logger.info(f"Job {job.rootfunc.__name__} completed")
 
+            serial = self.serial_queues.get(job.rootfunc)
+            if serial is not None:
+                next_job = serial.pop()
+                if next_job is None:
+                    serial.running = False
+                else:
+                    self.running_funcs.append(job.rootfunc)
+        if next_job is not None:
+            self._start(*next_job)
+
+    def _dispatch(self, job: JobRunnable, priority: ExecutionPriority) -> None:
+        if job.handle.cancelled():
+            self.logger.debug(f"Job {job.handle.name} was cancelled, skipping")
+            return
+        with QMutexLocker(self.running_funcs_mutex):
+            serial = self.serial_queues.get(job.rootfunc)
+            if serial is not None:
+                if serial.running:
+                    # Checked and queued under the same lock onJobCompleted
+                    # takes, so the completion can't slip in between and
+                    # leave the job stranded
+                    serial.push(job, priority, self._nextCounter())
+                    self.logger.debug(
+                        f"Job {job.rootfunc.__name__} is already running, "
+                        f"{len(serial.pending)} waiting behind it"
+                    )
+                    return
+                serial.running = True
+            # Marked as running before it starts, a fast job could otherwise
+            # complete before it's registered and stay "running" forever
+            self.running_funcs.append(job.rootfunc)
+        self._start(job, priority)
+
+    def _start(self, job: JobRunnable, priority: ExecutionPriority) -> None:
+        self.logger.info(f"Job {job.rootfunc.__name__} started")
+        job.completedCallback = lambda j=job: self.onJobCompleted(j)
+        if job.isCoroutine and asyncBgworker.ready.is_set():
+            # No point tying up a pool thread (and a fresh event loop) while
+            # the coroutine waits on I/O
+            job.runOnLoop(asyncBgworker)
+            return
+        # Jobs are handed over as soon as they arrive, so when every pool
+        # thread is busy it's the pool's own queue that has to respect priority
+        self.thread_pool.start(job, priority.value)
+
+    def _queueDueTimedJobs(self) -> None:
+        for job_func in self.timed_job_manager.tick():
+            with QMutexLocker(self.running_funcs_mutex):
+                due = job_func.rootfunc not in self.running_funcs
+            if due:
+                self.addJob(job_func, ExecutionPriority.LOW_PRIORITY)
+            else:
+                # Still running from last time, try again an interval from now
+                self.timed_job_manager.updateLastRan(job_func.rootfunc)
+
     def run(self) -> None:
         self.running = True
         while self.running:
-            if not self.priority_queue.empty():
-                _, _, job = self.priority_queue.get()
-                with QMutexLocker(self.running_funcs_mutex):
-                    if job.rootfunc in self.func_lock_set:
-                        run_allowed = job.rootfunc not in self.running_funcs
-                    else:
-                        run_allowed = True
-                if not run_allowed:
-                    self.logger.debug(
-                        f"Job {job.rootfunc.__name__} is already running, re-adding to queue"
-                    )
-                    self.addJob(job, ExecutionPriority.HIGH_PRIORITY)
-                    continue
-                job.completedCallback = lambda j=job: self.onJobCompleted(j)
-                self.thread_pool.start(job)
-                self.onJobStarted(job)
-
-            timed_jobs = self.timed_job_manager.tick()
-            for job_func in timed_jobs:
-                with QMutexLocker(self.running_funcs_mutex):
-                    if job_func.rootfunc not in self.running_funcs:
-                        self.addJob(job_func, ExecutionPriority.LOW_PRIORITY)
-            self.msleep(100)  # Sleep briefly to prevent tight loop
-
-    def addLockedFunction(self, func: typing.Callable) -> None:
+            timeout = self.timed_job_manager.secondsUntilNextDue()
+            if timeout == 0:
+                self._queueDueTimedJobs()
+                continue
+            try:
+                _, _, priority, job = self.priority_queue.get(timeout=timeout)
+            except queue.Empty:
+                continue  # a timed job is due
+            if job is not None:
+                self._dispatch(job, priority)
+
+    def getStatistics(self) -> dict:
+        """Get job counters
+
+        Returns:
+            dict: submitted, completed, failed, cancelled and coalesced job counts
+        """
+        return asdict(self.tracker.statistics)
+
+    def getMetrics(self) -> dict:
+        """Get queue gauges and per-job-name wait and run time histograms
+
+        Returns:
+            dict: JobTracker.metrics(), plus "queued" (jobs in the dispatch
+            queue), "serialWaiting" (jobs waiting behind a locked function)
+            and "poolThreads": {active, max}
+        """
+        with QMutexLocker(self.running_funcs_mutex):
+            serialWaiting = sum(len(q.pending) for q in self.serial_queues.values())
+        return {
+            **self.tracker.metrics(),
+            # Wakeup entries are never more than a couple at a time
+            "queued": self.priority_queue.qsize(),
+            "serialWaiting": serialWaiting,
+            "poolThreads": {
+                "active": self.thread_pool.activeThreadCount(),
+                "max": self.thread_pool.maxThreadCount(),
+            },
+        }
+
+    def addLockedFunction(self, func: typing.Callable, coalesce: bool = False) -> None:
         """Mark a function to prevent concurrent execution.
 
         When a function is locked, only one instance can run at a time.
-        Subsequent attempts are re-queued until the first completes.
+        Jobs that come up while it's running wait in the function's own queue
+        and are started one by one, highest priority first, as each completes.
 
         Args:
             func: The callable to lock
+            coalesce: Keep at most one waiting job, the most recent one, with
+                the highest priority of the jobs it replaced. For jobs where
+                only the latest state matters (refreshes, saves)
         """
-        self.func_lock_set.add(func)
+        with QMutexLocker(self.running_funcs_mutex):
+            serial = self.serial_queues.get(func)
+            if serial is None:
+                self.serial_queues[func] = SerialQueue(coalesce=coalesce)
+            else:
+                serial.coalesce = coalesce
 
     def shutdown(self) -> None:
         """Stop the worker thread and wait for completion."""
         self.logger.info("Shutting down BackgroundWorker...")
         self.running = False
+        self.wakeup()
         self.wait(5000)  # Wait for thread to exit (5 sec timeout)
         self.thread_pool.waitForDone()
 
 
+@dataclass(eq=False)
+class AsyncJob:
+    """A job waiting in or taken from an AsyncJobScheduler"""
+
+    func: typing.Callable
+    timeout: typing.Optional[float]
+    handle: JobHandle
+    priority: ExecutionPriority = ExecutionPriority.MEDIUM_PRIORITY
+    category: JobCategory = JobCategory.GENERAL
+    enqueued: float = field(default_factory=time.monotonic)
+    # Context the job was queued from, it runs in it
+    context: typing.Optional[contextvars.Context] = None
+
+    @property
+    def group(self) -> typing.Optional[TaskGroup]:
+        return self.context.get(currentGroup) if self.context is not None else None
+
+
+DEFAULT_CATEGORY_LIMITS: typing.Dict[JobCategory, int] = {
+    JobCategory.GENERAL: 4,
+    JobCategory.METADATA: 6,
+    JobCategory.PLAYBACK: 3,
+    JobCategory.LYRICS: 2,
+    JobCategory.THUMBNAIL: 4,
+    JobCategory.DOWNLOAD: 2,
+}
+
+
+class AsyncJobScheduler:
+    """Decides which queued async jobs may start.
+
+    Every category has its own concurrency limit on top of a global one, so a
+    burst of one kind of job (say forty album track info fetches) can't take
+    every slot. HIGH priority jobs skip both limits and start right away.
+
+    Within the limits, jobs start highest priority first. To keep LOW jobs
+    from starving behind a steady stream of MEDIUM ones, a job gains one
+    priority level for every `aging_interval` seconds it waits. Since every
+    job ages at the same rate that ordering never changes after a job is
+    queued, so it's a fixed heap key: enqueue time minus priority times
+    aging_interval.
+    """
+
+    def __init__(
+        self,
+        limits: typing.Optional[typing.Dict[JobCategory, int]] = None,
+        max_concurrent: int = 10,
+        aging_interval: float = 5.0,
+    ):
+        self._mutex = QMutex()
+        self.limits = dict(DEFAULT_CATEGORY_LIMITS if limits is None else limits)
+        self.max_concurrent = max_concurrent
+        self.aging_interval = aging_interval
+        self._express: typing.List[AsyncJob] = []
+        self._pending: typing.Dict[
+            JobCategory, typing.List[typing.Tuple[float, int, AsyncJob]]
+        ] = {}
+        self._sequence = 0
+        self.running: typing.Dict[JobCategory, int] = {}
+        self.total_running = 0
+
+    def push(self, job: AsyncJob) -> None:
+        with QMutexLocker(self._mutex):
+            if job.priority >= ExecutionPriority.HIGH_PRIORITY:
+                self._express.append(job)
+                return
+            self._sequence += 1
+            rank = job.enqueued - job.priority.value * self.aging_interval
+            heapq.heappush(
+                self._pending.setdefault(job.category, []),
+                (rank, self._sequence, job),
+            )
+
+    def take(self) -> typing.List[AsyncJob]:
+        """Remove and return every job that may start now, marking it running"""
+        with QMutexLocker(self._mutex):
+            ready = self._express
+            self._express = []
+            for job in ready:
+                self._started(job)
+
+            while self.total_running < self.max_concurrent:
+                best: typing.Optional[typing.List] = None
+                for category, heap in self._pending.items():
+                    while heap and heap[0][2].handle.cancelled():
+                        heapq.heappop(heap)
+                    if not heap:
+                        continue
+                    if self.running.get(category, 0) >= self.limits.get(
+                        category, self.max_concurrent
+                    ):
+                        continue
+                    if best is None or heap[0] < best[0]:
+                        best = heap
+                if best is None:
+                    break
+                _, _, job = heapq.heappop(best)
+                self._started(job)
+                ready.append(job)
+            return ready
+
+    def _started(self, job: AsyncJob) -> None:
+        self.running[job.category] = self.running.get(job.category, 0) + 1
+        self.total_running += 1
+
+    def finished(self, job: AsyncJob) -> None:
+        with QMutexLocker(self._mutex):
+            self.running[job.category] -= 1
+            self.total_running -= 1
+
+    def snapshot(self) -> dict:
+        """Running, pending and limit per category
+
+        Returns:
+            dict: {category name: {"running", "pending", "limit"}}
+        """
+        with QMutexLocker(self._mutex):
+            pending: typing.Dict[JobCategory, int] = {
+                category: len(heap) for category, heap in self._pending.items()
+            }
+            for job in self._express:
+                pending[job.category] = pending.get(job.category, 0) + 1
+            return {
+                category.name: {
+                    "running": self.running.get(category, 0),
+                    "pending": pending.get(category, 0),
+                    "limit": self.limits.get(category, self.max_concurrent),
+                }
+                for category in JobCategory
+            }
+
+
 class AsyncBackgroundWorker(QThread):
     """Singleton thread managing an async event loop for concurrent I/O jobs.
 
@@ -422,7 +1278,7 @@ class AsyncBackgroundWorker(QThread):
     def __init__(self, parent=None):
         super().__init__(parent)
 
-        self.job_queue: asyncio.Queue = asyncio.Queue()
+        self.scheduler = AsyncJobScheduler()
         self.logger = logging.getLogger("AsyncBackgroundWorker")
         self.running = False
         self.default_timeout: typing.Optional[float] = 30.0  # seconds
@@ -433,36 +1289,194 @@ class AsyncBackgroundWorker(QThread):
         )  # task -> (name, start_time)
 
         self.event_loop: typing.Union[asyncio.AbstractEventLoop, None] = None
+        # Set once the loop, session and API are up
+        self.ready = threading.Event()
+        self.startup_timeout: float = 30.0  # seconds
+        self.tracker = JobTracker()
+        self._wakeup: typing.Optional[asyncio.Event] = None
 
         cleanup.addCleanup(self.shutdown)
 
     def addJob(
-        self, func: typing.Callable, timeout: typing.Optional[float] = None
-    ) -> None:
-        """Queue an async job for execution.
+        self,
+        func: typing.Callable,
+        timeout: typing.Optional[float] = None,
+        key: typing.Optional[typing.Hashable] = None,
+        priority: ExecutionPriority = ExecutionPriority.MEDIUM_PRIORITY,
+        category: JobCategory = JobCategory.GENERAL,
+    ) -> JobHandle:
+        """Queue an async job for execution. Safe to call from any thread.
 
         Args:
             func: Async callable to execute in the event loop
             timeout: Maximum execution time in seconds (None for no timeout, uses default_timeout if not specified)
+            key: Dedup key. If a job with the same key is already pending or
+                running, nothing is queued and its handle is returned instead
+            priority: HIGH starts immediately regardless of limits, use it for
+                what the user is waiting on
+            category: Which concurrency limit the job counts against
+
+        Returns:
+            JobHandle: Future for the job's result
+        """
+        handle, _ = self._queue(func, timeout, key, priority, category)
+        return handle
+
+    def submit(
+        self,
+        coro: typing.Coroutine,
+        priority: ExecutionPriority = ExecutionPriority.MEDIUM_PRIORITY,
+        timeout: typing.Optional[float] = None,
+        category: JobCategory = JobCategory.GENERAL,
+        key: typing.Optional[typing.Hashable] = None,
+    ) -> JobHandle:
+        """Run a coroutine on the worker's loop. Safe to call from any thread,
+        including before the loop has started (the job runs once it's up).
+
+        Goes through the same scheduler, timeout and long-running monitor as
+        addJob. From the loop thread itself, await the result with
+        `asyncio.wrap_future(handle)` rather than blocking on `result()`.
+
+        Args:
+            coro: The coroutine to run
+            priority: HIGH starts immediately regardless of limits
+            timeout: Maximum execution time in seconds (defaults to default_timeout)
+            category: Which concurrency limit the job counts against
+            key: Dedup key. If a job with the same key is already pending or
+                running, `coro` is closed unused and that job's handle is returned
+
+        Returns:
+            JobHandle: A concurrent.futures.Future for the coroutine's result
         """
+
+        async def run():
+            return await coro
+
+        run.__name__ = getattr(coro, "__name__", "coroutine")
+        handle, queued = self._queue(run, timeout, key, priority, category)
+        if not queued:
+            coro.close()
+        else:
+            # Don't leave a never-awaited coroutine behind if it never starts
+            handle.add_done_callback(lambda h: coro.close() if h.cancelled() else None)
+        return handle
+
+    def _queue(
+        self,
+        func: typing.Callable,
+        timeout: typing.Optional[float],
+        key: typing.Optional[typing.Hashable],
+        priority: ExecutionPriority,
+        category: JobCategory,
+    ) -> typing.Tuple[JobHandle, bool]:
+        handle = JobHandle(getattr(func, "__name__", repr(func)), key)
+        if (existing := self.tracker.track(handle)) is not handle:
+            self.logger.debug(f"Job {existing.name} already queued for {key!r}")
+            return existing, False
         if timeout is None:
             timeout = self.default_timeout
-        self.job_queue.put_nowait((func, timeout))
+        job = AsyncJob(func, timeout, handle, priority, category)
+        job.context = contextvars.copy_context()
+        if (group := job.group) is not None:
+            group.adopt(handle)
+        self.scheduler.push(job)
+        self._wake()
         self.logger.debug(
-            f"Job {func.__name__} added to async queue (timeout: {timeout}s)"
+            f"Job {handle.name} added to async queue "
+            f"({category.name}, {priority.name}, timeout: {timeout}s)"
         )
+        return handle, True
+
+    def setCategoryLimit(self, category: JobCategory, limit: int) -> None:
+        """Change how many jobs of a category may run at once.
+
+        Args:
+            category: The category
+            limit: Maximum concurrent jobs, HIGH priority jobs aside
+        """
+        self.scheduler.limits[category] = limit
+        self._wake()
+
+    def _wake(self) -> None:
+        """Make the loop look for startable jobs. Safe to call from any thread."""
+        loop, wakeup = self.event_loop, self._wakeup
+        if loop is None or wakeup is None or loop.is_closed():
+            return  # the loop picks everything up when it starts
+        if self.isLoopThread():
+            wakeup.set()
+        else:
+            loop.call_soon_threadsafe(wakeup.set)
+
+    def getStatistics(self) -> dict:
+        """Get job counters and per-category load
+
+        Returns:
+            dict: submitted, completed, failed, cancelled and coalesced job
+            counts, plus "categories": {name: {running, pending, limit}}
+        """
+        return {
+            **asdict(self.tracker.statistics),
+            "categories": self.scheduler.snapshot(),
+        }
+
+    def getMetrics(self) -> dict:
+        """Get queue gauges and per-job-name wait and run time histograms
+
+        Returns:
+            dict: JobTracker.metrics(), plus "categories": {name: {running,
+            pending, limit}} and "tasks" (job tasks on the loop)
+        """
+        return {
+            **self.tracker.metrics(),
+            "categories": self.scheduler.snapshot(),
+            "tasks": len(self.task_metadata),
+        }
+
+    def run_coroutine_threadsafe(
+        self, coro: typing.Coroutine
+    ) -> concurrent.futures.Future:
+        """Schedule a coroutine on the worker's event loop from another thread.
+
+        If the worker has been started but its loop isn't up yet, this waits
+        for it (up to startup_timeout).
+
+        Args:
+            coro: The coroutine to run
+
+        Returns:
+            concurrent.futures.Future: Future for the coroutine's result
+
+        Raises:
+            RuntimeError: If the loop isn't running
+        """
+        if not self.ready.wait(self.startup_timeout if self.isRunning() else 0):
+            coro.close()
+            raise RuntimeError("AsyncBackgroundWorker's event loop isn't running")
+        assert self.event_loop is not None
+        return asyncio.run_coroutine_threadsafe(coro, self.event_loop)
+
+    def isLoopThread(self) -> bool:
+        """Whether the calling thread is the one running the worker's loop"""
+        try:
+            return asyncio.get_running_loop() is self.event_loop
+        except RuntimeError:
+            return False
 
     def run(self) -> None:
-        asyncio.run(self.async_run())
+        try:
+            asyncio.run(self.async_run())
+        finally:
+            self.ready.clear()
 
     async def async_run(self) -> None:
         self.event_loop = asyncio.get_event_loop()
-        tasks: set[asyncio.Task] = set()
-        max_concurrent = 10
+        self._wakeup = asyncio.Event()
         self.running = True
 
         self.logger.info("AsyncBackgroundWorker started, alive: %s", self.isRunning())
-        self.session = aiohttp.ClientSession()
+        self.session = aiohttp.ClientSession(
+            trace_configs=[requestTimings.aiohttp_trace_config()]
+        )
 
         if not __compiled__:
             self.API = ytmusicapi.YTMusic(requests_session=self.session)
@@ -487,47 +1501,71 @@ class AsyncBackgroundWorker(QThread):
         monitor_task = asyncio.create_task(  # noqa: F841
             self._monitor_long_running_tasks()
         )
+        self.ready.set()
 
         while self.running:
-            if len(tasks) >= max_concurrent:
-                done, tasks = await asyncio.wait(
-                    tasks, return_when=asyncio.FIRST_COMPLETED
-                )
-            try:
-                func, job_timeout = await asyncio.wait_for(
-                    self.job_queue.get(), timeout=1
-                )
-            except TimeoutError:
-                continue
-            task = asyncio.create_task(self._run_job(func, job_timeout))
-            tasks.add(task)
-            self.task_metadata[task] = (func.__name__, time.time())
+            self._wakeup.clear()
+            for job in self.scheduler.take():
+                self._start(job)
+            # Woken by new jobs, finished jobs, limit changes and shutdown
+            await self._wakeup.wait()
+
+    def _start(self, job: AsyncJob) -> None:
+        group = job.group
+        if group is not None and group.expired:
+            job.handle.cancel()
+        if not job.handle.set_running_or_notify_cancel():
+            self.logger.debug(f"Job {job.handle.name} was cancelled, skipping")
+            self.scheduler.finished(job)
+            self._wake()
+            return
+        timeout = job.timeout
+        if group is not None and (remaining := group.remaining()) is not None:
+            # Time out at the group's deadline if that comes first
+            timeout = min(timeout, remaining) if timeout else remaining
+        task = asyncio.create_task(
+            self._run_job(job.func, timeout, job.handle), context=job.context
+        )
+        self.task_metadata[task] = (job.handle.name, time.time())
+        if group is not None:
+            loop = asyncio.get_running_loop()
+            group.interruptWith(
+                job.handle, lambda: loop.call_soon_threadsafe(task.cancel)
+            )
 
-            def cleanup_task(t):
-                tasks.discard(t)
-                self.task_metadata.pop(t, None)
+        def cleanup_task(t, job=job):
+            self.task_metadata.pop(t, None)
+            self.scheduler.finished(job)
+            self._wake()
 
-            task.add_done_callback(cleanup_task)
+        task.add_done_callback(cleanup_task)
 
     async def _run_job(
-        self, func: typing.Callable, timeout: typing.Optional[float]
+        self,
+        func: typing.Callable,
+        timeout: typing.Optional[float],
+        handle: JobHandle,
     ) -> None:
         try:
             if inspect.iscoroutinefunction(func):
                 if timeout:
-                    await asyncio.wait_for(func(), timeout=timeout)
+                    result = await asyncio.wait_for(func(), timeout=timeout)
                 else:
-                    await func()
+                    result = await func()
             else:
-                func()
-            self.logger.debug(f"Job {func.__name__} completed")
-        except asyncio.TimeoutError:
-            self.logger.error(f"Job {func.__name__} timed out after {timeout}s")
+                result = func()
+            self.logger.debug(f"Job {handle.name} completed")
+            handle.set_result(result)
+        except asyncio.TimeoutError as e:
+            self.logger.error(f"Job {handle.name} timed out after {timeout}s")
+            handle.set_exception(e)
+        except asyncio.CancelledError:
+            handle.set_exception(concurrent.futures.CancelledError())
+            raise
         except Exception as e:
-            self.logger.error(f"Error in job {func.__name__}: {e}")
+            self.logger.error(f"Error in job {handle.name}: {e}")
             traceback.print_exc()
-        finally:
-            self.job_queue.task_done()
+            handle.set_exception(e)
 
     async def _monitor_long_running_tasks(self) -> None:
         """Periodically check for tasks exceeding the long-running threshold."""
@@ -545,8 +1583,212 @@ class AsyncBackgroundWorker(QThread):
         """Stop the async event loop and wait for completion."""
         self.logger.info("Shutting down AsyncBackgroundWorker...")
         self.running = False
+        self._wake()
         self.wait(5000)
 
 
+class ProcessPool:
+    """Worker processes for CPU-bound work that would hold the GIL (and stall the
+    UI thread) if it ran on bgworker's threads.
+
+    Tasks must be picklable module-level functions that don't need the app to
+    be set up, see src/misc/processTasks.py. Workers are spawned rather than
+    forked, forking a process with Qt and the worker threads running isn't safe.
+    The entry point has to be guarded by `if __name__ == "__main__"` for that.
+
+    Nothing is spawned until the first submit, or an explicit `start()`.
+    """
+
+    def __init__(self, max_workers: typing.Optional[int] = None):
+        self.max_workers = max_workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self.executor: typing.Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self.restarts = 0
+        self.statistics = JobStatistics()
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger("ProcessPool")
+        cleanup.addCleanup(self.shutdown)
+
+    def start(self, warm: bool = True) -> None:
+        """Create the pool if it isn't running.
+
+        Args:
+            warm: Start every worker now and have it import what the tasks need,
+                so the first tasks don't wait for process startup
+        """
+        with self._lock:
+            if self.executor is None:
+                self.executor = concurrent.futures.ProcessPoolExecutor(
+                    self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=processTasks.initWorker,
+                )
+                self.logger.info(f"Process pool started, {self.max_workers} workers")
+            executor = self.executor
+        if warm:
+            # The executor spawns a worker per task while none are idle
+            for _ in range(self.max_workers):
+                executor.submit(processTasks.warmup)
+
+    def submit(
+        self, func: typing.Callable, *args, **kwargs
+    ) -> concurrent.futures.Future:
+        """Run func(*args, **kwargs) in a worker process. Safe to call from any
+        thread, starts the pool if needed.
+
+        If the pool is already broken when the task is submitted, it's
+        replaced once and the task submitted to the new one. A task whose
+        worker dies while it runs (killed, out of memory, crashed in native
+        code) isn't retried: its future fails with BrokenProcessPool and only
+        the pool is replaced, for the tasks that come after it.
+
+        Args:
+            func: Picklable module-level function
+            *args: Picklable positional arguments
+            **kwargs: Picklable keyword arguments
+
+        Returns:
+            concurrent.futures.Future: Future for the (unpickled) result
+        """
+        for attempt in range(2):
+            if self.executor is None:
+                self.start(warm=False)
+            executor = self.executor
+            assert executor is not None
+            try:
+                future = executor.submit(func, *args, **kwargs)
+                break
+            except concurrent.futures.process.BrokenProcessPool:
+                if attempt:
+                    raise
+                self._restart(executor)
+            except RuntimeError:
+                # Shut down between the check and the submit
+                if attempt:
+                    raise
+        with self._lock:
+            self.statistics.submitted += 1
+        future.add_done_callback(lambda f: self._onDone(f, executor))
+        return future
+
+    def _onDone(
+        self,
+        future: concurrent.futures.Future,
+        executor: concurrent.futures.ProcessPoolExecutor,
+    ) -> None:
+        with self._lock:
+            if future.cancelled():
+                self.statistics.cancelled += 1
+                return
+            error = future.exception()
+            if error is None:
+                self.statistics.completed += 1
+            else:
+                self.statistics.failed += 1
+        if isinstance(error, concurrent.futures.process.BrokenProcessPool):
+            self.logger.error("A process pool worker died, restarting the pool")
+            self._restart(executor)
+
+    def _restart(
+        self, broken: typing.Optional[concurrent.futures.ProcessPoolExecutor]
+    ) -> None:
+        with self._lock:
+            if broken is None or self.executor is not broken:
+                return  # Already replaced
+            self.executor = None
+            self.restarts += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def getStatistics(self) -> dict:
+        """Get task counters
+
+        Returns:
+            dict: submitted, completed, failed, cancelled and coalesced task
+            counts, plus the number of workers and pool restarts
+        """
+        with self._lock:
+            return {
+                **asdict(self.statistics),
+                "workers": self.max_workers,
+                "restarts": self.restarts,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the workers. Queued tasks are cancelled, running ones finish."""
+        with self._lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            self.logger.info("Shutting down ProcessPool...")
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+class Batcher:
+    """Groups items added close together into one bgworker job.
+
+    For per-object work that's much cheaper done in bulk (one datastore scan
+    for 500 songs instead of 500 lookups). The first item added opens a
+    window, everything added before it closes goes to func as one list.
+
+    Args:
+        func: Called on the bgworker with the items, in the order added
+        window: Seconds to collect items for
+        priority: Priority of the job
+    """
+
+    def __init__(
+        self,
+        func: typing.Callable[[list], None],
+        window: float = 0.005,
+        priority: ExecutionPriority = ExecutionPriority.MEDIUM_PRIORITY,
+    ):
+        self.func = func
+        self.window = window
+        self.priority = priority
+        self._lock = threading.Lock()
+        self._pending: list = []
+        self._opened: typing.Optional[float] = None
+
+        def flush() -> None:
+            self._flush()
+
+        flush.__name__ = getattr(func, "__name__", "batch")
+        self._job = flush
+
+    def add(self, item: typing.Any) -> None:
+        with self._lock:
+            self._pending.append(item)
+            if self._opened is not None:
+                return
+            self._opened = time.monotonic()
+        # Batches are shared, one caller's group ending mustn't drop the rest
+        with TaskGroup.shield():
+            bgworker.addJob(self._job, self.priority)
+
+    def _flush(self) -> None:
+        with self._lock:
+            opened = self._opened
+        if opened is not None and (wait := opened + self.window - time.monotonic()) > 0:
+            time.sleep(wait)
+        with self._lock:
+            items, self._pending = self._pending, []
+            self._opened = None
+        if items:
+            self.func(items)
+
+
 bgworker = BackgroundWorker()
 asyncBgworker = AsyncBackgroundWorker()
+processPool = ProcessPool()
+
+
+def getMetrics() -> dict:
+    """Metrics of all the workers, for the debug page and for dumping
+
+    Returns:
+        dict: {"bgworker": ..., "asyncBgworker": ...} from their getMetrics(),
+        and "processPool" from its getStatistics()
+    """
+    return {
+        "bgworker": bgworker.getMetrics(),
+        "asyncBgworker": asyncBgworker.getMetrics(),
+        "processPool": processPool.getStatistics(),
+    }
@@ -0,0 +1,173 @@
+import asyncio
+import threading
+import unittest
+
+from src.workers import (
+    AsyncJob,
+    AsyncJobScheduler,
+    ExecutionPriority,
+    JobCategory,
+    JobHandle,
+    asyncBgworker,
+)
+
+LOW = ExecutionPriority.LOW_PRIORITY
+MEDIUM = ExecutionPriority.MEDIUM_PRIORITY
+HIGH = ExecutionPriority.HIGH_PRIORITY
+
+
+def job(
+    name: str,
+    category: JobCategory = JobCategory.METADATA,
+    priority: ExecutionPriority = MEDIUM,
+    enqueued: float = 0.0,
+) -> AsyncJob:
+    return AsyncJob(
+        func=lambda: None,
+        timeout=None,
+        handle=JobHandle(name),
+        priority=priority,
+        category=category,
+        enqueued=enqueued,
+    )
+
+
+def names(jobs: list[AsyncJob]) -> list[str]:
+    return [j.handle.name for j in jobs]
+
+
+class TestAsyncJobScheduler(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = AsyncJobScheduler(
+            limits={JobCategory.METADATA: 2, JobCategory.DOWNLOAD: 1},
+            max_concurrent=4,
+            aging_interval=5,
+        )
+
+    def test_category_limits(self):
+        for i in range(4):
+            self.scheduler.push(job(f"track{i}", enqueued=i))
+        self.scheduler.push(job("download", JobCategory.DOWNLOAD, enqueued=5))
+        self.assertEqual(names(self.scheduler.take()), ["track0", "track1", "download"])
+        self.assertEqual(self.scheduler.take(), [])
+
+    def test_high_priority_bypasses_limits(self):
+        started = [job(f"track{i}", enqueued=i) for i in range(2)]
+        for j in started:
+            self.scheduler.push(j)
+        self.scheduler.take()
+        self.scheduler.push(job("clicked", priority=HIGH, enqueued=3))
+        self.assertEqual(names(self.scheduler.take()), ["clicked"])
+        self.assertEqual(self.scheduler.running[JobCategory.METADATA], 3)
+
+        # Back under the limit only once both the earlier jobs finish
+        self.scheduler.push(job("next", enqueued=4))
+        self.scheduler.finished(started[0])
+        self.assertEqual(self.scheduler.take(), [])
+        self.scheduler.finished(started[1])
+        self.assertEqual(names(self.scheduler.take()), ["next"])
+
+    def test_priority_order_with_aging(self):
+        self.scheduler.limits[JobCategory.METADATA] = 1
+        blocker = job("blocker", enqueued=0)
+        self.scheduler.push(blocker)
+        self.scheduler.take()
+
+        self.scheduler.push(job("old low", priority=LOW, enqueued=0))
+        self.scheduler.push(job("new medium", priority=MEDIUM, enqueued=6))
+        self.scheduler.push(job("recent medium", priority=MEDIUM, enqueued=2))
+        order = []
+        running = blocker
+        for _ in range(3):
+            self.scheduler.finished(running)
+            (running,) = self.scheduler.take()
+            order.append(running.handle.name)
+        # The LOW job waited more than one aging interval longer than "new
+        # medium", so it goes first, but not ahead of the MEDIUM job queued
+        # less than an interval after it
+        self.assertEqual(order, ["recent medium", "old low", "new medium"])
+
+    def test_global_limit_and_cancelled_jobs(self):
+        self.scheduler.limits[JobCategory.METADATA] = 10
+        jobs = [job(f"track{i}", enqueued=i) for i in range(6)]
+        for j in jobs:
+            self.scheduler.push(j)
+        jobs[1].handle.cancel()
+        self.assertEqual(
+            names(self.scheduler.take()), ["track0", "track2", "track3", "track4"]
+        )
+        snapshot = self.scheduler.snapshot()["METADATA"]
+        self.assertEqual(snapshot, {"running": 4, "pending": 1, "limit": 10})
+
+
+class TestSubmit(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        asyncBgworker.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        asyncBgworker.shutdown()
+
+    def test_result_and_errors(self):
+        async def double(x):
+            await asyncio.sleep(0)
+            return x * 2
+
+        async def fail():
+            raise ValueError("expected")
+
+        self.assertEqual(asyncBgworker.submit(double(21)).result(timeout=5), 42)
+        with self.assertRaises(ValueError):
+            asyncBgworker.submit(fail()).result(timeout=5)
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncBgworker.submit(asyncio.sleep(5), timeout=0.05).result(timeout=5)
+
+    def test_from_many_threads(self):
+        async def identity(x):
+            return x
+
+        handles: list[JobHandle] = []
+        lock = threading.Lock()
+
+        def submitter(start):
+            for i in range(start, start + 50):
+                handle = asyncBgworker.submit(identity(i))
+                with lock:
+                    handles.append(handle)
+
+        threads = [threading.Thread(target=submitter, args=(n * 50,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        results = sorted(h.result(timeout=5) for h in handles)
+        self.assertEqual(results, list(range(400)))
+
+    def test_duplicates_and_cancelled_jobs_close_their_coroutine(self):
+        gate = threading.Event()
+
+        async def wait():
+            await asyncio.to_thread(gate.wait, 5)
+            return "first"
+
+        first = asyncBgworker.submit(wait(), key=("submit", 1))
+        duplicate = wait()
+        self.assertIs(asyncBgworker.submit(duplicate, key=("submit", 1)), first)
+        self.assertIsNone(duplicate.cr_frame)  # closed without running
+
+        limit = asyncBgworker.scheduler.limits[JobCategory.DOWNLOAD]
+        asyncBgworker.setCategoryLimit(JobCategory.DOWNLOAD, 0)
+        try:
+            pending = wait()
+            handle = asyncBgworker.submit(pending, category=JobCategory.DOWNLOAD)
+            self.assertTrue(handle.cancel())
+            self.assertIsNone(pending.cr_frame)
+        finally:
+            asyncBgworker.setCategoryLimit(JobCategory.DOWNLOAD, limit)
+        gate.set()
+        self.assertEqual(first.result(timeout=5), "first")
+
+
+if __name__ == "__main__":
+    unittest.main()
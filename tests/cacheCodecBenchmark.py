@@ -0,0 +1,159 @@
+"""
+Song cache entries: the binary codec against the JSON path it replaces
+(as_dict + json.dumps to write, json.loads + from_dict to read), for SongData
+and for PlaybackData with a full set of YouTube formats.
+"""
+
+import json
+import marshal
+import time
+import unittest
+
+try:
+    from src.innertube.globalModels import SimpleIdentifier
+    from src.innertube.song.models import (
+        FormatData,
+        PlaybackData,
+        SongData,
+        YoutubeFormatData,
+        YoutubePlaybackData,
+        codec,
+    )
+    from songDataBenchmark import cached
+except ImportError:  # the song package needs the full set of dependencies
+    codec = None
+
+ENTRIES = 2_000
+
+
+def song(i: int) -> "SongData":
+    data = SongData.from_dict(json.loads(cached(i)))
+    data.videoDetails  # as if it came from the provider, fully decoded
+    return data
+
+
+def playback(i: int) -> "YoutubePlaybackData":
+    formats = [
+        YoutubeFormatData(
+            url=f"https://rr1.googlevideo.com/videoplayback?id={i}&itag={itag}"
+            + "&sig="
+            + "s" * 300,
+            clarity_quality=itag,
+            ext="webm" if itag > 200 else "m4a",
+            audio=itag < 300,
+            format_id=str(itag),
+            protocol="https",
+            acodec="opus",
+            vcodec="none",
+            abr=129.5,
+            filesize=3_500_000 + itag,
+            http_headers={"User-Agent": "Mozilla/5.0", "Accept": "*/*"},
+            downloader_options={"http_chunk_size": 10485760},
+        )
+        for itag in (139, 140, 249, 250, 251, 394, 395, 396, 397, 398)
+    ]
+    return YoutubePlaybackData(
+        id=SimpleIdentifier(f"song{i:07d}"),
+        title=f"Song {i}",
+        formats=formats,
+        audio_formats=formats[:5],
+        video_formats=formats[5:],
+        duration=200,
+        channel="Artist",
+        tags=["Artist", "Album"],
+        categories=["Music"],
+        extra={"epoch": 1700000000},
+    )
+
+
+def jsonPath(obj) -> object:
+    return type(obj).from_dict(json.loads(json.dumps(obj.as_dict())))
+
+
+def codecPath(obj) -> object:
+    return codec.loads(codec.dumps(obj), type(obj))
+
+
+def perEntry(function, items) -> float:
+    """Microseconds per item"""
+    begin = time.perf_counter()
+    for item in items:
+        function(item)
+    return (time.perf_counter() - begin) * 1e6 / len(items)
+
+
+@unittest.skipIf(codec is None, "song package can't be imported here")
+class TestCacheCodecBenchmark(unittest.TestCase):
+    def test_throughput(self):
+        print(f"\n{ENTRIES} entries, per entry:")
+        for name, make in (("SongData", song), ("PlaybackData", playback)):
+            items = [make(i) for i in range(ENTRIES)]
+            asJson = [json.dumps(item.as_dict()) for item in items]
+            asBinary = [codec.dumps(item) for item in items]
+            cls = type(items[0])
+            results = {
+                "write json": perEntry(lambda o: json.dumps(o.as_dict()), items),
+                "write codec": perEntry(codec.dumps, items),
+                "read json": perEntry(lambda d: cls.from_dict(json.loads(d)), asJson),
+                "read codec": perEntry(lambda d: codec.loads(d, cls), asBinary),
+            }
+            size = sum(map(len, asBinary)) / sum(len(d.encode()) for d in asJson)
+            print(
+                f"  {name:12} "
+                + "  ".join(f"{k} {us:7.1f} us" for k, us in results.items())
+                + f"  size {size:.0%} of json"
+            )
+            self.assertLess(results["write codec"], results["write json"])
+            self.assertLess(results["read codec"], results["read json"])
+
+    def test_round_trip(self):
+        data = song(1)
+        self.assertEqual(codecPath(data), data)
+        self.assertEqual(codecPath(SongData(id=SimpleIdentifier("x"))).id.id, "x")
+
+        info = playback(1)
+        decoded = codecPath(info)
+        self.assertIs(type(decoded), YoutubePlaybackData)
+        self.assertIs(type(decoded.formats[0]), YoutubeFormatData)
+        self.assertEqual(decoded, info)
+        # The JSON path only ever gave back the base classes
+        self.assertIs(type(jsonPath(info)), PlaybackData)
+
+        download = PlaybackData(id=SimpleIdentifier("x"), formats=[FormatData("f")])
+        self.assertEqual(codecPath(download), download)
+
+    def test_sections_stay_lazy(self):
+        data = SongData.from_dict(json.loads(cached(1)))
+        entry = codec.dumps(data)
+        decoded = codec.loads(entry, SongData)
+        raw = type(decoded).__dict__["microformat"].slot.__get__(decoded)
+        self.assertIsInstance(raw, str)
+        self.assertEqual(decoded.microformat, song(1).microformat)
+
+    def test_old_and_foreign_entries(self):
+        data = song(1)
+        oldEntry = json.dumps(data.as_dict())
+        self.assertEqual(codec.loads(oldEntry, SongData), data)
+        self.assertEqual(codec.loads(oldEntry.encode(), SongData), data)
+
+        entry = codec.dumps(data)
+        header = len(codec.HEADER)
+        otherVersion = codec.MAGIC + bytes((codec.VERSION + 1,)) + entry[5:]
+        self.assertIsNone(codec.loads(otherVersion, SongData))
+
+        tag, schema, values = marshal.loads(entry[header:])
+        changed = codec.HEADER + marshal.dumps((tag, schema + 1, values))
+        self.assertIsNone(codec.loads(changed, SongData))
+        self.assertIsNone(codec.loads(entry[:-10], SongData))
+        self.assertIsNone(codec.loads(entry, PlaybackData))
+
+        # Old JSON entries that can't be read are misses too
+        self.assertIsNone(codec.loads(oldEntry[:-10], SongData))
+        self.assertIsNone(codec.loads(b"\xff" + entry[1:], SongData))
+        self.assertIsNone(codec.loads("[]", SongData))
+        self.assertIsNone(codec.loads('{"title": "no id"}', SongData))
+        self.assertIsNone(codec.loads(json.dumps({"id": "x", "views": "a"}), SongData))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -57,6 +57,14 @@ class TestCacheManager(unittest.TestCase):
         self.assertEqual(value1, False)
         self.assertEqual(value2, "value8")
 
+    def test_get_many(self):
+        self.cache_manager.put("key9", "value9", False)
+        self.cache_manager.put("key10", b"value10", True)
+        self.cache_manager.put("key11", "value11", byte=False, expiration=1)
+        values = self.cache_manager.getMany(["key9", "key10", "key11", "key12"])
+        self.assertEqual(values, {"key9": "value9", "key10": b"value10"})
+        self.assertFalse(self.cache_manager.checkInCache("key11"))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,158 @@
+import time
+import unittest
+from unittest import mock
+
+from urllib3.exceptions import MaxRetryError
+
+from src.network import BudgetedRetry, CircuitBreaker, CircuitState, RetryBudget
+
+
+class FakeClock:
+    """Stands in for the time module in src.network; only monotonic() is faked"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+class FakeClockTestCase(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch("src.network.time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TestCircuitBreaker(FakeClockTestCase):
+    def setUp(self):
+        super().setUp()
+        self.changes: list[CircuitState] = []
+        self.breaker = CircuitBreaker(
+            "example.com",
+            on_state_change=lambda host, state: self.changes.append(state),
+            failure_threshold=3,
+            reset_timeout=10,
+            max_reset_timeout=35,
+        )
+
+    def trip(self):
+        for _ in range(self.breaker.failure_threshold):
+            self.breaker.record_failure()
+
+    def test_opens_after_threshold_failures(self):
+        for _ in range(2):
+            self.breaker.record_failure()
+        self.assertIs(self.breaker.state, CircuitState.CLOSED)
+        self.assertTrue(self.breaker.allow())
+
+        self.breaker.record_failure()
+        self.assertIs(self.breaker.state, CircuitState.OPEN)
+        self.assertFalse(self.breaker.allow())
+        self.assertEqual(self.changes, [CircuitState.OPEN])
+
+    def test_success_resets_the_failure_count(self):
+        for _ in range(2):
+            self.breaker.record_failure()
+        self.breaker.record_success()
+        for _ in range(2):
+            self.breaker.record_failure()
+        self.assertIs(self.breaker.state, CircuitState.CLOSED)
+
+    def test_lets_a_single_request_through_when_half_open(self):
+        self.trip()
+        self.clock.advance(9.9)
+        self.assertFalse(self.breaker.allow())
+
+        self.clock.advance(0.1)
+        self.assertTrue(self.breaker.allow())
+        self.assertIs(self.breaker.state, CircuitState.HALF_OPEN)
+        self.assertFalse(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+
+    def test_half_open_success_closes(self):
+        self.trip()
+        self.clock.advance(10)
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_success()
+
+        self.assertIs(self.breaker.state, CircuitState.CLOSED)
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.reset_timeout, 10)
+        self.assertEqual(
+            self.changes,
+            [CircuitState.OPEN, CircuitState.HALF_OPEN, CircuitState.CLOSED],
+        )
+
+    def test_half_open_failure_doubles_the_timeout_up_to_the_max(self):
+        self.trip()
+        self.clock.advance(10)
+        for expected in (20, 35, 35):
+            self.assertTrue(self.breaker.allow())
+            self.breaker.record_failure()
+            self.assertIs(self.breaker.state, CircuitState.OPEN)
+            self.assertEqual(self.breaker.reset_timeout, expected)
+            self.clock.advance(expected - 0.1)
+            self.assertFalse(self.breaker.allow())
+            self.clock.advance(0.1)
+
+        # Closing again starts over from the base timeout
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.reset_timeout, 10)
+
+
+class TestRetryBudget(FakeClockTestCase):
+    def test_runs_out_and_refills(self):
+        budget = RetryBudget(ratio=0.5, reserve_per_second=0.1, max_tokens=2)
+        self.assertTrue(budget.try_spend())
+        self.assertTrue(budget.try_spend())
+        self.assertFalse(budget.try_spend())
+        self.assertEqual(budget.denied, 1)
+
+        # Two requests' deposits pay for one retry
+        budget.deposit()
+        self.assertFalse(budget.try_spend())
+        budget.deposit()
+        self.assertTrue(budget.try_spend())
+
+        # And the reserve trickles in over time
+        self.clock.advance(9)
+        self.assertFalse(budget.try_spend())
+        self.clock.advance(1)
+        self.assertTrue(budget.try_spend())
+        self.assertEqual(budget.denied, 3)
+
+    def test_is_capped(self):
+        budget = RetryBudget(ratio=1, reserve_per_second=1, max_tokens=2)
+        for _ in range(5):
+            budget.deposit()
+        self.clock.advance(60)
+        spent = 0
+        while budget.try_spend():
+            spent += 1
+        self.assertEqual(spent, 2)
+
+
+class TestBudgetedRetry(FakeClockTestCase):
+    def test_stops_retrying_once_the_budget_is_spent(self):
+        class Retry(BudgetedRetry):
+            budget = RetryBudget(reserve_per_second=0, max_tokens=1)
+
+        retry = Retry(total=3).increment("GET", "/song")
+        self.assertEqual(retry.total, 2)
+        with self.assertRaises(MaxRetryError) as raised:
+            retry.increment("GET", "/song")
+        self.assertIn("retry budget exhausted", str(raised.exception.reason))
+        self.assertEqual(Retry.budget.denied, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import threading
+import time
+
+from src.network import ProgressAggregator
+
+CHUNK = 8192
+TOTAL = 256 * 1024 * 1024  # 256 MB, split across workers
+WORKERS = 4
+
+
+class ProgressReceiver:
+    """Stands in for Song, which turns every update into a percentage."""
+
+    def __init__(self):
+        self.calls = 0
+        self.last = 0
+        self.percent = 0
+
+    def update(self, current, total):
+        self.calls += 1
+        self.last = current
+        self.percent = int((current / total) * 100)
+
+
+def run_workers(target) -> float:
+    """Run `target(worker_index)` on WORKERS threads and return the CPU time used."""
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(WORKERS)]
+    start = time.process_time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.process_time() - start
+
+
+class TestDownloadProgressBenchmark(unittest.TestCase):
+    def setUp(self):
+        self.chunks_per_worker = TOTAL // CHUNK // WORKERS
+
+    def test_legacy_reporting(self):
+        """Per-chunk sum over every worker with a callback on each write (old behaviour)."""
+        receiver = ProgressReceiver()
+        progress = {i: 0 for i in range(WORKERS)}
+
+        def worker(index):
+            position = 0
+            for _ in range(self.chunks_per_worker):
+                position += CHUNK
+                progress[index] = position
+                receiver.update(sum(progress.values()), TOTAL)
+
+        cpu = run_workers(worker)
+        print(f"\nlegacy: {receiver.calls} callbacks, {cpu * 1000:.1f} ms CPU")
+        self.assertEqual(receiver.calls, self.chunks_per_worker * WORKERS)
+
+    def test_aggregated_reporting(self):
+        receiver = ProgressReceiver()
+        aggregator = ProgressAggregator(receiver.update, TOTAL, WORKERS, interval=0.05)
+
+        def worker(index):
+            for _ in range(self.chunks_per_worker):
+                aggregator.add(index, CHUNK)
+
+        cpu = run_workers(worker)
+        aggregator.finish()
+        print(f"\naggregated: {receiver.calls} callbacks, {cpu * 1000:.1f} ms CPU")
+        self.assertEqual(receiver.last, TOTAL)
+        self.assertLessEqual(receiver.calls, 102)  # at most one per percent, plus finish
+
+
+if __name__ == "__main__":
+    unittest.main()
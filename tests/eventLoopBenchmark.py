@@ -0,0 +1,89 @@
+"""
+Per-job overhead of running coroutine jobs with asyncio.run on pool threads
+(what JobRunnable used to do) versus handing them to one long-lived loop (what
+bgworker does now, through asyncBgworker's loop).
+
+Plain asyncio and threads only, so the numbers aren't mixed up with Qt.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+import unittest
+
+POOL_THREADS = 4
+TRIVIAL_JOBS = 2000
+IO_JOBS = 200
+IO_WAIT = 0.05
+
+
+async def trivial_job() -> int:
+    await asyncio.sleep(0)
+    return 1
+
+
+async def io_job() -> int:
+    await asyncio.sleep(IO_WAIT)
+    return 1
+
+
+class SharedLoop:
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    def submit(self, coro) -> concurrent.futures.Future:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+def per_job_loops(job, count: int) -> float:
+    with concurrent.futures.ThreadPoolExecutor(POOL_THREADS) as pool:
+        start = time.perf_counter()
+        futures = [pool.submit(asyncio.run, job()) for _ in range(count)]
+        assert sum(f.result() for f in futures) == count
+        return time.perf_counter() - start
+
+
+def shared_loop(job, count: int) -> float:
+    loop = SharedLoop()
+    try:
+        start = time.perf_counter()
+        futures = [loop.submit(job()) for _ in range(count)]
+        assert sum(f.result() for f in futures) == count
+        return time.perf_counter() - start
+    finally:
+        loop.close()
+
+
+class TestEventLoopBenchmark(unittest.TestCase):
+    def test_trivial_job_overhead(self):
+        legacy = per_job_loops(trivial_job, TRIVIAL_JOBS)
+        shared = shared_loop(trivial_job, TRIVIAL_JOBS)
+        print(
+            f"\n{TRIVIAL_JOBS} trivial jobs: asyncio.run per job "
+            f"{legacy / TRIVIAL_JOBS * 1e6:.1f} us/job, shared loop "
+            f"{shared / TRIVIAL_JOBS * 1e6:.1f} us/job"
+        )
+        self.assertLess(shared, legacy)
+
+    def test_io_bound_jobs(self):
+        # Each job holds its pool thread for the whole wait, the shared loop
+        # overlaps them all
+        legacy = per_job_loops(io_job, IO_JOBS)
+        shared = shared_loop(io_job, IO_JOBS)
+        print(
+            f"\n{IO_JOBS} jobs waiting {IO_WAIT * 1000:.0f} ms on {POOL_THREADS} "
+            f"threads: asyncio.run per job {legacy:.2f} s, shared loop {shared:.2f} s"
+        )
+        self.assertLess(shared, legacy)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import asyncio
+import unittest
+
+try:
+    from src.innertube.song.providers.hedging import Hedger
+except ImportError:  # the providers package needs the full set of dependencies
+    Hedger = None
+
+
+class Attempts:
+    """Factory for Hedger.run whose attempts only finish when the test says so"""
+
+    def __init__(self):
+        self.futures: list[asyncio.Future] = []
+        self.cancelled: list[int] = []
+
+    def __call__(self):
+        future = asyncio.get_running_loop().create_future()
+        self.futures.append(future)
+        index = len(self.futures) - 1
+
+        async def attempt():
+            try:
+                return await future
+            except asyncio.CancelledError:
+                self.cancelled.append(index)
+                raise
+
+        return attempt()
+
+    async def started(self, count: int):
+        while len(self.futures) < count:
+            await asyncio.sleep(0.005)
+
+
+def hedger(**kwargs) -> "Hedger":
+    return Hedger(default_delay=0.05, min_delay=0.01, **kwargs)
+
+
+@unittest.skipIf(Hedger is None, "providers can't be imported here")
+class TestHedger(unittest.IsolatedAsyncioTestCase):
+    async def test_fast_primary_is_not_hedged(self):
+        h, attempts = hedger(), Attempts()
+        task = asyncio.ensure_future(h.run("call", attempts))
+        await attempts.started(1)
+        attempts.futures[0].set_result("primary")
+
+        self.assertEqual(await task, "primary")
+        self.assertEqual(len(attempts.futures), 1)
+        self.assertEqual(h.statistics["call"].hedged, 0)
+
+    async def test_primary_wins_after_hedging(self):
+        h, attempts = hedger(), Attempts()
+        task = asyncio.ensure_future(h.run("call", attempts))
+        await attempts.started(2)
+        attempts.futures[0].set_result("primary")
+
+        self.assertEqual(await task, "primary")
+        await asyncio.sleep(0)
+        self.assertEqual(attempts.cancelled, [1])
+        self.assertEqual(h.statistics["call"].primary_wins, 1)
+
+    async def test_hedge_wins(self):
+        h, attempts = hedger(), Attempts()
+        task = asyncio.ensure_future(h.run("call", attempts))
+        await attempts.started(2)
+        attempts.futures[1].set_result("hedge")
+
+        self.assertEqual(await task, "hedge")
+        await asyncio.sleep(0)
+        self.assertEqual(attempts.cancelled, [0])
+        stats = h.statistics["call"]
+        self.assertEqual((stats.hedged, stats.hedge_wins), (1, 1))
+
+    async def test_failed_primary_falls_back_to_hedge(self):
+        h, attempts = hedger(), Attempts()
+        task = asyncio.ensure_future(h.run("call", attempts))
+        await attempts.started(2)
+        attempts.futures[0].set_exception(ConnectionError("primary"))
+        await asyncio.sleep(0.01)
+        self.assertFalse(task.done())
+        attempts.futures[1].set_result("hedge")
+
+        self.assertEqual(await task, "hedge")
+        self.assertEqual(h.statistics["call"].hedge_wins, 1)
+
+    async def test_both_failing_raises(self):
+        h, attempts = hedger(), Attempts()
+        task = asyncio.ensure_future(h.run("call", attempts))
+        await attempts.started(2)
+        attempts.futures[0].set_exception(ConnectionError("primary"))
+        attempts.futures[1].set_exception(ConnectionError("hedge"))
+
+        with self.assertRaises(ConnectionError):
+            await task
+        stats = h.statistics["call"]
+        self.assertEqual((stats.primary_wins, stats.hedge_wins), (0, 0))
+
+    async def test_no_budget_means_no_hedge(self):
+        h, attempts = hedger(max_budget=0), Attempts()
+        task = asyncio.ensure_future(h.run("call", attempts))
+        await asyncio.sleep(0.15)
+        self.assertEqual(len(attempts.futures), 1)
+        attempts.futures[0].set_result("primary")
+
+        self.assertEqual(await task, "primary")
+        stats = h.statistics["call"]
+        self.assertEqual((stats.hedged, stats.budget_denied), (0, 1))
+
+    async def test_cancelling_the_call_cancels_both_attempts(self):
+        h, attempts = hedger(), Attempts()
+        task = asyncio.ensure_future(h.run("call", attempts))
+        await attempts.started(2)
+        task.cancel()
+
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0)
+        self.assertEqual(sorted(attempts.cancelled), [0, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
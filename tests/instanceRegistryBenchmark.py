@@ -0,0 +1,215 @@
+"""
+Memory retained by 50k Song-like objects with the old registry (a plain dict,
+a logger per instance, a lambda connected to the object's own signal) versus
+InstanceRegistry. The stand-in mirrors what Song.__init__ allocates, real Songs
+are measured too where the song package can be imported.
+"""
+
+import gc
+import logging
+import os
+import threading
+import time
+import tracemalloc
+import unittest
+from dataclasses import dataclass
+
+from PySide6.QtCore import QObject, Signal
+
+from src.misc.instanceRegistry import InstanceRegistry, InstanceLogger
+from src.workers import bgworker
+
+SONGS = 50_000
+KEEP = 512
+
+
+@dataclass
+class Placeholder:
+    id: str
+    title: str = "Loading..."
+    artist: str = "Loading..."
+    duration: int = 0
+
+
+class LegacySong(QObject):
+    dataStatusChanged = Signal(int)
+    downloadStateChanged = Signal(int)
+    playbackReadyChanged = Signal(bool)
+    songInfoFetched = Signal()
+
+    _instances: dict[str, "LegacySong"] = {}
+
+    def __new__(cls, id: str):
+        if id in cls._instances:
+            return cls._instances[id]
+        instance = super().__new__(cls)
+        cls._instances[id] = instance
+        return instance
+
+    def __init__(self, id: str):
+        if hasattr(self, "_initialized"):
+            return
+        self._initialized = True
+        super().__init__()
+        self.logger = logging.getLogger(f"LegacySong.{id}")
+        self.downloadStateChanged.connect(lambda: self.check())
+        self.data = Placeholder(id)
+
+    def check(self):
+        pass
+
+
+class RegisteredSong(QObject):
+    dataStatusChanged = Signal(int)
+    downloadStateChanged = Signal(int)
+    playbackReadyChanged = Signal(bool)
+    songInfoFetched = Signal()
+
+    _registry: InstanceRegistry[str, "RegisteredSong"] = InstanceRegistry(
+        "RegisteredSong", keep=KEEP
+    )
+
+    def __new__(cls, id: str):
+        return cls._registry.getOrCreate(
+            id, lambda: super(RegisteredSong, cls).__new__(cls)
+        )
+
+    @_registry.initOnce
+    def __init__(self, id: str):
+        super().__init__()
+        self.logger = InstanceLogger(logging.getLogger("RegisteredSong"), id)
+        self.downloadStateChanged.connect(self._onDownloadStateChanged)
+        self.data = Placeholder(id)
+
+    def _onDownloadStateChanged(self, state: int):
+        pass
+
+
+def rss() -> int:
+    """Resident set size in bytes, 0 where /proc isn't available"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def retained(create, ids) -> tuple[int, int, int]:
+    """Create an object per id, drop them all, and return the Python heap and
+    RSS growth that's left, plus the peak Python heap growth"""
+    gc.collect()
+    rss_before = rss()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [create(i) for i in ids]
+    peak = tracemalloc.get_traced_memory()[0] - before
+    del objects
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return after, rss() - rss_before, peak
+
+
+def mb(n: int) -> str:
+    return f"{n / 1e6:7.1f} MB"
+
+
+class TestInstanceRegistryBenchmark(unittest.TestCase):
+    def test_retained_memory(self):
+        legacy, legacy_rss, legacy_peak = retained(
+            LegacySong, [f"legacy{i}" for i in range(SONGS)]
+        )
+        weak, weak_rss, weak_peak = retained(
+            RegisteredSong, [f"weak{i}" for i in range(SONGS)]
+        )
+        print(
+            f"\n{SONGS} songs, retained after release:\n"
+            f"  dict registry:     heap {mb(legacy)} (peak {mb(legacy_peak)}), "
+            f"RSS {mb(legacy_rss)}, {len(LegacySong._instances)} alive\n"
+            f"  InstanceRegistry:  heap {mb(weak)} (peak {mb(weak_peak)}), "
+            f"RSS {mb(weak_rss)}, {len(RegisteredSong._registry)} alive"
+        )
+        self.assertEqual(len(LegacySong._instances), SONGS)
+        self.assertEqual(len(RegisteredSong._registry), KEEP)
+        self.assertLess(weak * 10, legacy)
+
+    def test_recently_used_survive(self):
+        registry: InstanceRegistry[str, QObject] = InstanceRegistry("test", keep=2)
+        first = id(registry.getOrCreate("a", QObject))
+        registry.getOrCreate("b", QObject)
+        gc.collect()
+        self.assertEqual(id(registry.getOrCreate("a", QObject)), first)
+
+        registry.getOrCreate("c", QObject)  # pushes "b" out of the LRU
+        gc.collect()
+        self.assertNotIn("b", registry)
+        self.assertEqual(
+            registry.getStatistics(), {"hits": 1, "misses": 3, "live": 2, "pinned": 2}
+        )
+
+    def test_concurrent_creation(self):
+        inits = []
+        lock = threading.Lock()
+
+        class Slow(QObject):
+            _registry: InstanceRegistry[int, "Slow"] = InstanceRegistry("Slow")
+
+            def __new__(cls, id: int):
+                return cls._registry.getOrCreate(
+                    id, lambda: super(Slow, cls).__new__(cls)
+                )
+
+            @_registry.initOnce
+            def __init__(self, id: int):
+                super().__init__()
+                time.sleep(0.001)
+                with lock:
+                    inits.append(id)
+                self.id = id
+
+        results: list[list[Slow]] = [[] for _ in range(8)]
+        barrier = threading.Barrier(8)
+
+        def create(n):
+            barrier.wait()
+            results[n] = [Slow(i) for i in range(50)]
+
+        threads = [threading.Thread(target=create, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(sorted(inits), list(range(50)))
+        for created in results:
+            self.assertEqual([s.id for s in created], list(range(50)))
+            self.assertTrue(all(a is b for a, b in zip(created, results[0])))
+
+
+try:
+    from src.innertube.song import Song
+except ImportError:  # the song package needs the full set of dependencies
+    Song = None
+
+
+@unittest.skipIf(Song is None, "song package can't be imported here")
+class TestSongRegistry(unittest.TestCase):
+    def test_songs_are_released(self):
+        bgworker.start()
+        ids = [f"youtube:song:bench{i:06d}" for i in range(SONGS)]
+        songs = [Song(i) for i in ids]
+        self.assertIs(Song(ids[0]), songs[0])
+        del songs
+        # Each new song queues a lazy init job that holds it until it runs
+        deadline = time.monotonic() + 120
+        while bgworker.getMetrics()["pending"]:
+            if time.monotonic() > deadline:
+                break
+            time.sleep(0.1)
+        gc.collect()
+        print(f"\n{SONGS} Songs: {Song._registry.getStatistics()}")
+        self.assertLessEqual(len(Song._registry), KEEP)
+
+
+if __name__ == "__main__":
+    unittest.main()
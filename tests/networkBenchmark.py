@@ -0,0 +1,281 @@
+"""
+Network download benchmarks against a local stand-in for the media CDN.
+
+The server runs in a subprocess (so its CPU time isn't counted against the
+client) and serves a synthetic audio file. Behaviour is chosen per request with
+query parameters:
+
+    latency=<s>        delay before the response headers
+    bandwidth=<B/s>    per-connection transfer rate
+    ranges=0           ignore Range headers and always send the whole file
+    fail_first=<n>     answer the first n requests for this URL with a 503
+    drop_after=<B>     close the first connection for this URL after B bytes
+
+Run with `python -m pytest -s tests/networkBenchmark.py` to see the report.
+"""
+
+import asyncio
+import hashlib
+import http.server
+import io
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+import urllib.parse
+
+FILE_SIZE = 24 * 1024 * 1024  # about the size of a long song in high quality
+FILE_NAME = "audio.webm"
+
+
+def synthetic_audio(size: int, seed: int = 1234) -> bytes:
+    return random.Random(seed).randbytes(size)
+
+
+class StandInHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    data = b""
+    counters: dict[str, int] = {}
+    counters_lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        self.respond(head=True)
+
+    def do_GET(self):
+        self.respond(head=False)
+
+    def respond(self, head: bool):
+        parsed = urllib.parse.urlparse(self.path)
+        options = {k: v[0] for k, v in urllib.parse.parse_qs(parsed.query).items()}
+        with self.counters_lock:
+            seen = self.counters.get(self.path, 0)
+            self.counters[self.path] = seen + 1
+
+        time.sleep(float(options.get("latency", 0)))
+        if parsed.path != "/" + FILE_NAME:
+            self.send_error(404)
+            return
+        if seen < int(options.get("fail_first", 0)):
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        start, end = 0, len(self.data) - 1
+        range_header = self.headers.get("Range")
+        partial = bool(range_header) and options.get("ranges", "1") != "0"
+        if partial:
+            first, _, last = range_header.removeprefix("bytes=").partition("-")  # type: ignore[union-attr]
+            start = int(first)
+            end = min(int(last), end) if last else end
+            if start > end:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(self.data)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+        self.send_response(206 if partial else 200)
+        self.send_header("Content-Type", "audio/webm")
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(end - start + 1))
+        if partial:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(self.data)}")
+        self.end_headers()
+        if head:
+            return
+
+        bandwidth = float(options.get("bandwidth", 0))
+        drop_after = int(options.get("drop_after", -1)) if seen == 0 else -1
+        sent = 0
+        began = time.monotonic()
+        view = memoryview(self.data)[start : end + 1]
+        for offset in range(0, len(view), 64 * 1024):
+            block = view[offset : offset + 64 * 1024]
+            if 0 <= drop_after < sent + len(block):
+                self.wfile.write(block[: max(0, drop_after - sent)])
+                self.close_connection = True
+                self.connection.shutdown(2)
+                return
+            self.wfile.write(block)
+            sent += len(block)
+            if bandwidth:
+                ahead = sent / bandwidth - (time.monotonic() - began)
+                if ahead > 0:
+                    time.sleep(ahead)
+
+
+class StandInServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients hanging up mid-body is expected (cancelled chunks, aborted
+        # parallel downloads), don't print a traceback for it
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def serve() -> None:
+    """Entry point of the server subprocess. Prints the port, then serves forever."""
+    StandInHandler.data = synthetic_audio(FILE_SIZE)
+    server = StandInServer(("127.0.0.1", 0), StandInHandler)
+    print(server.server_port, flush=True)
+    server.serve_forever()
+
+
+class TestNetworkBenchmark(unittest.TestCase):
+    server: subprocess.Popen
+    base_url: str
+    expected: str
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--serve"],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        port = int(cls.server.stdout.readline())  # type: ignore[union-attr]
+        cls.base_url = f"http://127.0.0.1:{port}/{FILE_NAME}"
+        cls.expected = hashlib.sha256(synthetic_audio(FILE_SIZE)).hexdigest()
+
+        from src.network import networkManager
+
+        cls.network = networkManager
+        cls.results: list[str] = []
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.terminate()
+        cls.server.wait()
+        print("\n" + "\n".join(cls.results))
+
+    def setUp(self):
+        # Failures injected by one scenario shouldn't trip the breaker for the next
+        self.network.breakers.clear()
+        self.file = tempfile.TemporaryFile()
+
+    def tearDown(self):
+        self.file.close()
+
+    def url(self, scenario: str, **options) -> str:
+        options["scenario"] = f"{scenario}-{time.monotonic_ns()}"  # fresh counters
+        return f"{self.base_url}?{urllib.parse.urlencode(options)}"
+
+    def checksum(self) -> str:
+        self.file.seek(0)
+        return hashlib.sha256(self.file.read()).hexdigest()
+
+    def measure(self, name: str, download, resumed_from: int = 0) -> bool:
+        wall, cpu = time.perf_counter(), time.process_time()
+        ok = download()
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        megabytes = (FILE_SIZE - resumed_from) / (1024 * 1024)
+        correct = ok and self.checksum() == self.expected
+        self.results.append(
+            f"{name:<34} {megabytes / wall:8.1f} MB/s {cpu / megabytes * 1000:7.2f} ms CPU/MB"
+            f"  {'ok' if correct else 'CORRUPT' if ok else 'failed'}"
+        )
+        return ok
+
+    def parallel(self, url: str, **kwargs) -> bool:
+        return asyncio.run(
+            self.network.download_file_parallel(
+                url, self.file, chunk_size=4 * 1024 * 1024, **kwargs
+            )
+        )
+
+    def prefill(self, fraction: float) -> int:
+        """Write the first part of the file, as an interrupted download would"""
+        size = int(FILE_SIZE * fraction)
+        self.file.write(synthetic_audio(FILE_SIZE)[:size])
+        return size
+
+    def test_single(self):
+        url = self.url("single")
+        self.assertTrue(
+            self.measure("single", lambda: self.network.download_file(url, self.file))
+        )
+        self.assertEqual(self.checksum(), self.expected)
+
+    def test_single_throttled(self):
+        url = self.url("single-throttled", bandwidth=8 * 1024 * 1024, latency=0.05)
+        self.measure(
+            "single, 8 MB/s per connection",
+            lambda: self.network.download_file(url, self.file),
+        )
+        self.assertEqual(self.checksum(), self.expected)
+
+    def test_parallel(self):
+        url = self.url("parallel")
+        self.assertTrue(self.measure("parallel", lambda: self.parallel(url)))
+        self.assertEqual(self.checksum(), self.expected)
+
+    def test_parallel_throttled(self):
+        url = self.url("parallel-throttled", bandwidth=8 * 1024 * 1024, latency=0.05)
+        self.measure(
+            "parallel, 8 MB/s per connection", lambda: self.parallel(url)
+        )
+        self.assertEqual(self.checksum(), self.expected)
+
+    def test_resumed_single(self):
+        start = self.prefill(0.4)
+        url = self.url("resumed-single")
+        self.measure(
+            "resumed single (from 40%)",
+            lambda: self.network.download_file(url, self.file, start=start),
+            start,
+        )
+        self.assertEqual(self.checksum(), self.expected)
+
+    def test_resumed_parallel(self):
+        start = self.prefill(0.4)
+        url = self.url("resumed-parallel")
+        self.measure(
+            "resumed parallel (from 40%)",
+            lambda: self.parallel(url, headers={"Range": f"bytes={start}-"}),
+            start,
+        )
+        self.assertEqual(self.checksum(), self.expected)
+
+    def test_resumed_without_range_support(self):
+        start = self.prefill(0.4)
+        url = self.url("no-ranges", ranges=0)
+        # Parallel can't work without ranges and must say so instead of
+        # writing whole copies of the file at each chunk offset
+        self.assertFalse(self.parallel(url, headers={"Range": f"bytes={start}-"}))
+        self.measure(
+            "resume, server ignores Range",
+            lambda: self.network.download_file(url, self.file, start=start),
+        )
+        self.assertEqual(self.checksum(), self.expected)
+
+    def test_transient_errors(self):
+        url = self.url("transient", fail_first=2)
+        self.measure("parallel, first 2 requests 503", lambda: self.parallel(url))
+        self.assertEqual(self.checksum(), self.expected)
+
+    def test_dropped_connection(self):
+        url = self.url("dropped", drop_after=FILE_SIZE // 3)
+        self.assertFalse(self.network.download_file(url, self.file, start=0))
+        written = self.file.seek(0, io.SEEK_END)
+        self.measure(
+            "resume after dropped connection",
+            lambda: self.network.download_file(url, self.file, start=written),
+            written,
+        )
+        self.assertEqual(self.checksum(), self.expected)
+
+
+if __name__ == "__main__":
+    if "--serve" in sys.argv:
+        serve()
+    else:
+        unittest.main()
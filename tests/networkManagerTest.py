@@ -0,0 +1,181 @@
+import http.server
+import threading
+import time
+import unittest
+from unittest import mock
+
+from src.misc.enumerations.Network import CircuitState, OnlineStatus
+from src.network import TokenBucket, networkManager
+
+
+class CountingHandler(http.server.BaseHTTPRequestHandler):
+    """Answers every GET with its path after `latency` seconds, counting hits.
+    Paths containing "cacheable" are fresh for a minute, "vary" adds a Vary header
+    """
+
+    protocol_version = "HTTP/1.1"
+    latency = 0.2
+    hits: dict[str, int] = {}
+    hits_lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        self.send_response(204)
+        self.end_headers()
+
+    def do_GET(self):
+        with self.hits_lock:
+            self.hits[self.path] = self.hits.get(self.path, 0) + 1
+        time.sleep(self.latency)
+        body = self.path.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        if "cacheable" in self.path:
+            self.send_header("Cache-Control", "max-age=60")
+        if "vary" in self.path:
+            self.send_header("Vary", "Accept-Encoding")
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestNetworkManager(unittest.TestCase):
+    server: http.server.ThreadingHTTPServer
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), CountingHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        networkManager.breakers.clear()
+
+    def path(self, name: str) -> str:
+        return f"/{name}-{time.monotonic_ns()}"  # never cached or memoised before
+
+    def test_concurrent_identical_gets_are_coalesced(self):
+        path = self.path("coalesce")
+        callers = 8
+        barrier = threading.Barrier(callers)
+        bodies: list = [None] * callers
+
+        def fetch(i: int):
+            barrier.wait()
+            response = networkManager.get(self.base_url + path)
+            bodies[i] = response.content if response is not None else None
+
+        threads = [threading.Thread(target=fetch, args=(i,)) for i in range(callers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        self.assertEqual(CountingHandler.hits[path], 1)
+        self.assertEqual(bodies, [path.encode()] * callers)
+
+    def test_uncoalesced_gets_each_hit_the_network(self):
+        path = self.path("uncoalesced")
+        for _ in range(2):
+            networkManager.get(self.base_url + path, coalesce=False)
+        self.assertEqual(CountingHandler.hits[path], 2)
+
+    def fetch_twice(self, path: str, **kwargs) -> int:
+        """GET a path twice without coalescing; returns how often the server saw it"""
+        for _ in range(2):
+            response = networkManager.get(
+                self.base_url + path, coalesce=False, **kwargs
+            )
+            self.assertEqual(response.content, path.encode())
+        return CountingHandler.hits[path]
+
+    def test_http_cache_is_opt_in(self):
+        self.assertEqual(self.fetch_twice(self.path("cacheable")), 2)
+        self.assertEqual(self.fetch_twice(self.path("cacheable"), cache=True), 1)
+
+    def test_http_cache_skips_vary_and_credentials(self):
+        self.assertEqual(self.fetch_twice(self.path("cacheable-vary"), cache=True), 2)
+        path = self.path("cacheable-credentials")
+        self.assertEqual(
+            self.fetch_twice(path, headers={"Authorization": "Bearer x"}, cache=True), 2
+        )
+
+    def test_probes_recover_from_offline_with_open_circuits(self):
+        monitor = networkManager.connectivity
+        # Stand-ins for the probe hosts, both reachable again
+        probe_urls = {
+            "internet": f"{self.base_url}/generate_204",
+            "youtube": f"http://localhost:{self.server.server_port}/",
+        }
+        for host in ("127.0.0.1", "localhost"):
+            breaker = networkManager.breaker_for(host)
+            for _ in range(breaker.failure_threshold):
+                breaker.record_failure()
+            self.assertFalse(breaker.allow())
+        for _ in range(monitor.offline_after_failures):
+            monitor.record("127.0.0.1", False)
+        self.assertIs(networkManager.onlineStatus, OnlineStatus.OFFLINE)
+
+        before = monitor.last_traffic
+        with mock.patch.object(monitor, "PROBE_URLS", probe_urls):
+            status = monitor.probe()
+
+        self.assertIs(status, OnlineStatus.ONLINE)
+        self.assertGreater(monitor.last_traffic, before)
+        for host in ("127.0.0.1", "localhost"):
+            self.assertIs(networkManager.breakers[host].state, CircuitState.CLOSED)
+
+
+class TestTokenBucket(unittest.TestCase):
+    RATE = 100_000
+    BURST = 10_000
+
+    def drain(self, bucket: TokenBucket, total: int, chunk: int = 8192):
+        for _ in range(total // chunk):
+            bucket.consume(chunk)
+
+    def test_consume_keeps_to_the_rate(self):
+        bucket = TokenBucket(self.RATE, self.BURST)
+        total = 8192 * 8
+        begin = time.monotonic()
+        self.drain(bucket, total)
+        elapsed = time.monotonic() - begin
+
+        expected = (total - self.BURST) / self.RATE
+        self.assertGreaterEqual(elapsed, expected * 0.95)
+        self.assertLess(elapsed, expected + 0.15)
+
+    def test_concurrent_readers_share_the_rate(self):
+        bucket = TokenBucket(self.RATE, self.BURST)
+        total = 8192 * 4
+        threads = [
+            threading.Thread(target=self.drain, args=(bucket, total)) for _ in range(2)
+        ]
+        begin = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+        elapsed = time.monotonic() - begin
+
+        expected = (total * 2 - self.BURST) / self.RATE
+        self.assertGreaterEqual(elapsed, expected * 0.95)
+        self.assertLess(elapsed, expected + 0.15)
+
+    def test_zero_rate_is_unlimited(self):
+        bucket = TokenBucket(0)
+        begin = time.monotonic()
+        self.drain(bucket, 10**9, chunk=10**6)
+        self.assertLess(time.monotonic() - begin, 0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+"""
+UI frame stalls while CPU-bound work runs on bgworker-style threads versus in
+ProcessPool. A ticker thread stands in for the UI thread: it wants to run every
+16 ms, and anything it loses to the GIL shows up as late frames.
+"""
+
+import concurrent.futures
+import os
+import random
+import statistics
+import threading
+import time
+import unittest
+
+from src.workers import ProcessPool
+
+FRAME = 1 / 60
+TASKS = 8
+PIXELS = 150_000
+
+
+def quantizeTask(seed: int) -> int:
+    """Pure-Python stand-in for colour quantization: bucket every pixel of a
+    random image and pick the most common bucket"""
+    rng = random.Random(seed)
+    counts: dict[int, int] = {}
+    for _ in range(PIXELS):
+        r, g, b = rng.randrange(256), rng.randrange(256), rng.randrange(256)
+        key = (r >> 3) << 10 | (g >> 3) << 5 | b >> 3
+        counts[key] = counts.get(key, 0) + 1
+    return max(counts, key=counts.__getitem__)
+
+
+def crash() -> None:
+    os._exit(1)
+
+
+class FrameClock(threading.Thread):
+    """Ticks every frame and records how late each tick was"""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.stalls: list[float] = []
+        self.stop = threading.Event()
+
+    def run(self):
+        deadline = time.perf_counter() + FRAME
+        while not self.stop.is_set():
+            time.sleep(max(0.0, deadline - time.perf_counter()))
+            now = time.perf_counter()
+            self.stalls.append(now - deadline)
+            deadline = max(deadline + FRAME, now)
+
+    def report(self) -> str:
+        late = sorted(self.stalls)
+        dropped = sum(s > FRAME for s in late)
+        return (
+            f"p50 {statistics.median(late) * 1000:6.2f} ms, "
+            f"max {late[-1] * 1000:7.2f} ms late, {dropped}/{len(late)} frames dropped"
+        )
+
+
+def measure(run) -> tuple[FrameClock, list[int]]:
+    clock = FrameClock()
+    clock.start()
+    try:
+        results = run()
+    finally:
+        clock.stop.set()
+        clock.join()
+    return clock, results
+
+
+class TestProcessPoolBenchmark(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = ProcessPool()
+        cls.pool.start()
+        # Wait until the workers are up so startup isn't measured
+        cls.pool.submit(quantizeTask, 0).result(timeout=60)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+
+    def test_frame_stalls(self):
+        def on_threads():
+            with concurrent.futures.ThreadPoolExecutor(4) as threads:
+                return list(threads.map(quantizeTask, range(TASKS)))
+
+        def in_processes():
+            futures = [self.pool.submit(quantizeTask, i) for i in range(TASKS)]
+            return [f.result(timeout=60) for f in futures]
+
+        threaded, expected = measure(on_threads)
+        offloaded, results = measure(in_processes)
+        print(f"\n{TASKS} tasks on threads:    {threaded.report()}")
+        print(f"{TASKS} tasks in processes: {offloaded.report()}")
+
+        self.assertEqual(results, expected)
+        self.assertLess(
+            statistics.median(offloaded.stalls), statistics.median(threaded.stalls)
+        )
+
+    def test_warm_start(self):
+        pids = {
+            self.pool.submit(os.getpid).result(timeout=10)
+            for _ in range(self.pool.max_workers * 4)
+        }
+        self.assertNotIn(os.getpid(), pids)
+        self.assertLessEqual(len(pids), self.pool.max_workers)
+
+    def test_restarts_after_a_worker_dies(self):
+        before = self.pool.getStatistics()
+        with self.assertRaises(concurrent.futures.process.BrokenProcessPool):
+            self.pool.submit(crash).result(timeout=10)
+        result = self.pool.submit(quantizeTask, 1).result(timeout=60)
+        self.assertEqual(result, quantizeTask(1))
+        after = self.pool.getStatistics()
+        self.assertEqual(after["restarts"] - before["restarts"], 1)
+        self.assertGreaterEqual(after["failed"] - before["failed"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+QueueModel.data over a 5k song queue: SongData fields read through the old
+Song.__getattribute__ override (which built a SongData and its as_dict on every
+attribute lookup) against the properties generated for them on Song.
+"""
+
+import dataclasses
+import operator
+import time
+import unittest
+
+from PySide6.QtCore import QObject, Qt
+
+try:
+    from src.innertube.song import Song
+    from src.playback.queuemanager import QueueModel
+except ImportError:  # the player needs the full set of dependencies
+    QueueModel = None
+
+SONGS = 5_000
+FIELDS = (
+    "id source title duration author artist channel channelId artistId thumbnails"
+    " smallestThumbnail largestThumbnail smallestThumbnailUrl largestThumbnailUrl"
+    " rectangleThumbnail rectangleThumbnailUrl fullUrl description tags views"
+    " isFamilySafe allowRatings pageOwnerDetails pageOwnerName pageOwnerChannelId"
+    " uploadDate publishDate uploadDateTimestamp publishDateTimestamp category"
+    " playabilityStatus playbackTracking videoDetails microformat extra"
+).split()
+# Stands in for SongData, same fields
+Data = dataclasses.make_dataclass(
+    "Data", [(name, object, dataclasses.field(default=None)) for name in FIELDS]
+)
+
+
+class LegacySong(QObject):
+    def __init__(self, i: int):
+        super().__init__()
+        self.nsid = f"youtube:song{i:05d}"
+        self.data = Data(id=f"song{i:05d}", title=f"Song {i}", artist="Artist")
+
+    def __getattribute__(self, name):
+        if name in dataclasses.asdict(Data("null")).keys():
+            return getattr(super().__getattribute__("data"), name)
+        else:
+            return super().__getattribute__(name)
+
+
+class FastSong(QObject):
+    def __init__(self, i: int):
+        super().__init__()
+        self.nsid = f"youtube:song{i:05d}"
+        self.data = Data(id=f"song{i:05d}", title=f"Song {i}", artist="Artist")
+
+
+for _name in FIELDS:
+    setattr(FastSong, _name, property(operator.attrgetter(f"data.{_name}")))
+
+
+def rowData(song) -> tuple:
+    """What QueueModel.data reads off a song for one row's roles"""
+    return song.title, song.artist, song.duration, str(song.nsid)
+
+
+def perRow(function, songs) -> float:
+    """Microseconds per row"""
+    begin = time.perf_counter()
+    for song in songs:
+        function(song)
+    return (time.perf_counter() - begin) * 1e6 / len(songs)
+
+
+class TestQueueModelBenchmark(unittest.TestCase):
+    def test_attribute_access(self):
+        legacy = perRow(rowData, [LegacySong(i) for i in range(SONGS)])
+        fast = perRow(rowData, [FastSong(i) for i in range(SONGS)])
+        print(
+            f"\n{SONGS} rows, per row:\n"
+            f"  __getattribute__:     {legacy:7.2f} us\n"
+            f"  generated properties: {fast:7.2f} us"
+        )
+        self.assertEqual(rowData(LegacySong(1)), rowData(FastSong(1)))
+        self.assertLess(fast, legacy)
+
+
+@unittest.skipIf(QueueModel is None, "player can't be imported here")
+class TestSongQueueModel(unittest.TestCase):
+    def test_data(self):
+        songs = [Song(f"youtube:song:queue{i:05d}") for i in range(SONGS)]
+        model = QueueModel()
+        model.setQueue(songs)
+        roles = list(model.roleNames())
+        indexes = [model.index(row) for row in range(SONGS)]
+
+        begin = time.perf_counter()
+        for index in indexes:
+            for role in roles:
+                model.data(index, role)
+        elapsed = time.perf_counter() - begin
+        print(f"\n{SONGS} rows, {len(roles)} roles: {elapsed * 1000:.1f} ms")
+
+        title = model.data(indexes[1], Qt.ItemDataRole.DisplayRole)
+        self.assertEqual(title, songs[1].data.title)
+        # Song's own id wins over SongData's
+        self.assertEqual(songs[1].id, str(songs[1].nsid))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+"""
+Restoring a 500 song queue: time until every song's download and cache checks
+have been applied, one bgworker job per song (the old Song._lazy_init) against
+Batcher with one datastore listing and one cache read.
+"""
+
+import asyncio
+import tempfile
+import threading
+import time
+import unittest
+
+from src.cacheManager import CacheManager, DataStore
+from src.misc.enumerations import DataStatus
+from src.workers import Batcher, bgworker
+
+try:
+    from src.innertube.song import Song
+except ImportError:  # the song package needs the full set of dependencies
+    Song = None
+
+SONGS = 500
+
+
+class FakeSong:
+    """What Song's lazy init touches"""
+
+    def __init__(self, i: int):
+        self.downloadIdentifier = f"song{i:05d}"
+        self.songInfoIdentifier = f"song{i:05d}_info"
+        self.downloaded = False
+        self.info = None
+
+
+class TestQueueRestoreBenchmark(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        bgworker.start()
+        # CacheManager takes the thread's event loop, earlier tests close theirs
+        asyncio.set_event_loop(asyncio.new_event_loop())
+        cls.cacheDir = tempfile.TemporaryDirectory()
+        cls.storeDir = tempfile.TemporaryDirectory()
+        cls.cache = CacheManager("queueRestoreBenchmark", cls.cacheDir.name)
+        cls.store = DataStore("queueRestoreBenchmark", cls.storeDir.name)
+        for i in range(SONGS):
+            song = FakeSong(i)
+            cls.cache.put(song.songInfoIdentifier, b"\0" * 2048, byte=True)
+            if i % 2:
+                cls.store.write_file(song.downloadIdentifier, b"\0", ext="opus")
+
+    @classmethod
+    def tearDownClass(cls):
+        bgworker.shutdown()
+        asyncio.get_event_loop().close()
+        cls.cacheDir.cleanup()
+        cls.storeDir.cleanup()
+
+    def perSong(self, songs: list[FakeSong]) -> None:
+        done = threading.Semaphore(0)
+
+        def lazyInit(song: FakeSong):
+            song.downloaded = self.store.checkFileExists(song.downloadIdentifier)
+            song.info = self.cache.get(song.songInfoIdentifier)
+            done.release()
+
+        for song in songs:
+            bgworker.addJob(lambda song=song: lazyInit(song))
+        for _ in songs:
+            done.acquire(timeout=10)
+
+    def batched(self, songs: list[FakeSong]) -> int:
+        done = threading.Event()
+        batches = []
+
+        def lazyInit(batch: list[FakeSong]):
+            batches.append(len(batch))
+            downloaded = self.store.checkFilesExist(s.downloadIdentifier for s in batch)
+            cached = self.cache.getMany(s.songInfoIdentifier for s in batch)
+            for song in batch:
+                song.downloaded = song.downloadIdentifier in downloaded
+                song.info = cached.get(song.songInfoIdentifier)
+            if sum(batches) == len(songs):
+                done.set()
+
+        batcher = Batcher(lazyInit)
+        for song in songs:
+            batcher.add(song)
+        done.wait(10)
+        return len(batches)
+
+    def test_restore(self):
+        legacy = [FakeSong(i) for i in range(SONGS)]
+        begin = time.perf_counter()
+        self.perSong(legacy)
+        legacyTime = time.perf_counter() - begin
+
+        songs = [FakeSong(i) for i in range(SONGS)]
+        begin = time.perf_counter()
+        batches = self.batched(songs)
+        batchedTime = time.perf_counter() - begin
+
+        print(
+            f"\n{SONGS} songs restored:\n"
+            f"  job per song: {legacyTime * 1000:6.1f} ms, {SONGS} jobs\n"
+            f"  batched:      {batchedTime * 1000:6.1f} ms, {batches} jobs"
+        )
+        for old, new in zip(legacy, songs):
+            self.assertEqual((old.downloaded, old.info), (new.downloaded, new.info))
+        self.assertEqual(sum(song.downloaded for song in songs), SONGS // 2)
+        self.assertLess(batchedTime, legacyTime)
+
+    def test_batches(self):
+        seen: list[list[int]] = []
+        done = threading.Event()
+
+        def collect(items):
+            seen.append(items)
+            if sum(map(len, seen)) == 400:
+                done.set()
+
+        batcher = Batcher(collect, window=0.05)
+        threads = [
+            threading.Thread(
+                target=lambda n=n: [batcher.add(n * 100 + i) for i in range(100)]
+            )
+            for n in range(4)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        done.wait(5)
+
+        self.assertEqual(len(seen), 1)
+        self.assertEqual(sorted(seen[0]), list(range(400)))
+
+        # A new window opens for what's added after a flush
+        done.clear()
+        batcher.add(400)
+        time.sleep(0.2)
+        self.assertEqual(seen[1], [400])
+
+
+@unittest.skipIf(Song is None, "song package can't be imported here")
+class TestSongQueueRestore(unittest.TestCase):
+    def test_restore(self):
+        bgworker.start()
+        begin = time.perf_counter()
+        songs = [Song(f"youtube:song:restore{i:05d}") for i in range(SONGS)]
+        deadline = time.monotonic() + 30
+        while any(song.dataStatus == DataStatus.NOTLOADED for song in songs):
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.001)
+        elapsed = time.perf_counter() - begin
+        print(f"\n{SONGS} Songs initialized in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+"""
+from_dict time and memory per song for 10k cached songs. from_dict runs dacite
+on the flat fields and keeps the nested sections as JSON text until they're
+read. It's compared with reading them all (which the list views never do) and
+with the old dacite decode of everything.
+"""
+
+import gc
+import json
+import time
+import tracemalloc
+import unittest
+
+import dacite
+
+try:
+    from src.innertube.song.models.songData import SongData, songDataDict
+    from src.innertube.globalModels import SimpleIdentifier
+except ImportError:  # the song package needs the full set of dependencies
+    SongData = None
+
+SONGS = 10_000
+DECODED_SONGS = 500  # dacite takes milliseconds a song, so those are sampled
+TRACKING = (
+    "videostatsPlaybackUrl",
+    "videostatsDelayplayUrl",
+    "videostatsWatchtimeUrl",
+    "ptrackingUrl",
+    "qoeUrl",
+    "atrUrl",
+)
+
+
+def cached(i: int) -> str:
+    """A song as the cache stores it, sized like a real YouTube Music track"""
+    thumbnails = [
+        {"url": f"https://lh3.googleusercontent.com/{i}=w{w}", "width": w, "height": w}
+        for w in (60, 120, 226, 544)
+    ]
+    return json.dumps(
+        {
+            "id": f"song{i:07d}",
+            "source": "full",
+            "title": f"Song {i}",
+            "duration": 180 + i % 120,
+            "author": "Artist",
+            "artist": "Artist",
+            "channel": "Artist - Topic",
+            "channelId": "UCxxxxxxxxxxxxxxxxxxxxxx",
+            "thumbnails": {"videoDetails": thumbnails},
+            "smallestThumbnail": thumbnails[0],
+            "largestThumbnail": thumbnails[-1],
+            "smallestThumbnailUrl": thumbnails[0]["url"],
+            "largestThumbnailUrl": thumbnails[-1]["url"],
+            "fullUrl": f"https://www.youtube.com/watch?v=song{i:07d}",
+            "description": "Provided to YouTube by a distributor " * 8,
+            "tags": ["Artist", "Album", "Song"],
+            "views": 123456,
+            "pageOwnerDetails": {"name": "Artist", "externalChannelId": "UCx"},
+            "uploadDate": "2020-01-01T00:00:00-08:00",
+            "category": "Music",
+            "playabilityStatus": {"status": "OK", "playableInEmbed": True},
+            "playbackTracking": {
+                **{
+                    url: {
+                        "baseUrl": f"https://s.youtube.com/api/{url}?" + "p" * 400,
+                        "headers": [{"headerType": "USER_AUTH"}],
+                    }
+                    for url in TRACKING
+                },
+                "videostatsScheduledFlushWalltimeSeconds": [10, 20, 30],
+                "videostatsDefaultFlushIntervalSeconds": 40,
+            },
+            "videoDetails": {
+                "videoId": f"song{i:07d}",
+                "title": f"Song {i}",
+                "lengthSeconds": 180,
+                "author": "Artist",
+                "viewCount": 123456,
+                "thumbnail": {"thumbnails": thumbnails},
+            },
+            "microformat": {
+                "urlCanonical": f"https://www.youtube.com/watch?v=song{i:07d}",
+                "title": f"Song {i}",
+                "description": "Provided to YouTube by a distributor " * 8,
+                "thumbnail": {"thumbnails": thumbnails[-1:]},
+                "availableCountries": ["US", "GB", "DE", "FR", "JP"] * 40,
+                "pageOwnerDetails": {"name": "Artist"},
+                "category": "Music",
+            },
+        }
+    )
+
+
+def lazyPath(blob: str) -> "SongData":
+    return SongData.from_dict(songDataDict(json.loads(blob)))
+
+
+def fullyDecoded(blob: str) -> "SongData":
+    data = lazyPath(blob)
+    data.pageOwnerDetails, data.playbackTracking, data.videoDetails, data.microformat
+    return data
+
+
+def dacitePath(blob: str) -> "SongData":
+    return dacite.from_dict(
+        SongData, json.loads(blob), config=dacite.Config(cast=[str, SimpleIdentifier])
+    )
+
+
+def measure(load, blobs) -> tuple[float, float]:
+    """Microseconds and retained bytes per song"""
+    gc.collect()
+    begin = time.perf_counter()
+    loaded = [load(blob) for blob in blobs]
+    elapsed = time.perf_counter() - begin
+    del loaded
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    loaded = [load(blob) for blob in blobs]
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return elapsed * 1e6 / len(blobs), retained / len(blobs)
+
+
+@unittest.skipIf(SongData is None, "song package can't be imported here")
+class TestSongDataBenchmark(unittest.TestCase):
+    def test_from_dict(self):
+        blobs = [cached(i) for i in range(SONGS)]
+        results = {
+            "lazy sections": measure(lazyPath, blobs),
+            "lazy, all read": measure(fullyDecoded, blobs[:DECODED_SONGS]),
+            "dacite": measure(dacitePath, blobs[:DECODED_SONGS]),
+        }
+        print(f"\n{SONGS} songs ({DECODED_SONGS} decoded), per song:")
+        for name, (us, size) in results.items():
+            print(f"  {name:20} {us:8.1f} us {size / 1024:8.1f} KiB")
+
+        # dacite still checks the flat fields, the nested sections are the bulk
+        self.assertLess(results["lazy sections"][0] * 3, results["dacite"][0])
+        self.assertLess(results["lazy sections"][1], results["lazy, all read"][1])
+
+    def test_sections_decode_on_access(self):
+        blob = cached(1)
+        lazy, full = lazyPath(blob), dacitePath(blob)
+        self.assertEqual(lazy.title, "Song 1")
+        self.assertEqual(str(lazy.id), "song0000001")
+        self.assertEqual(lazy.videoDetails, full.videoDetails)
+        self.assertEqual(lazy, full)
+        self.assertIs(lazy.microformat, lazy.microformat)
+        self.assertEqual(
+            SongData.from_dict(songDataDict(lazy.as_dict())).as_dict(), lazy.as_dict()
+        )
+        self.assertFalse(hasattr(lazy, "__dict__"))
+
+    def test_flat_fields_are_checked(self):
+        data = json.loads(cached(1))
+        for field, value in (("views", "many"), ("videoDetails", ["not", "a", "dict"])):
+            with self.assertRaises(dacite.WrongTypeError):
+                SongData.from_dict(songDataDict({**data, field: value}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+import asyncio
+import concurrent.futures
+import threading
+import time
+import unittest
+
+from PySide6.QtCore import QThreadPool
+
+from src.workers import (
+    ExecutionPriority,
+    JobHandle,
+    TaskGroup,
+    asyncBgworker,
+    bgworker,
+    currentGroup,
+)
+
+
+class TestTaskGroup(unittest.TestCase):
+    def test_supersede_cancels_the_previous_group(self):
+        first = TaskGroup.supersede("song")
+        pending = JobHandle("get_playback")
+        first.adopt(pending)
+        second = TaskGroup.supersede("song")
+
+        self.assertTrue(first.cancelled)
+        self.assertTrue(pending.cancelled())
+        self.assertFalse(second.cancelled)
+        # Jobs queued into an ended group never run
+        late = JobHandle("get_info")
+        first.adopt(late)
+        self.assertTrue(late.cancelled())
+
+    def test_supersede_is_reentrant(self):
+        with TaskGroup.supersede("song") as outer:
+            with TaskGroup.supersede("song") as inner:
+                self.assertIs(inner, outer)
+            with TaskGroup.supersede("materialColors") as child:
+                self.assertIs(child.parent, outer)
+        self.assertFalse(outer.cancelled)
+
+    def test_children_and_deadlines(self):
+        parent = TaskGroup("song", timeout=10)
+        with parent:
+            child = TaskGroup("thumbnail", timeout=60)
+        self.assertIs(child.parent, parent)
+        self.assertAlmostEqual(child.remaining(), 10, delta=0.5)
+
+        handle = JobHandle("thumbnail")
+        child.adopt(handle)
+        parent.cancel()
+        self.assertTrue(child.cancelled)
+        self.assertTrue(handle.cancelled())
+
+        expired = TaskGroup("song", timeout=0)
+        self.assertTrue(expired.expired)
+        with expired, self.assertRaises(concurrent.futures.CancelledError):
+            TaskGroup.checkCancelled()
+
+    def test_shield(self):
+        with TaskGroup("song"):
+            with TaskGroup.shield():
+                self.assertIsNone(currentGroup.get())
+            self.assertIsNotNone(currentGroup.get())
+
+
+class TestTaskGroupWorkers(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        bgworker.start()
+        asyncBgworker.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        bgworker.shutdown()
+        asyncBgworker.shutdown()
+
+    def saturate(self) -> threading.Event:
+        gate = threading.Event()
+        started = threading.Semaphore(0)
+
+        def blocker():
+            started.release()
+            gate.wait(5)
+
+        threads = QThreadPool.globalInstance().maxThreadCount()
+        with TaskGroup.shield():
+            for _ in range(threads):
+                bgworker.addJob(blocker, ExecutionPriority.HIGH_PRIORITY)
+        for _ in range(threads):
+            started.acquire(timeout=5)
+        self.addCleanup(gate.set)
+        return gate
+
+    def test_cancelled_group_frees_the_pool(self):
+        gate = self.saturate()
+        ran: list[str] = []
+        with TaskGroup.supersede("song") as first:
+            stale = [bgworker.addJob(lambda: ran.append("stale")) for _ in range(5)]
+        with TaskGroup.supersede("song"):
+            current = bgworker.addJob(lambda: ran.append("current"))
+        gate.set()
+
+        current.result(timeout=5)
+        self.assertTrue(first.cancelled)
+        self.assertTrue(all(handle.cancelled() for handle in stale))
+        self.assertEqual(ran, ["current"])
+
+    def test_jobs_queued_by_jobs_join_the_group(self):
+        def child():
+            return currentGroup.get()
+
+        def parent():
+            return bgworker.addJob(child)
+
+        with TaskGroup("song") as group:
+            handle = bgworker.addJob(parent)
+        self.assertIs(handle.result(timeout=5).result(timeout=5), group)
+
+    def test_running_coroutines_are_interrupted(self):
+        started = threading.Event()
+
+        async def fetch():
+            started.set()
+            await asyncio.sleep(5)
+
+        with TaskGroup("song") as group:
+            handle = asyncBgworker.addJob(fetch)
+        started.wait(5)
+        begin = time.monotonic()
+        group.cancel()
+        with self.assertRaises(concurrent.futures.CancelledError):
+            handle.result(timeout=5)
+        self.assertLess(time.monotonic() - begin, 1)
+
+    def test_coroutines_time_out_at_the_deadline(self):
+        with TaskGroup("song", timeout=0.2):
+            handle = asyncBgworker.submit(asyncio.sleep(5), timeout=30)
+        with self.assertRaises(asyncio.TimeoutError):
+            handle.result(timeout=5)
+
+        with TaskGroup("song", timeout=0):
+            late = bgworker.addJob(lambda: None)
+        with self.assertRaises(concurrent.futures.CancelledError):
+            late.result(timeout=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
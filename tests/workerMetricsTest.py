@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from src.workers import JobHandle, JobTracker, bgworker, ExecutionPriority
+
+
+def tracked(tracker: JobTracker, name: str) -> JobHandle:
+    return tracker.track(JobHandle(name))
+
+
+class TestJobTracker(unittest.TestCase):
+    def setUp(self):
+        self.tracker = JobTracker()
+
+    def test_gauges(self):
+        running = tracked(self.tracker, "get_info")
+        tracked(self.tracker, "get_info")
+        tracked(self.tracker, "download")
+        running.set_running_or_notify_cancel()
+
+        metrics = self.tracker.metrics()
+        self.assertEqual((metrics["pending"], metrics["running"]), (2, 1))
+        self.assertEqual(
+            metrics["live"],
+            {
+                "get_info": {"pending": 1, "running": 1},
+                "download": {"pending": 1, "running": 0},
+            },
+        )
+
+        running.set_result(None)
+        metrics = self.tracker.metrics()
+        self.assertEqual((metrics["pending"], metrics["running"]), (2, 0))
+
+    def test_wait_and_run_times(self):
+        handle = tracked(self.tracker, "get_info")
+        time.sleep(0.02)
+        handle.set_running_or_notify_cancel()
+        time.sleep(0.01)
+        handle.set_result(None)
+
+        job = self.tracker.metrics()["jobs"]["get_info"]
+        self.assertEqual(job["completed"], 1)
+        self.assertGreaterEqual(job["wait"]["max"], 20)
+        self.assertGreaterEqual(job["run"]["max"], 10)
+        self.assertLess(job["run"]["max"], job["wait"]["max"])
+
+    def test_outcomes(self):
+        failed, timed_out, cancelled = (
+            tracked(self.tracker, "get_info") for _ in range(3)
+        )
+        for handle, error in (
+            (failed, ValueError()),
+            (timed_out, asyncio.TimeoutError()),
+        ):
+            handle.set_running_or_notify_cancel()
+            handle.set_exception(error)
+        cancelled.cancel()
+
+        job = self.tracker.metrics()["jobs"]["get_info"]
+        self.assertEqual(
+            {k: job[k] for k in ("failed", "timedOut", "cancelled")},
+            {"failed": 1, "timedOut": 1, "cancelled": 1},
+        )
+        # Never started, so it doesn't count towards wait or run times
+        self.assertEqual(job["wait"]["count"], 2)
+
+        self.tracker.resetMetrics()
+        self.assertEqual(self.tracker.metrics()["jobs"], {})
+
+
+class TestBackgroundWorkerMetrics(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        bgworker.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        bgworker.shutdown()
+
+    def test_saturated_pool(self):
+        gate = threading.Event()
+
+        def blocker():
+            gate.wait(5)
+
+        def queued():
+            pass
+
+        threads = bgworker.thread_pool.maxThreadCount()
+        blockers = [
+            bgworker.addJob(blocker, ExecutionPriority.HIGH_PRIORITY)
+            for _ in range(threads)
+        ]
+        waiting = [bgworker.addJob(queued) for _ in range(5)]
+        time.sleep(0.1)
+
+        metrics = bgworker.getMetrics()
+        self.assertEqual(metrics["live"]["blocker"], {"pending": 0, "running": threads})
+        self.assertEqual(metrics["live"]["queued"], {"pending": 5, "running": 0})
+        self.assertEqual(metrics["poolThreads"]["active"], threads)
+
+        gate.set()
+        for handle in blockers + waiting:
+            handle.result(timeout=5)
+        time.sleep(0.05)  # Done callbacks run after result() wakes up
+        jobs = bgworker.getMetrics()["jobs"]
+        self.assertEqual(jobs["queued"]["completed"], 5)
+        # The queued jobs waited for a blocker to finish
+        self.assertGreaterEqual(jobs["queued"]["wait"]["min"], 90)
+
+
+if __name__ == "__main__":
+    unittest.main()